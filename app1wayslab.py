@@ -1,15 +1,14 @@
+import os
 import streamlit as st
-import matplotlib
-
-# Set backend to Agg to prevent thread issues in Streamlit
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import math
-import io
-import base64
 import streamlit.components.v1 as components
 
+from slab_core import AUTO_BAR, BAR_INFO, Status
+from slab_cache import DesignCache
+from slab_metrics import Metrics, NULL_METRICS
+from slab_optimize import optimize_slab
+from slab_report import generate_report
+from slab_svg import render_section_svg
+
 # ==========================================
 # 1. SETUP & CSS
 # ==========================================
@@ -52,458 +51,92 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ==========================================
-# 2. DATABASE & HELPERS
-# ==========================================
-BAR_INFO = {
-    'RB6': {'A_cm2': 0.283, 'd_mm': 6},
-    'RB9': {'A_cm2': 0.636, 'd_mm': 9},
-    'DB10': {'A_cm2': 0.785, 'd_mm': 10},
-    'DB12': {'A_cm2': 1.131, 'd_mm': 12},
-    'DB16': {'A_cm2': 2.011, 'd_mm': 16},
-    'DB20': {'A_cm2': 3.142, 'd_mm': 20},
-    'DB25': {'A_cm2': 4.909, 'd_mm': 25}
-}
-
-
-def fmt(n, digits=2):
-    try:
-        val = float(n)
-        if math.isnan(val): return "-"
-        return f"{val:,.{digits}f}"
-    except:
-        return "-"
 
 
-def fig_to_base64(fig):
-    buf = io.BytesIO()
-    fig.savefig(buf, format='png', bbox_inches='tight')
-    buf.seek(0)
-    plt.close(fig)  # Memory cleanup
-    return f"data:image/png;base64,{base64.b64encode(buf.read()).decode()}"
+@st.cache_resource
+def get_design_cache():
+    # SLAB_CACHE_DB = path ของไฟล์ SQLite เพื่อเก็บแคชข้ามการ Restart (ไม่บังคับ)
+    return DesignCache(maxsize=256, path=os.environ.get("SLAB_CACHE_DB"))
 
 
 # ==========================================
-# 3. PLOTTING FUNCTION (UPDATED WITH DIMENSIONS)
+# 2. FLOOR PLAN MODE
 # ==========================================
-def plot_slab_section(h_cm, cover_cm, main_key, s_main, temp_key, s_temp, support_type, Lx_real):
-    """
-    Lx_real: ความยาวจริง (m) เพื่อนำมาแสดงใน Text
-    """
-    fig, ax = plt.subplots(figsize=(10, 5))
-
-    # Helper to draw dimension line
-    def draw_dim(ax, x1, y1, x2, y2, text, offset_y=0, offset_x=0):
-        """วาดเส้นบอกระยะพร้อมลูกศรและตัวหนังสือ"""
-        d_x1, d_y1 = x1 + offset_x, y1 + offset_y
-        d_x2, d_y2 = x2 + offset_x, y2 + offset_y
-
-        # 1. เส้น Arrow
-        ax.annotate("", xy=(d_x1, d_y1), xytext=(d_x2, d_y2),
-                    arrowprops=dict(arrowstyle='<|-|>', lw=1.0, color='black'))
-
-        # 2. Extension lines
-        ax.plot([x1, d_x1], [y1, d_y1], color='black', lw=0.5, linestyle='--')
-        ax.plot([x2, d_x2], [y2, d_y2], color='black', lw=0.5, linestyle='--')
-
-        # 3. Text
-        mid_x = (d_x1 + d_x2) / 2
-        mid_y = (d_y1 + d_y2) / 2
-
-        if abs(y2 - y1) < abs(x2 - x1):  # Horizontal
-            ax.text(mid_x, mid_y + 0.05, text, ha='center', va='bottom', fontsize=11, fontweight='bold', color='black',
-                    backgroundcolor='white')
-        else:  # Vertical
-            ax.text(mid_x - 0.05, mid_y, text, ha='right', va='center', fontsize=11, fontweight='bold', color='black',
-                    backgroundcolor='white')
-
-    # Parameters for Visual
-    slab_h_draw = 0.4  # Visual height
-    beam_w = 0.4  # Visual beam width
-    beam_d = 0.8  # Visual beam depth
-    cover_visual = 0.05
-
-    concrete_color = '#f0f0f0'
-    concrete_edge = 'black'
-    hatch_style = '///'
-
-    if support_type == "Cantilever":
-        # --- CANTILEVER ---
-        slab_len_draw = 3.0
-
-        # Beam (Left)
-        beam = patches.Rectangle((-beam_w, -beam_d), beam_w, beam_d,
-                                 facecolor='white', edgecolor=concrete_edge, hatch=hatch_style)
-        ax.add_patch(beam)
-
-        # Slab
-        slab = patches.Rectangle((0, -slab_h_draw), slab_len_draw, slab_h_draw,
-                                 facecolor=concrete_color, edgecolor=concrete_edge)
-        ax.add_patch(slab)
-
-        # Rebar
-        bar_y = -cover_visual
-        x_pts = [-beam_w / 2, slab_len_draw - cover_visual]
-        y_pts = [bar_y, bar_y]
-        x_hook = [x_pts[-1], x_pts[-1]]
-        y_hook = [bar_y, bar_y - 0.2]
-
-        ax.plot(x_pts, y_pts, color='blue', lw=3)
-        ax.plot(x_hook, y_hook, color='blue', lw=3)
-
-        # Temp Bar
-        dist_y = bar_y - 0.05
-        spacing_draw = 0.3
-        n_bars = int(slab_len_draw / spacing_draw)
-        for i in range(n_bars):
-            cx = (i * spacing_draw) + 0.2
-            if cx < slab_len_draw:
-                ax.add_patch(patches.Circle((cx, dist_y), 0.03, color='red'))
-
-        # Dimensions
-        draw_dim(ax, 0, -slab_h_draw, slab_len_draw, -slab_h_draw, f"L = {Lx_real:.2f} m", offset_y=-0.3)
-        draw_dim(ax, slab_len_draw, 0, slab_len_draw, -slab_h_draw, f"t = {h_cm:.0f} cm", offset_x=0.3)
-
-        # Labels
-        ax.text(-beam_w / 2, -beam_d - 0.2, "Support", ha='center', fontsize=10)
-        ax.annotate(f"{main_key}@{s_main:.0f}cm (Top)", xy=(slab_len_draw / 2, bar_y), xytext=(slab_len_draw / 2, 0.3),
-                    arrowprops=dict(facecolor='blue', arrowstyle='->'), ha='center', color='blue', fontweight='bold')
+def floor_plan_mode():
+    """ออกแบบทุกแผ่นของผังกริด (ความต่อเนื่อง / Lx-Ly / One-Way หาให้อัตโนมัติ)"""
+    from slab_floor import FLOOR_OUTPUT_FIELDS, design_floor, grid_panels
+    from slab_report import iter_head, iter_tail
 
-    else:
-        # --- SIMPLE / CONTINUOUS ---
-        slab_len_draw = 5.0
-
-        # Beams
-        ax.add_patch(patches.Rectangle((-beam_w, -beam_d), beam_w, beam_d,
-                                       facecolor='white', edgecolor=concrete_edge, hatch=hatch_style))
-        ax.add_patch(patches.Rectangle((slab_len_draw, -beam_d), beam_w, beam_d,
-                                       facecolor='white', edgecolor=concrete_edge, hatch=hatch_style))
-        # Slab
-        ax.add_patch(patches.Rectangle((0, -slab_h_draw), slab_len_draw, slab_h_draw,
-                                       facecolor=concrete_color, edgecolor=concrete_edge))
-
-        # Rebar (Bottom)
-        bar_y = -slab_h_draw + cover_visual + 0.02
-        ax.plot([0.1, slab_len_draw - 0.1], [bar_y, bar_y], color='blue', lw=3)
-        ax.plot([0.1, 0.1], [bar_y, bar_y + 0.15], color='blue', lw=3)
-        ax.plot([slab_len_draw - 0.1, slab_len_draw - 0.1], [bar_y, bar_y + 0.15], color='blue', lw=3)
-
-        # Temp Bar
-        dist_y = bar_y + 0.05
-        spacing_draw = 0.3
-        n_bars = int(slab_len_draw / spacing_draw)
-        for i in range(1, n_bars):
-            cx = i * spacing_draw
-            ax.add_patch(patches.Circle((cx, dist_y), 0.03, color='red'))
-
-        # Dimensions
-        draw_dim(ax, 0, -beam_d, slab_len_draw, -beam_d, f"L = {Lx_real:.2f} m", offset_y=0.0)
-        draw_dim(ax, slab_len_draw + beam_w, 0, slab_len_draw + beam_w, -slab_h_draw, f"t = {h_cm:.0f} cm",
-                 offset_x=0.2)
-
-        # Labels
-        ax.annotate(f"{main_key}@{s_main:.0f}cm (Btm)", xy=(slab_len_draw / 2, bar_y),
-                    xytext=(slab_len_draw / 2, -slab_h_draw - 0.4),
-                    arrowprops=dict(facecolor='blue', arrowstyle='->'), ha='center', color='blue', fontweight='bold')
-
-        ax.annotate(f"Temp: {temp_key}@{s_temp:.0f}cm", xy=(slab_len_draw / 2 + 0.2, dist_y),
-                    xytext=(slab_len_draw / 2 + 1.0, 0.2),
-                    arrowprops=dict(facecolor='red', arrowstyle='->'), ha='center', color='red', fontweight='bold')
-
-    ax.axis('equal')
-    ax.axis('off')
-    plt.tight_layout()
-    return fig
+    with st.sidebar.form("floor_form"):
+        st.header("Project Info")
+        project = st.text_input("Project Name", "อาคารพักอาศัย 2 ชั้น")
+        engineer = st.text_input("Engineer", "นายไกรฤทธิ์ ด่านพิทักษ์")
 
+        st.header("1. Grid (Bay Widths)")
+        bays_x = st.text_input("Bays along X (m)", "3.0, 3.0, 3.0")
+        bays_y = st.text_input("Bays along Y (m)", "7.0, 7.0")
 
-# ==========================================
-# 4. CALCULATION LOGIC
-# ==========================================
-def process_slab_calculation(inputs):
-    rows = []
-
-    def sec(title):
-        rows.append(["SECTION", title, "", "", "", "", ""])
-
-    def row(item, formula, subs, result, unit, status=""):
-        rows.append([item, formula, subs, result, unit, status])
-
-    # Unpack
-    fc = inputs['fc'];
-    fy = inputs['fy']
-    Lx = inputs['Lx'];
-    Ly = inputs['Ly']
-    h_cm = inputs['h'];
-    cover_cm = inputs['cover']
-    sdl = inputs['sdl'];
-    ll = inputs['ll']
-    main_key = inputs['mainBar'];
-    temp_key = inputs['tempBar']
-    support = inputs['support']
-
-    # 1. Geometry & Type Check
-    sec("1. GEOMETRY & SLAB TYPE")
-    row("Short Span", "Lx", "-", f"{Lx:.2f}", "m")
-    row("Long Span", "Ly", "-", f"{Ly:.2f}", "m")
-
-    ratio = Ly / Lx
-    slab_type = "One-Way Slab" if ratio > 2.0 else "Two-Way Slab"
-    status_type = "OK" if ratio > 2.0 else "WARNING"
-
-    row("Ratio Ly/Lx", f"{Ly:.2f} / {Lx:.2f}", "-", f"{ratio:.2f}", "-", status_type)
-    row("Slab Type Check", "Ratio > 2.0?", "-", slab_type, "-", status_type)
-
-    if ratio <= 2.0:
-        rows.append(
-            ["Note", "Since Ly/Lx ≤ 2.0, it behaves as Two-Way.", "Design as One-Way is Conservative.", "-", "-",
-             "INFO"])
-
-    # 2. Load Analysis
-    sec("2. LOAD ANALYSIS (Design Strip b = 1 m)")
-    w_sw = 2400 * (h_cm / 100)
-    w_dead = w_sw + sdl
-    wu = 1.2 * w_dead + 1.6 * ll
-
-    row("Factored Load (wu)", "1.2D + 1.6L", f"1.2({w_dead:.0f}) + 1.6({ll})", f"{fmt(wu)}", "kg/m")
-
-    # 3. Flexural Design (Short Span - Lx)
-    sec("3. SHORT SPAN DESIGN (MAIN STEEL)")
-
-    # Coef
-    if support == "Simply Supported":
-        coef = 8.0
-    elif "Continuous" in support:
-        coef = 10.0
-    elif support == "Cantilever":
-        coef = 2.0
-    else:
-        coef = 8.0
+        c3, c4 = st.columns(2)
+        h = c3.number_input("Thickness (cm)", value=12.0, step=1.0)
+        cover = c4.number_input("Cover (cm)", value=2.0, step=0.5)
 
-    Mu_kgm = (wu * Lx ** 2) / coef
-    Mu_kgcm = Mu_kgm * 100
+        st.header("2. Materials & Loads")
+        c1, c2 = st.columns(2)
+        fc = c1.number_input("fc' (ksc)", value=240)
+        fy = c2.number_input("fy (ksc)", value=4000)
+        sdl = c1.number_input("SDL (kg/m²)", value=150.0)
+        ll = c2.number_input("LL (kg/m²)", value=300.0)
 
-    db_main = BAR_INFO[main_key]['d_mm']
-    d = h_cm - cover_cm - (db_main / 10) / 2
+        st.header("3. Bar Selection")
+        mainBar = st.selectbox("Main Bar (Lx)", list(BAR_INFO.keys()) + [AUTO_BAR], index=3)
+        tempBar = st.selectbox("Temp Bar (Ly)", list(BAR_INFO.keys()) + [AUTO_BAR], index=1)
 
-    row("Design Moment (Mu)", f"wu · Lx² / {coef:.0f}", f"{fmt(wu)}·{Lx}²/{coef:.0f}", f"{fmt(Mu_kgm)}", "kg-m")
-    row("Effective Depth (d)", "h - cov - db/2", f"{h_cm}-{cover_cm}-{db_main / 20}", f"{d:.2f}", "cm")
+        run_floor = st.form_submit_button("Design Floor")
 
-    # Rn & Rho
-    phi = 0.90;
-    b = 100
-    Rn = Mu_kgcm / (phi * b * d ** 2)
+    if not run_floor:
+        st.info("👈 Enter the bay widths along X and Y. Every grid line is taken as a beam.")
+        return
 
-    rho_min = 0.0018
-    status_flex = "OK"
     try:
-        term = 1 - (2 * Rn) / (0.85 * fc)
-        if term < 0:
-            rho_req = 0;
-            status_flex = "FAIL (Thicken Slab)"
-        else:
-            rho_req = (0.85 * fc / fy) * (1 - math.sqrt(term))
-    except:
-        rho_req = 0;
-        status_flex = "CALC ERROR"
-
-    As_flex_req = rho_req * b * d
-    As_min_req = rho_min * b * h_cm
-
-    # Determine Control
-    if As_flex_req >= As_min_req:
-        As_req_short = As_flex_req
-        control = "Flexure Controls"
-    else:
-        As_req_short = As_min_req
-        control = "Min Steel Controls"
-
-    row("Required As (Short)", control, f"max(ρbd, 0.0018bh)", f"{fmt(As_req_short)}", "cm²")
-
-    # Select Main Bar
-    Ab_main = BAR_INFO[main_key]['A_cm2']
-    s_calc = (Ab_main * 100) / As_req_short
-    s_max = min(3 * h_cm, 45.0)
-    s_main = math.floor(min(s_calc, s_max) * 2) / 2
-    As_prov_main = (Ab_main * 100) / s_main
-
-    row("Provide Main Steel", f"Use {main_key}", f"@{s_main:.1f} cm", f"{fmt(As_prov_main)}", "cm²", status_flex)
-
-    # 4. Temperature Steel (Long Span - Ly)
-    sec("4. LONG SPAN DESIGN (TEMP STEEL)")
-    As_req_long = 0.0018 * b * h_cm
-    row("Required As (Long)", "0.0018 · b · h", f"0.0018 · 100 · {h_cm}", f"{fmt(As_req_long)}", "cm²")
-
-    Ab_temp = BAR_INFO[temp_key]['A_cm2']
-    s_t_calc = (Ab_temp * 100) / As_req_long
-    s_t_max = min(5 * h_cm, 45.0)
-    s_temp = math.floor(min(s_t_calc, s_t_max) * 2) / 2
-    As_prov_temp = (Ab_temp * 100) / s_temp
-
-    row("Provide Temp Steel", f"Use {temp_key}", f"@{s_temp:.1f} cm", f"{fmt(As_prov_temp)}", "cm²", "OK")
-
-    # 5. Shear & Deflection (UPDATED ACI/EIT)
-    sec("5. CHECKS")
-
-    # --- Shear Check ---
-    Vu = (wu * Lx) / 2 if support != "Cantilever" else wu * Lx
-    Vc = 0.53 * math.sqrt(fc) * b * d
-    phi_shear = 0.85
-    phi_Vc = phi_shear * Vc
-
-    status_shear = "PASS" if phi_Vc >= Vu else "FAIL"
-    row("Shear Check", "φVc ≥ Vu", f"{fmt(phi_Vc)} ≥ {fmt(Vu)}", status_shear, "kg", status_shear)
-
-    # --- Deflection Check (h_min) ---
-    if support == "Simply Supported":
-        ratio_def = 20.0
-    elif support == "Continuous (One End)":
-        ratio_def = 24.0
-    elif support == "Continuous (Both)":
-        ratio_def = 28.0
-    elif support == "Cantilever":
-        ratio_def = 10.0
+        lines = []
+        for text in (bays_x, bays_y):
+            widths = [float(v) for v in text.split(",") if v.strip()]
+            if not widths or min(widths) <= 0:
+                raise ValueError
+            lines.append([sum(widths[:i]) for i in range(len(widths) + 1)])
+    except ValueError:
+        st.error("❌ Bay widths must be positive numbers separated by commas.")
+        return
+
+    defaults = {'project': project, 'engineer': engineer, 'h': h, 'cover': cover, 'fc': fc, 'fy': fy,
+                'sdl': sdl, 'll': ll, 'mainBar': mainBar, 'tempBar': tempBar}
+    rows = design_floor(grid_panels(*lines), defaults=defaults, fragments=True)
+
+    # status_final มีเพียง COMPLETE / REVIEW (แถวที่ error ไม่มีสถานะ)
+    n_fail = sum(r['status_final'] != Status.COMPLETE.label or bool(r['error']) for r in rows)
+    if n_fail:
+        st.warning(f"⚠️ {n_fail} of {len(rows)} panels need attention.")
     else:
-        ratio_def = 20.0
-
-    correction_factor = (0.4 + fy / 7000)
-    h_min = (Lx * 100 / ratio_def) * correction_factor
-
-    status_defl = "PASS" if h_cm >= h_min else "CHECK"
-    row("Deflection Check", f"L/{ratio_def:.0f} · (0.4+fy/7000)", f"{h_cm} ≥ {fmt(h_min)}", status_defl, "cm",
-        status_defl)
-
-    if status_defl == "CHECK":
-        rows.append(["Note", f"Req h_min = {fmt(h_min)} cm", "Consider increasing thickness", "-", "-", "WARNING"])
+        st.success(f"✅ Floor Design Complete! ({len(rows)} panels)")
+    st.dataframe([{k: r[k] for k in FLOOR_OUTPUT_FIELDS} for r in rows])
 
-    # Final
-    sec("6. CONCLUSION")
-    final_status = "COMPLETE" if status_flex == "OK" and status_shear == "PASS" else "REVIEW"
-    row("Design Status", "-", "-", final_status, "-", final_status)
-
-    return rows, s_main, s_temp
-
-
-# ==========================================
-# 5. HTML REPORT GENERATOR
-# ==========================================
-def generate_report(inputs, rows, img_base64):
-    table_html = ""
-    for r in rows:
-        if r[0] == "SECTION":
-            table_html += f"<tr class='sec-row'><td colspan='6'>{r[1]}</td></tr>"
-        else:
-            st_val = r[5]
-            cls = "pass-ok"
-            if "FAIL" in st_val:
-                cls = "pass-no"
-            elif "WARNING" in st_val or "CHECK" in st_val:
-                cls = "pass-warn"
-            elif "INFO" in st_val:
-                cls = ""
-
-            val_cls = "load-value" if "Factored" in str(r[0]) else ""
-
-            table_html += f"<tr><td>{r[0]}</td><td>{r[1]}</td><td>{r[2]}</td><td class='{val_cls}'>{r[3]}</td><td>{r[4]}</td><td class='{cls}'>{st_val}</td></tr>"
-
-    html = f"""
-    <!DOCTYPE html>
-    <html lang="th">
-    <head>
-        <meta charset="UTF-8">
-        <title>One-Way Slab Design Report</title>
-        <link href="https://fonts.googleapis.com/css2?family=Sarabun:wght@400;700&display=swap" rel="stylesheet">
-        <style>
-            body {{ font-family: 'Sarabun', sans-serif; padding: 20px; color: black; }}
-            h1, h3 {{ text-align: center; margin: 5px; }}
-            .header {{ border-bottom: 2px solid #333; padding-bottom: 10px; margin-bottom: 20px; position: relative; }}
-            .id-box {{ position: absolute; top:0; right:0; border: 2px solid #000; padding: 5px 15px; font-weight: bold; font-size: 18px; }}
-            .info-grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 10px; margin-bottom: 20px; }}
-            .info-box {{ border: 1px solid #ddd; padding: 10px; }}
-            .img-container {{ text-align: center; margin: 20px 0; border: 1px solid #eee; padding: 10px; }}
-            img {{ max-width: 80%; height: auto; }}
-            table {{ width: 100%; border-collapse: collapse; font-size: 12px; }}
-            th, td {{ border: 1px solid #444; padding: 6px; }}
-            th {{ background-color: #eee; }}
-            .sec-row {{ background-color: #ddd; font-weight: bold; }}
-            .pass-ok {{ color: green; font-weight: bold; }}
-            .pass-no {{ color: red; font-weight: bold; }}
-            .pass-warn {{ color: orange; font-weight: bold; }}
-            .load-value {{ color: #D32F2F; font-weight: bold; }}
-
-            .footer {{ margin-top: 40px; page-break-inside: avoid; }}
-            .sign-box {{ width: 250px; text-align: center; margin-top: 20px; }}
-            .line {{ border-bottom: 1px solid #000; margin: 30px 0 5px 0; }}
-
-            /* Print Button Internal */
-            .print-btn-internal {{
-                background-color: #4CAF50; border: none; color: white; padding: 10px 20px;
-                text-align: center; display: inline-block; font-size: 16px; margin-bottom: 20px;
-                cursor: pointer; border-radius: 4px; font-family: 'Sarabun'; font-weight: bold;
-            }}
-            @media print {{ .no-print {{ display: none !important; }} }}
-        </style>
-    </head>
-    <body>
-        <div class="no-print" style="text-align: center;">
-            <button onclick="window.print()" class="print-btn-internal">🖨️ Print Report</button>
-        </div>
-
-        <div class="header">
-            <div class="id-box">{inputs['slab_id']}</div>
-            <h1>ENGINEERING DESIGN REPORT</h1>
-            <h3>RC One-Way Slab Design (ACI 318/EIT)</h3>
-        </div>
-
-        <div class="info-grid">
-            <div class="info-box">
-                <strong>Project:</strong> {inputs['project']}<br>
-                <strong>Engineer:</strong> {inputs['engineer']}<br>
-                <strong>Date:</strong> 16/12/2568
-            </div>
-            <div class="info-box">
-                <strong>Panel Size:</strong> {inputs['Lx']} x {inputs['Ly']} m ({inputs['support']})<br>
-                <strong>Thickness:</strong> {inputs['h']} cm (Cover {inputs['cover']} cm)<br>
-                <strong>Materials:</strong> fc'={inputs['fc']}, fy={inputs['fy']} ksc
-            </div>
-        </div>
-
-        <h3>Design Visualization</h3>
-        <div class="img-container">
-            <img src="{img_base64}" />
-        </div>
-
-        <h3>Calculation Details</h3>
-        <table>
-            <thead>
-                <tr>
-                    <th width="25%">Item</th><th width="20%">Formula</th><th width="25%">Substitution</th>
-                    <th width="15%">Result</th><th width="8%">Unit</th><th width="7%">Status</th>
-                </tr>
-            </thead>
-            <tbody>
-                {table_html}
-            </tbody>
-        </table>
-
-        <div class="footer">
-            <div class="sign-box">
-                <div style="text-align: left; font-weight: bold;">Designed by:</div>
-                <div class="line"></div>
-                <div>({inputs['engineer']})</div>
-                <div>Civil Engineer</div>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-    return html
+    html_report = "".join(iter_head(title="One-Way Slab Design Report (Floor Plan)")) + \
+        "".join(r.get('report_html', '') for r in rows) + "".join(iter_tail())
+    st.download_button("⬇️ Download Floor Report (HTML)", html_report, file_name="floor_report.html",
+                       mime="text/html")
+    components.html(html_report, height=1200, scrolling=True)
 
 
 # ==========================================
-# 6. UI MAIN
+# 3. UI MAIN
 # ==========================================
 st.title("RC Slab Design SDM (One-Way Auto)")
 
+mode = st.sidebar.radio("Input Mode", ["Single Panel", "Floor Plan (Grid)"], horizontal=True)
+if mode == "Floor Plan (Grid)":
+    floor_plan_mode()
+    st.stop()
+
 with st.sidebar.form("input_form"):
     st.header("Project Info")
     project = st.text_input("Project Name", "อาคารพักอาศัย 2 ชั้น")
@@ -538,19 +171,33 @@ with st.sidebar.form("input_form"):
     ])
 
     st.header("4. Bar Selection")
-    st.caption("Select preferred bar size. Spacing will be auto-calculated.")
-    mainBar = st.selectbox("Main Bar (Lx)", list(BAR_INFO.keys()), index=3)  # Default DB12
+    st.caption("Select preferred bar size (or Auto for the best fit from the rebar table). "
+               "Spacing will be auto-calculated.")
+    mainBar = st.selectbox("Main Bar (Lx)", list(BAR_INFO.keys()) + [AUTO_BAR], index=3)  # Default DB12
     # --- UPDATED HERE: Use full list for Temp Bar as well ---
-    tempBar = st.selectbox("Temp Bar (Ly)", list(BAR_INFO.keys()), index=1)  # Default RB9
+    tempBar = st.selectbox("Temp Bar (Ly)", list(BAR_INFO.keys()) + [AUTO_BAR], index=1)  # Default RB9
+
+    optimize = st.checkbox("Optimizer: find lowest-cost h & bars",
+                           help="Ignore the thickness/bars above and search for the cheapest passing design.")
+
+    drawing = st.radio("Section Drawing", ["SVG (fast)", "PNG (matplotlib)"], horizontal=True)
+    show_timing = st.checkbox("Show timing panel")
 
     run_btn = st.form_submit_button("Run Auto Design")
 
 if run_btn:
+    # SLAB_METRICS_FILE: ต่อท้ายผลจับเวลาทุกครั้งที่รัน (.prom หรือ JSON lines)
+    # SLAB_PROFILE_DIR: เขียนไฟล์ cProfile ของทุกขั้น
+    metrics_file = os.environ.get("SLAB_METRICS_FILE")
+    profile_dir = os.environ.get("SLAB_PROFILE_DIR")
+    metrics = Metrics(profile_dir=profile_dir) if (show_timing or metrics_file or profile_dir) else NULL_METRICS
+
     # Logic to ensure Lx is actually the shorter side (Unless Cantilever which has distinct direction)
     # Note: For Cantilever, Lx is usually the Overhang Length.
-    if support != "Cantilever" and Lx > Ly:
-        st.warning(f"⚠️ Warning: Input Lx ({Lx}m) is greater than Ly ({Ly}m). Swapping values automatically.")
-        Lx, Ly = Ly, Lx
+    with metrics.stage("swap"):
+        if support != "Cantilever" and Lx > Ly:
+            st.warning(f"⚠️ Warning: Input Lx ({Lx}m) is greater than Ly ({Ly}m). Swapping values automatically.")
+            Lx, Ly = Ly, Lx
 
     inputs = {
         'project': project, 'slab_id': slab_id, 'engineer': engineer,
@@ -559,17 +206,61 @@ if run_btn:
         'support': support, 'mainBar': mainBar, 'tempBar': tempBar
     }
 
-    # 1. Calculate
-    rows, s_main, s_temp = process_slab_calculation(inputs)
+    if optimize:
+        with metrics.stage("optimize"):
+            best = optimize_slab(inputs)
+        if best is None:
+            st.error("❌ Optimizer: no thickness/bar combination passes all checks.")
+            st.stop()
+        h, mainBar, tempBar = best['h'], best['mainBar'], best['tempBar']
+        inputs.update(h=h, mainBar=mainBar, tempBar=tempBar)
+        st.info(f"🔎 Optimizer: t = {h:.1f} cm, {mainBar}@{best['s_main']:.1f}, {tempBar}@{best['s_temp']:.1f} "
+                f"(≈ {best['cost']:,.0f} THB, {best['pruned']} thicknesses pruned)")
+
+    cache = get_design_cache()
+
+    # 1. Calculate (cached on engineering inputs only)
+    with metrics.stage("calc"):
+        design = cache.design(inputs)
+    s_main, s_temp = design.s_main, design.s_temp
+    # "Auto" -> เหล็กที่เลือกจากตาราง
+    mainBar, tempBar = design.inputs['mainBar'], design.inputs['tempBar']
+
+    def render_svg(*args):
+        with metrics.stage("plot_svg"):
+            return render_section_svg(*args)
+
+    def render_png(*args):
+        from slab_render import render_section_png
+        with metrics.stage("plot"):
+            return render_section_png(*args)
 
     # 2. Draw (Pass support type AND Lx for dimension lines)
-    img_base64 = fig_to_base64(plot_slab_section(h, cover, mainBar, s_main, tempBar, s_temp, support, Lx))
+    if drawing.startswith("SVG"):
+        img_base64 = cache.figure(h, cover, mainBar, s_main, tempBar, s_temp, support, Lx,
+                                  render=render_svg, fmt_name='svg')
+    else:
+        img_base64 = cache.figure(h, cover, mainBar, s_main, tempBar, s_temp, support, Lx, render=render_png)
 
     # 3. Report
-    html_report = generate_report(inputs, rows, img_base64)
+    with metrics.stage("report"):
+        html_report = generate_report(inputs, design.rows(), img_base64)
 
     st.success("✅ Auto-Design Complete!")
     components.html(html_report, height=1200, scrolling=True)
 
+    stats = cache.stats()
+    st.caption(" | ".join(
+        f"{kind}: {v['memory_hits']} mem hit / {v['disk_hits']} disk hit / {v['misses']} miss"
+        for kind, v in stats.items()))
+
+    if metrics_file:
+        metrics.write(metrics_file)
+    if show_timing:
+        with st.expander("⏱️ Timing", expanded=True):
+            st.table([{'Stage': r['stage'], 'Time (ms)': f"{r['total_ms']:.2f}", 'Share': f"{r['share']:.0%}"}
+                      for r in metrics.summary_rows()])
+            st.caption("'calc' includes the cache lookup; drawing stages appear only on a cache miss.")
+
 else:
     st.info("👈 Please enter slab dimensions (Lx, Ly) and properties to design.")
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""
+RC One-Way Slab Design - Batch Engine (NumPy)
+
+ออกแบบพื้นหลายหมื่นแผ่นในครั้งเดียวแบบ Vectorized
+"""
+import numpy as np
+
+from slab_core import (AUTO_BAR, BAR_INFO, DEFL_LIMIT_LL, DEFL_LIMIT_LT, E_STEEL, LONG_TERM_LAMBDA,
+                       ONE_WAY_RATIO, SUSTAINED_LL, Status, deflection_coef, deflection_ratio, moment_coef)
+
+# ==========================================
+# 1. BATCH ENGINE (VECTORIZED, NO STRING FORMATTING)
+# ==========================================
+BATCH_FIELDS = ('Lx', 'Ly', 'h', 'cover', 'fc', 'fy', 'sdl', 'll', 'support', 'mainBar', 'tempBar')
+
+
+def _lookup(keys, *funcs):
+    """
+    แปลง Array ของ key (เช่น support, bar) เป็นค่าตัวเลข หนึ่ง Array ต่อ func
+    np.unique (ส่วนที่แพงที่สุด) ครั้งเดียวต่อคอลัมน์ และเรียก func เพียงครั้งเดียวต่อค่าที่ไม่ซ้ำ
+    """
+    uniq, inv = np.unique(np.asarray(keys, dtype=str), return_inverse=True)
+    inv = inv.reshape(-1)
+    out = tuple(np.array([func(k) for k in uniq], dtype=float)[inv] for func in funcs)
+    return out if len(funcs) > 1 else out[0]
+
+
+def _best_fit_bars(As_req, s_max, bars):
+    """
+    ชื่อเหล็กที่พอดีที่สุดต่อแถวจากตารางเหล็ก (slab_rebar)
+    หนึ่ง searchsorted ต่อค่า s_max ที่ไม่ซ้ำ ตารางถูกแคชไว้จึงสร้างครั้งเดียวต่อทั้ง Batch
+    """
+    from slab_rebar import rebar_table
+    largest = max(bars, key=lambda k: BAR_INFO[k]['d_mm'])
+    out = np.full(As_req.shape, largest, dtype=object)
+    for s in np.unique(s_max):
+        table = rebar_table(float(s), bars)
+        sel = np.flatnonzero(s_max == s)
+        idx = np.searchsorted(np.asarray(table.areas), As_req[sel], side='left')
+        ok = idx < len(table)
+        out[sel[ok]] = [table.entries[i][2] for i in idx[ok]]
+    return out
+
+
+def _effective_inertia(Ma, Mcr, Ig, Icr):
+    """Ie ของ Branson แบบ Vectorized (เหมือน effective_inertia ของ slab_core)"""
+    q = Mcr / Ma
+    r = q * q * q
+    return np.where(Ma <= Mcr, Ig, np.minimum(r * Ig + (1 - r) * Icr, Ig))
+
+
+def _process_auto_bars(columns, main_keys, temp_keys):
+    """
+    Batch ที่มีเหล็ก "Auto": รอบแรกใช้เหล็กใหญ่สุด (d น้อยสุด) หา As_req แล้วเลือกจากตาราง
+    รอบสองคำนวณด้วยเหล็กที่เลือก (เหมือน resolve_bars ของ slab_rebar ทีละแผ่น)
+    """
+    from slab_rebar import ABS_MAX_SPACING, AUTO_MAIN_BARS, AUTO_TEMP_BARS
+    auto_main = main_keys == AUTO_BAR
+    auto_temp = temp_keys == AUTO_BAR
+    largest_main = max(AUTO_MAIN_BARS, key=lambda k: BAR_INFO[k]['d_mm'])
+    largest_temp = max(AUTO_TEMP_BARS, key=lambda k: BAR_INFO[k]['d_mm'])
+    main_keys = np.where(auto_main, largest_main, main_keys).astype(object)
+    temp_keys = np.where(auto_temp, largest_temp, temp_keys).astype(object)
+    first = process_slab_batch(dict(columns, mainBar=main_keys, tempBar=temp_keys))
+
+    h_cm = np.broadcast_to(np.asarray(columns['h'], dtype=float).reshape(-1), main_keys.shape)
+    if auto_main.any():
+        picked = _best_fit_bars(first['As_req'][auto_main], np.minimum(3 * h_cm, ABS_MAX_SPACING)[auto_main],
+                                AUTO_MAIN_BARS)
+        main_keys[auto_main] = picked
+    if auto_temp.any():
+        picked = _best_fit_bars(first['As_req_long'][auto_temp],
+                                np.minimum(5 * h_cm, ABS_MAX_SPACING)[auto_temp], AUTO_TEMP_BARS)
+        temp_keys[auto_temp] = picked
+    res = process_slab_batch(dict(columns, mainBar=main_keys, tempBar=temp_keys))
+    res['mainBar'], res['tempBar'] = main_keys.astype(str), temp_keys.astype(str)
+    return res
+
+
+def process_slab_batch(columns):
+    """
+    ออกแบบพื้นทางเดียวหลายแผ่นพร้อมกันแบบ Vectorized
+
+    columns: dict ของ Array ตาม BATCH_FIELDS (ความยาวเท่ากันทุกคอลัมน์)
+             อาจมี 'Mu' (kg-m) / 'Vu' (kg) จากการวิเคราะห์ภายนอก ค่า NaN = ใช้สูตรเดิม
+             และ 'slab_type' ("One-Way" / "Two-Way" จากผังพื้น) ค่าว่าง = ใช้เกณฑ์ Ly/Lx
+             mainBar / tempBar = "Auto" -> เลือกจากตารางเหล็ก (ผลลัพธ์มี 'mainBar' / 'tempBar' ที่เลือกแล้ว)
+    คืนค่า dict ของ Array ผลลัพธ์ (float) และรหัสสถานะ (Status, int8)
+    แผ่นที่ระยะเหล็กปัดเหลือ 0: As_prov = inf, 'spacing_ok' = False, status_final = REVIEW (เหมือน design_slab)
+    ตัวเลขทุกค่าตรงกับ process_slab_calculation ทุกประการ
+    """
+    missing = [k for k in BATCH_FIELDS if k not in columns]
+    if missing:
+        raise KeyError(f"Missing batch columns: {', '.join(missing)}")
+
+    Lx = np.asarray(columns['Lx'], dtype=float).reshape(-1)
+    n = Lx.size
+    col = {}
+    for k in ('Ly', 'h', 'cover', 'fc', 'fy', 'sdl', 'll'):
+        col[k] = np.broadcast_to(np.asarray(columns[k], dtype=float).reshape(-1), (n,))
+    Ly, h_cm, cover_cm = col['Ly'], col['h'], col['cover']
+    fc, fy, sdl, ll = col['fc'], col['fy'], col['sdl'], col['ll']
+
+    support = np.broadcast_to(np.asarray(columns['support'], dtype=str).reshape(-1), (n,))
+    coef, ratio_def, K = _lookup(support, moment_coef, deflection_ratio, deflection_coef)
+    is_cant = support == "Cantilever"
+
+    main_keys = np.broadcast_to(np.asarray(columns['mainBar'], dtype=str).reshape(-1), (n,))
+    temp_keys = np.broadcast_to(np.asarray(columns['tempBar'], dtype=str).reshape(-1), (n,))
+    if (main_keys == AUTO_BAR).any() or (temp_keys == AUTO_BAR).any():
+        return _process_auto_bars(columns, main_keys, temp_keys)
+    db_main, Ab_main = _lookup(main_keys, lambda k: BAR_INFO[k]['d_mm'], lambda k: BAR_INFO[k]['A_cm2'])
+    Ab_temp = _lookup(temp_keys, lambda k: BAR_INFO[k]['A_cm2'])
+
+    b = 100
+    phi = 0.90
+    rho_min = 0.0018
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # 1. Geometry
+        ratio = Ly / Lx
+        one_way = ratio > ONE_WAY_RATIO
+        if 'slab_type' in columns:
+            plan = np.broadcast_to(np.asarray([t or "" for t in np.ravel(columns['slab_type'])], dtype=str), (n,))
+            one_way = np.where(plan == "", one_way, plan == "One-Way")
+
+        # 2. Loads
+        w_sw = 2400 * (h_cm / 100)
+        w_dead = w_sw + sdl
+        wu = 1.2 * w_dead + 1.6 * ll
+
+        # 3. Flexure (Main Steel)
+        Mu_kgm = (wu * (Lx * Lx)) / coef
+        if 'Mu' in columns:
+            Mu_ext = np.broadcast_to(np.asarray(columns['Mu'], dtype=float).reshape(-1), (n,))
+            given = ~np.isnan(Mu_ext)
+            Mu_kgm = np.where(given, Mu_ext, Mu_kgm)
+            coef = np.where(given, np.nan, coef)
+        Mu_kgcm = Mu_kgm * 100
+        d = h_cm - cover_cm - (db_main / 10) / 2
+        Rn = Mu_kgcm / (phi * b * d ** 2)
+
+        term = 1 - (2 * Rn) / (0.85 * fc)
+        calc_error = ~np.isfinite(term)
+        flex_fail = ~calc_error & (term < 0)
+        ok = ~(calc_error | flex_fail)
+        rho_req = np.where(ok, (0.85 * fc / fy) * (1 - np.sqrt(np.where(ok, term, 0.0))), 0.0)
+
+        As_flex_req = rho_req * b * d
+        As_min_req = rho_min * b * h_cm
+        flexure_controls = As_flex_req >= As_min_req
+        As_req_short = np.where(flexure_controls, As_flex_req, As_min_req)
+
+        s_calc = (Ab_main * 100) / As_req_short
+        s_max = np.minimum(3 * h_cm, 45.0)
+        s_main = np.floor(np.minimum(s_calc, s_max) * 2) / 2
+        As_prov_main = (Ab_main * 100) / s_main
+
+        # 4. Temperature Steel
+        As_req_long = 0.0018 * b * h_cm
+        s_t_calc = (Ab_temp * 100) / As_req_long
+        s_t_max = np.minimum(5 * h_cm, 45.0)
+        s_temp = np.floor(np.minimum(s_t_calc, s_t_max) * 2) / 2
+        As_prov_temp = (Ab_temp * 100) / s_temp
+
+        # 5. Checks
+        Vu = np.where(is_cant, wu * Lx, (wu * Lx) / 2)
+        if 'Vu' in columns:
+            Vu_ext = np.broadcast_to(np.asarray(columns['Vu'], dtype=float).reshape(-1), (n,))
+            Vu = np.where(np.isnan(Vu_ext), Vu, Vu_ext)
+        Vc = 0.53 * np.sqrt(fc) * b * d
+        phi_Vc = 0.85 * Vc
+        shear_pass = phi_Vc >= Vu
+
+        h_min = (Lx * 100 / ratio_def) * (0.4 + fy / 7000)
+
+        # ระยะแอ่นจริง (Icr + Branson Ie) เหมือน design_slab
+        L_cm = Lx * 100
+        Ec = 15100 * np.sqrt(fc)
+        Ig = b * h_cm * h_cm * h_cm / 12
+        Mcr = 2.0 * np.sqrt(fc) * Ig / (h_cm / 2)
+        m_per_w = Mu_kgm / wu * 100
+        n_ratio = E_STEEL / Ec
+        n_rho = n_ratio * As_prov_main / (b * d)
+        kd = (np.sqrt(2 * n_rho + n_rho * n_rho) - n_rho) * d
+        Icr = b * kd * kd * kd / 3 + n_ratio * As_prov_main * (d - kd) * (d - kd)
+        w_total = w_dead + ll
+        Ma = w_total * m_per_w
+        Ie = _effective_inertia(Ma, Mcr, Ig, Icr)
+        Ie_d = _effective_inertia(w_dead * m_per_w, Mcr, Ig, Icr)
+        delta_d = K * (w_dead / 100) * L_cm * L_cm * L_cm * L_cm / (Ec * Ie_d)
+        delta_ll = K * (w_total / 100) * L_cm * L_cm * L_cm * L_cm / (Ec * Ie) - delta_d
+        delta_lt = LONG_TERM_LAMBDA * (delta_d + SUSTAINED_LL * delta_ll) + delta_ll
+        defl_pass = (h_cm >= h_min) | ((delta_ll <= L_cm / DEFL_LIMIT_LL) & (delta_lt <= L_cm / DEFL_LIMIT_LT))
+
+    status_type = np.where(one_way, Status.OK, Status.WARNING).astype(np.int8)
+    status_flex = np.full(n, Status.OK, dtype=np.int8)
+    status_flex[flex_fail] = Status.THICKEN
+    status_flex[calc_error] = Status.CALC_ERROR
+    # ระยะเหล็กปัดลงเหลือ 0 (เหล็กเล็กเกินไป ต้องเรียงถี่กว่า 0.5 cm): ใช้ไม่ได้
+    status_flex[(status_flex == Status.OK) & ~(s_main > 0)] = Status.FAIL
+    spacing_ok = (s_main > 0) & (s_temp > 0)
+    status_shear = np.where(shear_pass, Status.PASS, Status.FAIL).astype(np.int8)
+    status_defl = np.where(defl_pass, Status.PASS, Status.CHECK).astype(np.int8)
+    status_final = np.where((status_flex == Status.OK) & shear_pass & spacing_ok,
+                            Status.COMPLETE, Status.REVIEW).astype(np.int8)
+
+    return {
+        'ratio': ratio, 'one_way': one_way,
+        'w_dead': w_dead, 'wu': wu,
+        'coef': coef, 'Mu': Mu_kgm, 'd': d, 'Rn': Rn,
+        'rho_req': rho_req, 'As_req': As_req_short, 'flexure_controls': flexure_controls,
+        's_main': s_main, 'As_prov_main': As_prov_main,
+        'As_req_long': As_req_long, 's_temp': s_temp, 'As_prov_temp': As_prov_temp,
+        'Vu': Vu, 'phi_Vc': phi_Vc, 'h_min': h_min,
+        'Icr': Icr, 'Ie': Ie, 'delta_ll': delta_ll, 'delta_lt': delta_lt,
+        'spacing_ok': spacing_ok,
+        'status_type': status_type, 'status_flex': status_flex, 'status_shear': status_shear,
+        'status_defl': status_defl, 'status_final': status_final,
+    }
@@ -0,0 +1,266 @@
+"""
+RC One-Way Slab Design - Benchmark Suite
+
+จับเวลาแต่ละขั้นของ Pipeline (คำนวณ, วาดรูป Cantilever / Span, เข้ารหัส base64, สร้างรายงาน)
+ทั้งแยกขั้นและแบบ End-to-end บนตารางสังเคราะห์ 1, 100 และ 10,000 แผ่น
+
+    python slab_bench.py -o bench_results.json
+    python slab_bench.py --baseline bench_results.json --threshold 0.2
+
+รายงาน Percentile ของ Latency, Throughput และ Peak Memory (tracemalloc) เป็น JSON
+ถ้าระบุ --baseline จะเทียบ p50 ของแต่ละขั้นและ Exit code 1 เมื่อช้าลงเกิน threshold
+ขั้นที่ใช้ matplotlib ช้ามาก จึงสุ่มตัวอย่างไม่เกิน --max-figures แผ่นต่อขนาดตาราง
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from slab_core import BAR_INFO, design_slab, process_slab_calculation
+
+SUPPORTS = ("Simply Supported", "Continuous (One End)", "Continuous (Both)", "Cantilever")
+SIZES = (1, 100, 10000)
+
+
+def synthetic_schedule(n, seed=0):
+    """ตารางพื้นสังเคราะห์ n แผ่น (ทำซ้ำได้ด้วย seed)"""
+    rnd = random.Random(seed)
+    bars = list(BAR_INFO)
+    out = []
+    for i in range(n):
+        Lx = round(rnd.uniform(1.0, 5.0), 1)
+        out.append({
+            'project': 'Benchmark', 'slab_id': f"S-{i + 1:05d}", 'engineer': 'bench',
+            'Lx': Lx, 'Ly': round(Lx * rnd.uniform(1.0, 3.5), 1),
+            'h': rnd.choice((10.0, 12.0, 15.0, 18.0)), 'cover': 2.0,
+            'fc': rnd.choice((210, 240, 280)), 'fy': rnd.choice((3000, 4000)),
+            'sdl': rnd.choice((100.0, 150.0, 200.0)), 'll': rnd.choice((200.0, 300.0, 500.0)),
+            'support': SUPPORTS[i % len(SUPPORTS)],
+            'mainBar': rnd.choice(bars[2:5]), 'tempBar': rnd.choice(bars[:3]),
+        })
+    return out
+
+
+def _percentiles(samples):
+    s = sorted(samples)
+
+    def pct(p):
+        return s[min(len(s) - 1, int(round(p / 100 * (len(s) - 1))))]
+
+    return {'p50': pct(50), 'p90': pct(90), 'p95': pct(95), 'p99': pct(99), 'max': s[-1], 'mean': statistics.fmean(s)}
+
+
+# ==========================================
+# 1. STAGES (setup -> callable ที่ถูกจับเวลา)
+# ==========================================
+def _figure_args(inp, d):
+    return (inp['h'], inp['cover'], inp['mainBar'], d.s_main, inp['tempBar'], d.s_temp, inp['support'], inp['Lx'])
+
+
+def _stage_calc(inp):
+    return lambda: process_slab_calculation(inp)
+
+
+def _stage_plot(inp):
+    from slab_plot import _load_matplotlib
+    plt, _ = _load_matplotlib()
+    args = _figure_args(inp, design_slab(inp))
+
+    def run():
+        from slab_plot import plot_slab_section
+        plt.close(plot_slab_section(*args))
+    return run
+
+
+def _stage_encode(inp):
+    """จับเวลาเฉพาะ fig_to_base64 (สร้างรูปก่อนเริ่มจับเวลา)"""
+    from slab_plot import plot_slab_section, fig_to_base64
+    fig = plot_slab_section(*_figure_args(inp, design_slab(inp)))
+    return lambda: fig_to_base64(fig)
+
+
+def _stage_canvas(inp):
+    """รูป PNG จาก Canvas ที่สร้างไว้แล้ว (slab_render) รวมการเข้ารหัส base64"""
+    from slab_render import render_section_png
+    args = _figure_args(inp, design_slab(inp))
+    render_section_png(*args)  # สร้าง Canvas ของ Layout นี้ก่อนเริ่มจับเวลา
+    return lambda: render_section_png(*args)
+
+
+def _stage_svg(inp):
+    from slab_svg import render_section_svg
+    args = _figure_args(inp, design_slab(inp))
+    return lambda: render_section_svg(*args)
+
+
+def _stage_report(inp):
+    from slab_report import generate_report
+    rows, s_main, s_temp = process_slab_calculation(inp)
+    img = "data:image/png;base64," + "A" * 40000  # ขนาดใกล้เคียงรูป PNG จริง
+    return lambda: generate_report(inp, rows, img)
+
+
+def _stage_end_to_end(inp):
+    from slab_plot import plot_slab_section, fig_to_base64
+    from slab_report import generate_report
+
+    def run():
+        rows, s_main, s_temp = process_slab_calculation(inp)
+        img = fig_to_base64(plot_slab_section(inp['h'], inp['cover'], inp['mainBar'], s_main, inp['tempBar'],
+                                              s_temp, inp['support'], inp['Lx']))
+        return generate_report(inp, rows, img)
+    return run
+
+
+# name -> (setup, ใช้ matplotlib หรือไม่, filter ของแผ่นที่ใช้)
+STAGES = {
+    'calc': (_stage_calc, False, None),
+    'plot_cantilever': (_stage_plot, True, lambda inp: inp['support'] == "Cantilever"),
+    'plot_span': (_stage_plot, True, lambda inp: inp['support'] != "Cantilever"),
+    'fig_to_base64': (_stage_encode, True, None),
+    'png_canvas': (_stage_canvas, True, None),
+    'svg': (_stage_svg, False, None),
+    'report': (_stage_report, False, None),
+    'end_to_end': (_stage_end_to_end, True, None),
+}
+
+
+def _run_stage(name, schedule, max_figures):
+    setup, heavy, keep = STAGES[name]
+    items = [inp for inp in schedule if keep is None or keep(inp)]
+    if not items:
+        # ตาราง 1 แผ่นอาจไม่มีชนิดจุดรองรับที่ต้องการ ใช้แผ่นแรกเปลี่ยนชนิดแทน
+        support = "Cantilever" if name == 'plot_cantilever' else "Simply Supported"
+        items = [dict(schedule[0], support=support)]
+    sampled = heavy and len(items) > max_figures
+    if sampled:
+        items = items[:max_figures]
+
+    # setup ทีละแผ่นก่อนจับเวลาแผ่นนั้น (ไม่สร้างรูป matplotlib ค้างไว้ทีละหลายร้อยรูป)
+    lat = []
+    for inp in items:
+        fn = setup(inp)
+        t = time.perf_counter()
+        fn()
+        lat.append(time.perf_counter() - t)
+    total = sum(lat)
+
+    # Peak memory แยกรอบ เพราะ tracemalloc ทำให้เวลาเพี้ยน (วัดเฉพาะส่วนที่เพิ่มระหว่างเรียก fn)
+    peak = 0
+    tracemalloc.start()
+    for inp in items[:50]:
+        fn = setup(inp)
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    result = {k: v * 1e3 for k, v in _percentiles(lat).items()}  # ms
+    result.update(n=len(items), sampled=sampled, throughput_per_s=len(items) / total if total > 0 else None,
+                  peak_mem_kb=peak / 1024)
+    return result
+
+
+def _run_batch(schedule):
+    """Batch Engine แบบ Vectorized (ถ้ามี NumPy) เทียบกับการคำนวณทีละแผ่น"""
+    try:
+        from slab_batch import BATCH_FIELDS, process_slab_batch
+    except ImportError:
+        return None
+    columns = {k: [inp[k] for inp in schedule] for k in BATCH_FIELDS}
+    lat = []
+    for _ in range(5):
+        t = time.perf_counter()
+        process_slab_batch(columns)
+        lat.append(time.perf_counter() - t)
+    tracemalloc.start()
+    process_slab_batch(columns)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    best = min(lat)
+    return {'p50': statistics.median(lat) * 1e3, 'min': best * 1e3, 'n': len(schedule), 'sampled': False,
+            'throughput_per_s': len(schedule) / best if best > 0 else None, 'peak_mem_kb': peak / 1024}
+
+
+def run_benchmarks(sizes=SIZES, stages=None, max_figures=200, seed=0):
+    stages = stages or list(STAGES)
+    results = {}
+    for n in sizes:
+        schedule = synthetic_schedule(n, seed)
+        per_size = {}
+        for name in stages:
+            per_size[name] = _run_stage(name, schedule, max_figures)
+            print(f"  n={n:<6} {name:<16} p50={per_size[name]['p50']:.3f} ms "
+                  f"({per_size[name]['throughput_per_s']:,.0f}/s)", file=sys.stderr)
+        batch = _run_batch(schedule)
+        if batch:
+            per_size['batch'] = batch
+        results[str(n)] = per_size
+    return {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'cpu_count': os.cpu_count(), 'seed': seed, 'max_figures': max_figures,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=0.2):
+    """list ของขั้นที่ p50 ช้าลงเกิน threshold (สัดส่วน) เมื่อเทียบกับ baseline"""
+    regressions = []
+    for size, stages in current['results'].items():
+        for name, cur in stages.items():
+            base = baseline.get('results', {}).get(size, {}).get(name)
+            if not base or not base.get('p50'):
+                continue
+            change = cur['p50'] / base['p50'] - 1
+            if change > threshold:
+                regressions.append({'size': size, 'stage': name, 'baseline_p50_ms': base['p50'],
+                                    'p50_ms': cur['p50'], 'change': change})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the slab design pipeline.")
+    parser.add_argument("-o", "--output", default="bench_results.json", help="JSON results file")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="schedule sizes, comma separated")
+    parser.add_argument("--stages", default=",".join(STAGES), help="stages to run, comma separated")
+    parser.add_argument("--max-figures", type=int, default=200, help="max slabs per size for matplotlib stages")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p50 slowdown (0.2 = +20%%)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    stages = [s for s in args.stages.split(",") if s]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    data = run_benchmarks(sizes, stages, args.max_figures, args.seed)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        data['regressions'] = compare(data, baseline, args.threshold)
+        for r in data['regressions']:
+            print(f"REGRESSION n={r['size']} {r['stage']}: {r['baseline_p50_ms']:.3f} -> {r['p50_ms']:.3f} ms "
+                  f"(+{r['change']:.0%})", file=sys.stderr)
+        status = 1 if data['regressions'] else 0
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
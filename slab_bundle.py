@@ -0,0 +1,285 @@
+"""
+RC One-Way Slab Design - Offline Report Bundle
+
+รวมรายงานทั้งโครงการเป็นไฟล์ .zip ที่เปิดได้โดยไม่ต้องต่อเน็ต
+Font, CSS และรูปหน้าตัดถูกเขียนเพียงครั้งเดียวเป็น Asset ที่ตั้งชื่อตาม hash ของเนื้อหา
+
+    python slab_bundle.py schedule.csv -o project.zip --font Sarabun-Regular.ttf --font-bold Sarabun-Bold.ttf
+    python slab_bundle.py schedule.csv -o project.zip --combined --drawing png
+
+โครงสร้างใน zip:
+    index.html                   รายการแผ่นพื้น (ลิงก์ไปยังรายงาน)
+    reports/<slab_id>.html       รายงานของแต่ละแผ่น (link CSS / รูปใน assets/)
+    reports/all.html             รายงานรวม (เมื่อ --combined)
+    assets/<hash>.css|png|svg|woff2|woff|ttf
+
+- รูปที่พารามิเตอร์เหมือนกัน (figure_key ของ slab_cache) วาดครั้งเดียวและใช้ไฟล์เดียวกัน
+- Font ถูก Subset ให้เหลือเฉพาะตัวอักษรที่ใช้จริง (รวมภาษาไทยและ Layout Feature ทั้งหมด) ถ้ามี fontTools
+  ไม่มี fontTools ใส่ทั้งไฟล์ ไม่ระบุ Font ใช้ sans-serif ของเครื่อง (ไม่โหลดจาก Google Fonts)
+- zip มีวันที่คงที่ ข้อมูลเดิมได้ไฟล์เดิมทุกไบต์
+- รูปเริ่มต้นเป็น SVG (zip เล็กสุดทุกกรณี) สถิติ 'ratio' = ขนาดรายงานที่ฝังทุกอย่าง (รูปชนิดเดียวกัน) / ขนาด zip
+  ตาราง 2,000 แผ่นที่รูปไม่ซ้ำกันเลย: SVG 5.5 MB (3.9 เท่า), PNG 32 MB (1.9 เท่า)
+  ตาราง 2,000 แผ่นจาก 25 แบบ: SVG 3.7 MB (5.8 เท่า), PNG 4.2 MB (14.6 เท่า)
+  ส่วนที่ลดได้ราว 10 เท่าขึ้นไปมาจากรูปที่ซ้ำกัน (หรือเมื่อเทียบกับรายงานที่ฝัง PNG: zip แบบ SVG เล็กกว่าราว 11 เท่า)
+"""
+import argparse
+import base64
+import hashlib
+import html
+import io
+import os
+import sys
+import zipfile
+
+from slab_cache import figure_key
+from slab_core import design_slab
+from slab_report import REPORT_CSS, ReportNames, iter_head, iter_slab, iter_tail
+
+ASSET_DIR = "assets"
+REPORT_DIR = "reports"
+FONT_FAMILY = "Sarabun"
+_ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+_COMPRESSED = ('.png', '.woff', '.woff2')  # บีบอัดแล้ว เก็บแบบ STORED
+_MIME = {'.woff2': 'woff2', '.woff': 'woff', '.ttf': 'truetype', '.otf': 'opentype'}
+
+
+# ==========================================
+# 1. ARCHIVE
+# ==========================================
+class BundleWriter:
+    """zip ที่เพิ่ม Asset แบบ Content-addressed (เนื้อหาเดียวกันเขียนครั้งเดียว)"""
+
+    def __init__(self, path):
+        self.zip = zipfile.ZipFile(path, 'w')
+        self.assets = {}
+        self.asset_refs = 0
+        self.raw_bytes = 0
+
+    def _write(self, name, data):
+        info = zipfile.ZipInfo(name, date_time=_ZIP_DATE)
+        info.external_attr = 0o644 << 16
+        info.compress_type = zipfile.ZIP_STORED if name.endswith(_COMPRESSED) else zipfile.ZIP_DEFLATED
+        self.zip.writestr(info, data)
+        self.raw_bytes += len(data)
+
+    def add_asset(self, data, ext):
+        """เพิ่ม Asset คืน path ภายใน zip (assets/<hash><ext>)"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.asset_refs += 1
+        name = f"{ASSET_DIR}/{hashlib.sha256(data).hexdigest()[:20]}{ext}"
+        if name not in self.assets:
+            self.assets[name] = len(data)
+            self._write(name, data)
+        return name
+
+    def add_text(self, name, text):
+        self._write(name, text.encode('utf-8'))
+
+    def close(self):
+        self.zip.close()
+
+
+# ==========================================
+# 2. FONT SUBSET
+# ==========================================
+def subset_font(path, text):
+    """
+    (bytes, นามสกุล, จำนวน glyph) ของ Font ที่เหลือเฉพาะตัวอักษรใน text
+    เก็บ Layout Feature ทั้งหมด (GSUB/GPOS) เพื่อให้สระ/วรรณยุกต์ไทยวางตำแหน่งถูกต้อง
+    ไม่มี fontTools: คืนทั้งไฟล์ (glyph = None)
+    """
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        from fontTools import subset
+    except ImportError:
+        with open(path, 'rb') as f:
+            return f.read(), ext, None
+
+    options = subset.Options()
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    options.notdef_outline = True
+    options.drop_tables += ['FFTM']  # Timestamp ของ FontForge: ไม่ใช้แสดงผลและทำให้ผลไม่คงที่
+    try:
+        import brotli  # noqa: F401  (woff2 ต้องใช้ brotli)
+        options.flavor, ext = 'woff2', '.woff2'
+    except ImportError:
+        options.flavor, ext = 'woff', '.woff'
+    font = subset.load_font(path, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    buf = io.BytesIO()
+    subset.save_font(font, buf, options)
+    return buf.getvalue(), ext, len(font.getGlyphOrder())
+
+
+def _font_face(url, ext, weight):
+    return (f"@font-face {{ font-family: '{FONT_FAMILY}'; font-weight: {weight}; font-style: normal; "
+            f"src: url('{url}') format('{_MIME.get(ext, 'truetype')}'); }}\n")
+
+
+# ==========================================
+# 3. FIGURES
+# ==========================================
+def _figure_args(design):
+    inp = design.inputs
+    return (inp['h'], inp['cover'], inp['mainBar'], design.s_main, inp['tempBar'], design.s_temp,
+            inp['support'], inp['Lx'])
+
+
+def render_figures(unique_args, drawing='png', workers=1):
+    """dict ของ figure_key -> (bytes, นามสกุล) วาดครั้งเดียวต่อ key"""
+    keys = list(unique_args)
+    if drawing == 'svg':
+        from slab_svg import render_section_svg
+        return {k: (render_section_svg(*unique_args[k]).encode('utf-8'), '.svg') for k in keys}
+    from slab_render import render_many
+    images = render_many([unique_args[k] for k in keys], workers=workers)
+    return {k: (base64.b64decode(img.split(",", 1)[1]), '.png') for k, img in zip(keys, images)}
+
+
+# ==========================================
+# 4. BUNDLE
+# ==========================================
+def _index_html(title, css_href, entries):
+    items = []
+    for slab_id, href, status in entries:
+        name = html.escape(str(slab_id))
+        link = f'<a href="{href}">{name}</a>' if href else name
+        items.append(f"<tr><td>{link}</td><td>{html.escape(status)}</td></tr>")
+    return (f'<!DOCTYPE html>\n<html lang="th">\n<head>\n<meta charset="UTF-8">\n<title>{html.escape(title)}</title>\n'
+            f'<link rel="stylesheet" href="{css_href}">\n</head>\n<body>\n<h1>{html.escape(title)}</h1>\n'
+            f'<table>\n<thead><tr><th>Slab</th><th>Status</th></tr></thead>\n<tbody>\n'
+            + "\n".join(items) + "\n</tbody>\n</table>\n</body>\n</html>\n")
+
+
+def build_bundle(path, slabs, drawing='svg', font=None, font_bold=None, title="One-Way Slab Design Report",
+                 combined=False, workers=1, errors=()):
+    """
+    เขียน Bundle ของรายงานลง path (.zip) คืน dict สถิติ (จำนวนรูป/Asset, ขนาด, ขนาดถ้าฝังทุกอย่างในรายงาน
+    และ ratio = inline_bytes / archive_bytes)
+    drawing: 'svg' (ค่าเริ่มต้น) หรือ 'png'
+    slabs: iterable ของ inputs (ผ่าน parse_row แล้ว)
+    font / font_bold: ไฟล์ TTF/OTF น้ำหนัก 400 / 700 (None = ใช้ Font ของเครื่อง)
+    errors: list ของ (slab_id, ข้อความ) ของแถวที่ออกแบบไม่ได้ (แสดงในหน้า index)
+            แผ่นที่ระยะเหล็กปัดเหลือ 0 หรือคำนวณไม่ได้ถูกเพิ่มเข้า errors แทนการหยุดทั้ง Bundle
+    """
+    from slab_schedule import spacing_error
+    errors = list(errors)
+    designs, design_rows = [], []
+    for inp in slabs:
+        try:
+            d = design_slab(inp)
+            rows = d.rows()
+        except (ArithmeticError, ValueError) as e:
+            errors.append((inp['slab_id'], f"{type(e).__name__}: {e}"))
+            continue
+        if not d.spacing_ok:
+            errors.append((inp['slab_id'], spacing_error(d.s_main, d.s_temp)))
+            continue
+        designs.append(d)
+        design_rows.append(rows)
+
+    # 1. รูป: หนึ่งไฟล์ต่อ figure_key (และต่อเนื้อหา)
+    fig_keys = []
+    unique = {}
+    for d in designs:
+        args = _figure_args(d)
+        key = figure_key(*args, fmt_name=drawing)
+        fig_keys.append(key)
+        unique.setdefault(key, args)
+    figures = render_figures(unique, drawing, workers)
+
+    bundle = BundleWriter(path)
+    try:
+        fig_names = {k: bundle.add_asset(data, ext) for k, (data, ext) in figures.items()}
+
+        # 2. เนื้อหาของแต่ละแผ่น (ต้องรู้ตัวอักษรทั้งหมดก่อน Subset Font)
+        bodies = ["".join(iter_slab(d.inputs, rows, f"../{fig_names[k]}"))
+                  for d, rows, k in zip(designs, design_rows, fig_keys)]
+        inline_bytes = sum(len("".join(iter_slab(d.inputs, rows, _inline_image(*figures[k]))).encode('utf-8'))
+                           for d, rows, k in zip(designs, design_rows, fig_keys))
+
+        # 3. Font (Subset) + CSS รวมเป็น Asset เดียว
+        css = REPORT_CSS
+        glyphs = {}
+        if font or font_bold:
+            text = "".join(set("".join(bodies) + title + "".join(str(s) for s, _ in errors))) + \
+                "".join(chr(c) for c in range(0x20, 0x7f))
+            for weight, font_path in ((400, font), (700, font_bold or font)):
+                if font_path:
+                    data, ext, n = subset_font(font_path, text)
+                    css = _font_face(os.path.basename(bundle.add_asset(data, ext)), ext, weight) + css
+                    glyphs[weight] = n
+        css_name = bundle.add_asset(css, '.css')
+
+        # 4. รายงาน
+        head = "".join(iter_head(title=title, css_href=f"../{css_name}", font_href=None))
+        tail = "".join(iter_tail())
+        entries = []
+        names = ReportNames()
+        if combined:
+            names.used.add("all.html")  # ชื่อของรายงานรวม
+        for d, body in zip(designs, bodies):
+            name = f"{REPORT_DIR}/{names(d.inputs['slab_id'])}"
+            bundle.add_text(name, head + body + tail)
+            entries.append((d.inputs['slab_id'], name, d.status_final.label))
+        if combined:
+            bundle.add_text(f"{REPORT_DIR}/all.html", head + "".join(bodies) + tail)
+        entries += [(slab_id, None, f"ERROR: {err}") for slab_id, err in errors]
+        bundle.add_text("index.html", _index_html(title, css_name, entries))
+    finally:
+        bundle.close()
+
+    head_inline = len("".join(iter_head(title=title)).encode('utf-8')) + len(tail.encode('utf-8'))
+    archive_bytes = os.path.getsize(path)
+    inline_bytes += head_inline * len(designs)
+    return {
+        'slabs': len(designs), 'errors': len(errors), 'figures': len(fig_keys), 'unique_figures': len(figures),
+        'assets': len(bundle.assets), 'asset_refs': bundle.asset_refs, 'font_glyphs': glyphs,
+        'archive_bytes': archive_bytes, 'raw_bytes': bundle.raw_bytes, 'inline_bytes': inline_bytes,
+        'ratio': inline_bytes / archive_bytes,
+    }
+
+
+def _inline_image(data, ext):
+    """รูปแบบเดียวกับที่รายงานปกติฝัง (data URI ของ PNG / SVG string) ใช้คำนวณขนาดเทียบ"""
+    if ext == '.svg':
+        return data.decode('utf-8')
+    return f"data:image/png;base64,{base64.b64encode(data).decode()}"
+
+
+def main(argv=None):
+    from slab_schedule import parse_row, read_schedule
+
+    parser = argparse.ArgumentParser(description="Write a self-contained offline report bundle (.zip).")
+    parser.add_argument("schedule", help="input schedule (.csv or .xlsx)")
+    parser.add_argument("-o", "--output", required=True, help="output .zip")
+    parser.add_argument("--drawing", choices=("svg", "png"), default="svg", help="section drawing format")
+    parser.add_argument("--font", metavar="TTF", help="regular font (e.g. Sarabun-Regular.ttf), subset to used glyphs")
+    parser.add_argument("--font-bold", metavar="TTF", help="bold font (e.g. Sarabun-Bold.ttf)")
+    parser.add_argument("--title", default="One-Way Slab Design Report")
+    parser.add_argument("--combined", action="store_true", help="also include one combined report (reports/all.html)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="processes for PNG rendering")
+    args = parser.parse_args(argv)
+
+    slabs, errors = [], []
+    for i, raw in enumerate(read_schedule(args.schedule)):
+        inputs, err = parse_row(raw, i)
+        if err is None:
+            slabs.append(inputs)
+        else:
+            errors.append((inputs['slab_id'], err))
+
+    stats = build_bundle(args.output, slabs, args.drawing, args.font, args.font_bold, args.title, args.combined,
+                         args.workers, errors)
+    print(f"{stats['slabs']} slabs ({stats['errors']} errors), {stats['unique_figures']} unique of "
+          f"{stats['figures']} figures, {stats['assets']} assets -> {stats['archive_bytes'] / 1024:,.0f} KB "
+          f"(inline reports: {stats['inline_bytes'] / 1024:,.0f} KB, {stats['ratio']:.1f}x smaller)", file=sys.stderr)
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
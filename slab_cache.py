@@ -0,0 +1,198 @@
+"""
+RC One-Way Slab Design - Design Cache
+
+แคชผลคำนวณและรูปหน้าตัด โดยใช้ key จากค่าทางวิศวกรรมเท่านั้น
+(ไม่รวม project / engineer / slab_id) แก้ชื่อโครงการแล้วจึงสร้างเฉพาะ HTML ใหม่
+
+- Tier 1: LRU ในหน่วยความจำ (จำกัดจำนวนรายการ)
+- Tier 2: SQLite บนดิสก์ (ไม่บังคับ) อยู่รอดข้ามการ Restart
+- key ทุกชนิดมี CACHE_VERSION ไฟล์แคชจากโค้ดรุ่นเก่าจึงไม่ถูกนำมาใช้ (และค่าที่ unpickle ไม่ได้ถือเป็น miss)
+"""
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from slab_core import SlabDesign, design_slab
+
+ENGINEERING_FIELDS = ('Lx', 'Ly', 'h', 'cover', 'fc', 'fy', 'sdl', 'll', 'support', 'mainBar', 'tempBar')
+# ค่าจากการวิเคราะห์ภายนอก (slab_strip, slab_floor) ใส่ใน key เฉพาะเมื่อมี เพื่อให้ key ของพื้นทั่วไปคงเดิม
+OVERRIDE_FIELDS = ('Mu', 'Vu', 'analysis', 'slab_type')
+# เพิ่มค่าทุกครั้งที่ design_slab / SlabDesign (ค่าหรือความหมายของ field) หรือรูปหน้าตัดเปลี่ยน
+# 1: SlabDesign + ระยะแอ่นที่คำนวณ (Ec, Icr, Ie, delta_*) และ status_defl แบบใหม่
+# 2: K จากโมเมนต์กลาง/ปลายช่วง และ LL ค้างในระยะแอ่นระยะยาว
+# 3: รูป PNG หน้าตัดเป็น RGB (ไม่มี Alpha)
+# 4: id ใน SVG หน้าตัดมี Prefix ต่อรูป
+CACHE_VERSION = 4
+
+
+def normalize(v):
+    """ทำให้ค่าตัวเลขเป็นรูปแบบเดียวกัน (12 == 12.0) ก่อนนำไปสร้าง key"""
+    if isinstance(v, bool) or v is None:
+        return v
+    if isinstance(v, (int, float)):
+        return repr(float(v))
+    return str(v)
+
+
+def digest(parts):
+    """sha256 (hex) ของ parts ที่ Normalize แล้ว (list/ค่าที่แปลงเป็น JSON ได้)"""
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def design_key(inputs):
+    """Key ของผลคำนวณ: hash ของค่าทางวิศวกรรมที่ Normalize แล้ว"""
+    parts = [CACHE_VERSION] + [normalize(inputs[k]) for k in ENGINEERING_FIELDS]
+    parts += [[k, normalize(inputs[k])] for k in OVERRIDE_FIELDS if inputs.get(k) is not None]
+    return digest(parts)
+
+
+def figure_key(h_cm, cover_cm, main_key, s_main, temp_key, s_temp, support_type, Lx_real, fmt_name='png'):
+    """Key ของรูปหน้าตัด: เฉพาะพารามิเตอร์ที่มีผลต่อรูป"""
+    params = (h_cm, cover_cm, main_key, s_main, temp_key, s_temp, support_type, Lx_real)
+    return digest([CACHE_VERSION, fmt_name] + [normalize(v) for v in params])
+
+
+class _LRUTier:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key):
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class _SQLiteTier:
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS cache ("
+                           "kind TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+                           "PRIMARY KEY (kind, key))")
+        self._conn.commit()
+
+    def get(self, kind, key):
+        row = self._conn.execute("SELECT value FROM cache WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0])
+        except Exception:  # ไฟล์จากโค้ดรุ่นอื่น (class/field ไม่ตรง) หรือข้อมูลเสีย: ถือเป็น miss แล้วเขียนทับ
+            return None
+
+    def put(self, kind, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO cache (kind, key, value) VALUES (?, ?, ?)",
+                           (kind, key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)))
+        self._conn.commit()
+
+    def clear(self):
+        self._conn.execute("DELETE FROM cache")
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+class DesignCache:
+    """
+    แคชสองชั้นสำหรับผลคำนวณ (SlabDesign) และรูปหน้าตัด (string ของรูป)
+
+    maxsize: จำนวนรายการสูงสุดใน LRU ต่อชนิด (calc / figure)
+    path: ไฟล์ SQLite สำหรับ Tier บนดิสก์ (None = ใช้เฉพาะหน่วยความจำ)
+
+    ค่าที่คืนเป็น Object ที่แชร์กันระหว่างผู้เรียก ห้ามแก้ไขโดยตรง
+    """
+
+    KINDS = ('calc', 'figure')
+
+    def __init__(self, maxsize=256, path=None):
+        self._memory = {kind: _LRUTier(maxsize) for kind in self.KINDS}
+        self._disk = _SQLiteTier(path) if path else None
+        self._lock = threading.Lock()
+        self._stats = {kind: {'memory_hits': 0, 'disk_hits': 0, 'misses': 0} for kind in self.KINDS}
+
+    @staticmethod
+    def _valid(kind, value):
+        """ค่าจาก Tier บนดิสก์ใช้ได้หรือไม่ (SlabDesign ต้องมีทุก field ของโค้ดปัจจุบัน)"""
+        if kind == 'calc':
+            return isinstance(value, SlabDesign) and all(hasattr(value, f) for f in SlabDesign.__slots__)
+        return isinstance(value, str)
+
+    def _get_or_compute(self, kind, key, compute):
+        with self._lock:
+            value = self._memory[kind].get(key)
+            if value is not None:
+                self._stats[kind]['memory_hits'] += 1
+                return value
+            if self._disk is not None:
+                value = self._disk.get(kind, key)
+                if value is not None and self._valid(kind, value):
+                    self._stats[kind]['disk_hits'] += 1
+                    self._memory[kind].put(key, value)
+                    return value
+            self._stats[kind]['misses'] += 1
+
+        # คำนวณนอก Lock เพื่อไม่ให้ Session อื่นต้องรอ
+        value = compute()
+        with self._lock:
+            self._memory[kind].put(key, value)
+            if self._disk is not None:
+                self._disk.put(kind, key, value)
+        return value
+
+    def design(self, inputs):
+        """
+        ผลของ design_slab(inputs) ผ่านแคช
+        SlabDesign ที่ได้อ้างถึงเฉพาะค่าทางวิศวกรรม (ชื่อโครงการ/ผู้ออกแบบให้ใช้จาก inputs ของผู้เรียก)
+        """
+        eng = {k: inputs[k] for k in ENGINEERING_FIELDS}
+        eng.update((k, inputs[k]) for k in OVERRIDE_FIELDS if inputs.get(k) is not None)
+        return self._get_or_compute('calc', design_key(inputs), lambda: design_slab(eng))
+
+    def figure(self, h_cm, cover_cm, main_key, s_main, temp_key, s_temp, support_type, Lx_real, render=None,
+               fmt_name='png'):
+        """
+        รูปหน้าตัดผ่านแคช
+        render: ฟังก์ชันที่รับพารามิเตอร์เดียวกับ plot_slab_section แล้วคืน string ของรูป
+                (ค่าเริ่มต้น = PNG base64 จาก matplotlib)
+        """
+        args = (h_cm, cover_cm, main_key, s_main, temp_key, s_temp, support_type, Lx_real)
+        if render is None:
+            def render(*a):
+                from slab_plot import plot_slab_section, fig_to_base64
+                return fig_to_base64(plot_slab_section(*a))
+        return self._get_or_compute('figure', figure_key(*args, fmt_name=fmt_name), lambda: render(*args))
+
+    def stats(self):
+        """ตัวนับ hit/miss แยกตามชนิด พร้อมจำนวนรายการใน LRU"""
+        with self._lock:
+            out = {kind: dict(v, size=len(self._memory[kind])) for kind, v in self._stats.items()}
+        return out
+
+    def clear(self):
+        with self._lock:
+            for tier in self._memory.values():
+                tier.clear()
+            if self._disk is not None:
+                self._disk.clear()
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
@@ -0,0 +1,274 @@
+"""
+RC One-Way Slab Design - Design Charts (Memory-mapped Lookup Tables)
+
+ตารางคำนวณล่วงหน้าสำหรับคำถามแบบ What-if ที่ต้องการคำตอบเร็วระดับไมโครวินาที
+เก็บเป็นไฟล์ .npy แล้วเปิดแบบ Memory-map (np.load(mmap_mode='r')) ตอนเริ่มโปรแกรม
+
+- rho_req(fc, fy, Rn): ρ·fy/(0.85fc) = f(t) = 1 - √(1 - 2t), t = Rn/(0.85fc) ∈ [0, 0.5]
+  ตาราง 1 มิติของ f(t) จึงครอบคลุมทุก fc / fy โดยไม่มีความคลาดเคลื่อนจากการลดมิติ
+  Linear Interpolation มีขอบเขตความคลาดเคลื่อน max|f''|·Δt²/8 ต่อช่อง (f'' = (1 - 2t)^-1.5)
+  ช่องใกล้ขอบ t = 0.5 (หน้าตัดเล็กเกินไป) ขอบเขตโตเกิน tol จึงคำนวณตรง
+- phi_Vc(fc, d): 0.85·0.53·√fc·b·d จากตาราง √fc ต่อ 1 ksc (ขอบเขต |(√fc)''|·Δ²/8)
+- min_thickness(Lx, sdl, ll, support, fc, fy): h ที่น้อยที่สุด (ทีละ 0.5 cm) ที่ผ่าน Flexure, Shear และ h_min
+  h_min (Deflection) เป็นสูตรปิดจึงคำนวณตรงเสมอ ส่วน h ต่ำสุดด้านกำลัง (Flexure + Shear ไม่ขึ้นกับ fy)
+  เก็บเป็นตารางค่าต่อเนื่องตาม (support, fc, Lx, q = 1.2SDL + 1.6LL) สำหรับ cover / mainBar ที่กำหนดตอนสร้าง
+  ค่านี้เพิ่มตาม Lx และ q เสมอ มุมของช่องจึงเป็นขอบล่าง/บนที่รับประกันได้
+  ถ้าปัดขึ้นเป็น h ในตารางแล้วได้ค่าเดียวกันทั้งสองมุมตอบจากตารางได้เลย
+  ถ้าไม่ (ช่องที่คร่อมจุดเปลี่ยนของ Check) จึงคำนวณตรง
+
+    python slab_charts.py build charts/
+    python slab_charts.py query charts/ --Lx 3.5 --sdl 150 --ll 300 --support "Continuous (Both)"
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from slab_core import BAR_INFO, deflection_ratio, moment_coef
+
+SUPPORTS = ("Simply Supported", "Continuous (One End)", "Continuous (Both)", "Cantilever")
+FC_GRID = (180.0, 210.0, 240.0, 280.0, 320.0, 350.0)
+LX_GRID = tuple(np.round(np.arange(0.5, 8.0 + 1e-9, 0.05), 2))
+Q_GRID = tuple(np.arange(0.0, 3000.0 + 1e-9, 10.0))  # 1.2SDL + 1.6LL (kg/m²)
+H_GRID = tuple(np.arange(6.0, 60.0 + 1e-9, 0.5))
+RHO_POINTS = 8193
+FC_RANGE = (100.0, 500.0)
+
+META_FILE = "charts.json"
+FILES = {'rho_f': "rho_f.npy", 'rho_bound': "rho_bound.npy", 'sqrt_fc': "sqrt_fc.npy",
+         'h_strength': "h_strength.npy"}
+_EPS = 1e-4  # cm ระยะกันปัดเศษ (float32) เมื่อค่าใกล้ h ในตาราง
+
+
+# ==========================================
+# 1. EXACT FORMULAS (เหมือน design_slab)
+# ==========================================
+def rho_exact(fc, fy, Rn):
+    """ρ_req ตามสูตรของ design_slab (NaN เมื่อ 1 - 2Rn/0.85fc < 0)"""
+    with np.errstate(invalid='ignore'):
+        term = 1 - (2 * np.asarray(Rn, dtype=float)) / (0.85 * fc)
+        return np.where(term >= 0, (0.85 * fc / fy) * (1 - np.sqrt(np.maximum(term, 0))), np.nan)
+
+
+def _strength_ok(h, Lx, q, support, fc, cover, db_mm):
+    """mask ของ h ที่ผ่าน Flexure (term ≥ 0) และ Shear (φVc ≥ Vu) ทั้งคู่เพิ่มตาม h อย่างเดียว"""
+    wu = 1.2 * 2400 * (h / 100) + q
+    d = h - cover - (db_mm / 10) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Rn = (wu * Lx ** 2) / moment_coef(support) * 100 / (0.90 * 100 * d ** 2)
+        term = 1 - (2 * Rn) / (0.85 * fc)
+    Vu = wu * Lx if support == "Cantilever" else (wu * Lx) / 2
+    phi_Vc = 0.85 * 0.53 * np.sqrt(fc) * 100 * d
+    return (d > 0) & (term >= 0) & (phi_Vc >= Vu)
+
+
+def deflection_thickness(Lx, support, fy):
+    """h_min = (L/ratio)(0.4 + fy/7000) ตามตาราง ACI/EIT (cm)"""
+    return (Lx * 100 / deflection_ratio(support)) * (0.4 + fy / 7000)
+
+
+def strength_thickness(Lx, q, support, fc, cover=2.0, db_mm=12, h_max=H_GRID[-1], iterations=48):
+    """h ต่ำสุดแบบต่อเนื่องที่ผ่าน Flexure และ Shear (Bisection แบบ Vectorized, inf ถ้าเกิน h_max)"""
+    Lx, q = np.broadcast_arrays(np.asarray(Lx, dtype=float), np.asarray(q, dtype=float))
+    lo = np.full(Lx.shape, cover + (db_mm / 10) / 2)
+    hi = np.full(Lx.shape, float(h_max))
+    feasible = _strength_ok(hi, Lx, q, support, fc, cover, db_mm)
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        ok = _strength_ok(mid, Lx, q, support, fc, cover, db_mm)
+        hi = np.where(ok, mid, hi)
+        lo = np.where(ok, lo, mid)
+    return np.where(feasible, hi, np.inf)
+
+
+def grid_ceil(h, h_grid=H_GRID):
+    """h ที่น้อยที่สุดใน h_grid ที่ ≥ h (NaN ถ้าเกิน)"""
+    grid = np.asarray(h_grid, dtype=float)
+    i = int(np.searchsorted(grid, h, side='left'))
+    return float(grid[i]) if i < grid.size else float('nan')
+
+
+def min_thickness_exact(Lx, q, support, fc, fy, cover=2.0, main_bar='DB12', h_grid=H_GRID):
+    """h ที่น้อยที่สุดใน h_grid ที่ผ่านทุก Check (NaN ถ้าไม่มี) ตรวจทุกค่าในตารางโดยตรง"""
+    h = np.asarray(h_grid, dtype=float)
+    ok = _strength_ok(h, Lx, q, support, fc, cover, BAR_INFO[main_bar]['d_mm']) & \
+        (h >= deflection_thickness(Lx, support, fy))
+    return float(h[np.argmax(ok)]) if ok.any() else float('nan')
+
+
+# ==========================================
+# 2. BUILD
+# ==========================================
+def _rho_table(n=RHO_POINTS):
+    t = np.linspace(0.0, 0.5, n)
+    f = 1 - np.sqrt(np.maximum(1 - 2 * t, 0))
+    dt = t[1] - t[0]
+    with np.errstate(divide='ignore'):
+        f2_max = (1 - 2 * t[1:]) ** -1.5  # f'' เพิ่มตาม t ค่ามากสุดของช่องอยู่ที่ปลายขวา
+    return f, f2_max * dt ** 2 / 8
+
+
+def _strength_table(cover, main_bar):
+    """h ต่ำสุดด้านกำลัง [support, fc, Lx, q] (float32, inf = เกิน h_grid)"""
+    db = BAR_INFO[main_bar]['d_mm']
+    Lx = np.asarray(LX_GRID)[:, None]
+    q = np.asarray(Q_GRID)[None, :]
+    out = np.empty((len(SUPPORTS), len(FC_GRID), len(LX_GRID), len(Q_GRID)), dtype=np.float32)
+    for a, support in enumerate(SUPPORTS):
+        for b, fc in enumerate(FC_GRID):
+            h = strength_thickness(Lx, q, support, fc, cover, db)
+            # float32 ปัดขึ้นเพื่อให้ยังเป็นขอบบนของค่าจริง
+            out[a, b] = np.nextafter(h.astype(np.float32), np.float32(np.inf))
+    return out
+
+
+def build_charts(directory, cover=2.0, main_bar='DB12'):
+    """คำนวณตารางทั้งหมดแล้วเขียนเป็น .npy + charts.json ลง directory"""
+    os.makedirs(directory, exist_ok=True)
+    rho_f, rho_bound = _rho_table()
+    fc = np.arange(FC_RANGE[0], FC_RANGE[1] + 1)
+    arrays = {'rho_f': rho_f, 'rho_bound': rho_bound, 'sqrt_fc': np.sqrt(fc),
+              'h_strength': _strength_table(cover, main_bar)}
+    for key, arr in arrays.items():
+        np.save(os.path.join(directory, FILES[key]), arr)
+    meta = {'cover': cover, 'main_bar': main_bar, 'supports': SUPPORTS, 'fc_grid': FC_GRID,
+            'lx_grid': LX_GRID, 'q_grid': Q_GRID, 'h_grid': H_GRID, 'fc_range': FC_RANGE}
+    with open(os.path.join(directory, META_FILE), "w", encoding="utf-8") as f:
+        json.dump({k: list(v) if isinstance(v, tuple) else v for k, v in meta.items()}, f)
+    return directory
+
+
+# ==========================================
+# 3. QUERIES
+# ==========================================
+class DesignCharts:
+    """
+    ตารางที่เปิดแบบ Memory-map (อ่านเฉพาะหน้าที่ถูกใช้ ใช้ร่วมกันได้หลาย Process)
+    stats: จำนวนคำตอบจากตาราง / จากการคำนวณตรง
+    """
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self._arr = {k: np.load(os.path.join(directory, name), mmap_mode='r') for k, name in FILES.items()}
+        self._support_idx = {s: i for i, s in enumerate(self.meta['supports'])}
+        self._fc_idx = {v: i for i, v in enumerate(self.meta['fc_grid'])}
+        self._lx = np.asarray(self.meta['lx_grid'])
+        self._q = np.asarray(self.meta['q_grid'])
+        self.stats = {'table': 0, 'exact': 0}
+
+    # --- rho ---
+    def rho_req(self, fc, fy, Rn, tol=1e-6):
+        """
+        (ρ_req, ขอบเขตความคลาดเคลื่อน) จากตาราง หรือ (ค่าตรง, 0.0) เมื่อขอบเขตเกิน tol
+        ρ = NaN เมื่อ Rn เกินขีดจำกัด (หน้าตัดเล็กเกินไป)
+        """
+        f, bound = self._arr['rho_f'], self._arr['rho_bound']
+        t = Rn / (0.85 * fc)
+        if t > 0.5:
+            self.stats['exact'] += 1
+            return float('nan'), 0.0
+        n = f.shape[0] - 1
+        x = t * 2 * n
+        i = min(int(x), n - 1)
+        scale = 0.85 * fc / fy
+        err = float(bound[i]) * scale
+        if err > tol:
+            self.stats['exact'] += 1
+            return float(rho_exact(fc, fy, Rn)), 0.0
+        self.stats['table'] += 1
+        w = x - i
+        return float((f[i] * (1 - w) + f[i + 1] * w) * scale), err
+
+    # --- shear ---
+    def phi_Vc(self, fc, d, b=100):
+        """(φVc, ขอบเขตความคลาดเคลื่อน) kg จากตาราง √fc (fc นอกช่วงตารางคำนวณตรง)"""
+        lo, hi = self.meta['fc_range']
+        k = 0.85 * 0.53 * b * d
+        if not lo <= fc <= hi:
+            self.stats['exact'] += 1
+            return k * float(np.sqrt(fc)), 0.0
+        self.stats['table'] += 1
+        x = fc - lo
+        i = min(int(x), int(hi - lo) - 1)
+        w = x - i
+        s = self._arr['sqrt_fc']
+        return k * float(s[i] * (1 - w) + s[i + 1] * w), k * (lo + i) ** -1.5 / 4 / 8
+
+    # --- minimum thickness ---
+    def strength_bounds(self, Lx, q, support, fc):
+        """
+        (ขอบล่าง, ขอบบน) ของ h ต่ำสุดด้านกำลังจากมุมของช่อง (ค่าเพิ่มตาม Lx และ q)
+        None ถ้าอยู่นอกตาราง
+        """
+        a = self._support_idx.get(support)
+        b = self._fc_idx.get(float(fc))
+        lx, qg = self._lx, self._q
+        if a is None or b is None or not (lx[0] <= Lx <= lx[-1] and qg[0] <= q <= qg[-1]):
+            return None
+        i = min(int(np.searchsorted(lx, Lx, side='right')) - 1, lx.size - 2)
+        j = min(int(np.searchsorted(qg, q, side='right')) - 1, qg.size - 2)
+        table = self._arr['h_strength'][a, b]
+        return float(table[i, j]), float(table[i + 1 if Lx > lx[i] else i, j + 1 if q > qg[j] else j])
+
+    def min_thickness(self, Lx, sdl, ll, support, fc, fy, exact_fallback=True):
+        """
+        h (cm) ที่น้อยที่สุดใน h_grid ซึ่งผ่าน Flexure, Shear และ h_min (NaN ถ้าไม่มี)
+        คำนวณตรงเฉพาะเมื่ออยู่นอกตาราง หรือขอบล่าง/บนปัดขึ้นแล้วได้ h ต่างกัน (ใกล้จุดเปลี่ยนของ Check)
+        exact_fallback=False: คืนค่าจากขอบบน (ปลอดภัยเสมอ) แทนการคำนวณตรง
+        """
+        q = 1.2 * sdl + 1.6 * ll
+        h_grid = self.meta['h_grid']
+        bounds = self.strength_bounds(Lx, q, support, fc)
+        if bounds is not None:
+            h_defl = deflection_thickness(Lx, support, fy)
+            lo = grid_ceil(max(h_defl, bounds[0]) - _EPS, h_grid)
+            hi = grid_ceil(max(h_defl, bounds[1]) + _EPS, h_grid)
+            if lo == hi or (np.isnan(lo) and np.isnan(hi)) or not exact_fallback:
+                self.stats['table'] += 1
+                return hi
+        self.stats['exact'] += 1
+        return min_thickness_exact(Lx, q, support, fc, fy, self.meta['cover'], self.meta['main_bar'], h_grid)
+
+
+def load_charts(directory):
+    return DesignCharts(directory)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query precomputed slab design charts.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="precompute the charts into DIR")
+    b.add_argument("directory")
+    b.add_argument("--cover", type=float, default=2.0)
+    b.add_argument("--main-bar", default="DB12", choices=list(BAR_INFO))
+    q = sub.add_parser("query", help="minimum thickness for a span and load")
+    q.add_argument("directory")
+    q.add_argument("--Lx", type=float, required=True)
+    q.add_argument("--sdl", type=float, default=150.0)
+    q.add_argument("--ll", type=float, default=300.0)
+    q.add_argument("--support", default="Simply Supported", choices=SUPPORTS)
+    q.add_argument("--fc", type=float, default=240.0)
+    q.add_argument("--fy", type=float, default=4000.0)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        t = time.perf_counter()
+        build_charts(args.directory, args.cover, args.main_bar)
+        print(f"Charts written to {args.directory} in {time.perf_counter() - t:.2f} s", file=sys.stderr)
+        return 0
+
+    charts = load_charts(args.directory)
+    t = time.perf_counter()
+    h = charts.min_thickness(args.Lx, args.sdl, args.ll, args.support, args.fc, args.fy)
+    elapsed = (time.perf_counter() - t) * 1e6
+    source = "table" if charts.stats['table'] else "exact"
+    print(f"h_min = {h:.1f} cm ({source}, {elapsed:.0f} µs)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
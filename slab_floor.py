@@ -0,0 +1,322 @@
+"""
+RC One-Way Slab Design - Floor Plan Mode
+
+ออกแบบพื้นทั้งชั้นจากผังแผ่นพื้น (สี่เหลี่ยมผืนผ้าตามแนวแกน) และแนวคาน/ผนัง
+
+- หาขอบที่ใช้ร่วมกันด้วย Spatial Index: Hash ตามเส้นกริด (แกน, พิกัด) แล้ว Sweep ช่วงที่เรียงแล้วบนแต่ละเส้น
+  รวม O(E log E) จึงใช้กับผังหลายพันแผ่นได้
+- กำหนด Lx/Ly, ทิศทางการรับแรง, ชนิดจุดรองรับ (ต่อเนื่อง 0/1/2 ด้าน หรือ Cantilever)
+  และ One-Way / Two-Way (Ly/Lx > 2.0) ให้อัตโนมัติ
+- ออกแบบทุกแผ่นด้วย Batch Engine (design_chunk ของ slab_schedule)
+
+    python slab_floor.py panels.csv --beams beams.csv --set h=12 --set ll=300 -o floor.csv
+    python slab_floor.py --grid-x 0,4,8,11 --grid-y 0,3,6 --set h=12 -o floor.csv --combined-report floor.html
+
+คอลัมน์ของ panels.csv: slab_id, x0, y0, x1, y1 (m) หรือ polygon ("x,y; x,y; ...")
+    + คอลัมน์วิศวกรรมแบบเดียวกับ slab_schedule (ยกเว้น Lx, Ly, support ซึ่งหาให้อัตโนมัติ)
+beams.csv: x0, y0, x1, y1 ของแนวคาน/ผนัง (ถ้าไม่ระบุ ถือว่าทุกขอบของแผ่นพื้นวางบนคาน)
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import defaultdict
+
+from slab_core import ONE_WAY_RATIO, SUPPORT_BY_CONTINUITY
+from slab_schedule import OUTPUT_FIELDS, parse_row, read_schedule
+
+SIDES = ('W', 'E', 'S', 'N')
+OPPOSITE = {'W': 'E', 'E': 'W', 'S': 'N', 'N': 'S'}
+BEAM = -1  # owner ของช่วงที่เป็นคาน
+
+FLOOR_FIELDS = ('slab_id', 'x0', 'y0', 'x1', 'y1', 'span_dir', 'slab_type', 'continuous')
+FLOOR_OUTPUT_FIELDS = FLOOR_FIELDS + tuple(k for k in OUTPUT_FIELDS if k != 'slab_id')
+
+
+# ==========================================
+# 1. GEOMETRY
+# ==========================================
+def parse_panel(raw):
+    """(x0, y0, x1, y1) ของแผ่นพื้นจาก x0..y1 หรือ polygon (ต้องเป็นสี่เหลี่ยมผืนผ้าตามแนวแกน)"""
+    poly = raw.get('polygon')
+    if poly:
+        pts = [tuple(float(v) for v in p.split(',')) for p in str(poly).split(';') if p.strip()]
+        xs = sorted({x for x, _ in pts})
+        ys = sorted({y for _, y in pts})
+        if len(xs) != 2 or len(ys) != 2 or len(set(pts)) != 4:
+            raise ValueError("polygon must be an axis-aligned rectangle")
+        return xs[0], ys[0], xs[1], ys[1]
+    x0, y0, x1, y1 = (float(raw[k]) for k in ('x0', 'y0', 'x1', 'y1'))
+    return min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)
+
+
+def panel_edges(rect):
+    """ขอบทั้ง 4 ด้าน: side -> (แกนของเส้น, พิกัดของเส้น, lo, hi)"""
+    x0, y0, x1, y1 = rect
+    return {'W': ('x', x0, y0, y1), 'E': ('x', x1, y0, y1), 'S': ('y', y0, x0, x1), 'N': ('y', y1, x0, x1)}
+
+
+def grid_panels(x_lines, y_lines, prefix="S"):
+    """แผ่นพื้นทุกช่องของกริด (พิกัดเส้นกริดเรียงจากน้อยไปมาก) เป็น list ของ dict ดิบ"""
+    out = []
+    for j, (y0, y1) in enumerate(zip(y_lines, y_lines[1:])):
+        for i, (x0, x1) in enumerate(zip(x_lines, x_lines[1:])):
+            out.append({'slab_id': f"{prefix}-{j + 1:02d}{i + 1:02d}", 'x0': x0, 'y0': y0, 'x1': x1, 'y1': y1})
+    return out
+
+
+class EdgeIndex:
+    """
+    Spatial Index ของขอบแผ่นพื้นและคาน
+    key = (แกน, พิกัดของเส้นปัดตาม tol) -> list ของ (lo, hi, owner, side, พิกัด) บนเส้นนั้น
+    เส้นที่พิกัดต่างกันไม่เกิน tol อาจถูกปัดไปคนละ Bucket ที่อยู่ติดกัน overlaps จึงตรวจ Bucket ถัดไปด้วย
+    """
+
+    def __init__(self, tol=1e-3):
+        self.tol = tol
+        self._lines = defaultdict(list)
+
+    def add(self, axis, coord, lo, hi, owner, side):
+        self._lines[(axis, round(coord / self.tol))].append((lo, hi, owner, side, coord))
+
+    def overlaps(self):
+        """(a, b, ความยาวที่ทับกัน) ของทุกคู่ช่วงที่ทับกันบนเส้นเดียวกัน (พิกัดต่างกันไม่เกิน tol)"""
+        tol = self.tol
+        for (axis, key), items in self._lines.items():
+            ahead = self._lines.get((axis, key + 1))
+            if not ahead:  # กรณีทั่วไป: ไม่มีเส้นใน Bucket ถัดไป
+                items.sort()
+                active = []
+                for item in items:
+                    lo = item[0]
+                    active = [a for a in active if a[1] > lo + tol]
+                    for a in active:
+                        yield a, item, min(a[1], item[1]) - lo
+                    active.append(item)
+                continue
+            # คู่ที่อยู่ใน Bucket ถัดไปทั้งคู่ถูกนับตอน Sweep ของ Bucket นั้นเอง
+            merged = sorted([(item, False) for item in items] + [(item, True) for item in ahead])
+            active = []
+            for item, item_ahead in merged:
+                lo = item[0]
+                active = [a for a in active if a[0][1] > lo + tol]
+                for a, a_ahead in active:
+                    if not (a_ahead and item_ahead) and abs(a[4] - item[4]) <= tol:
+                        yield a, item, min(a[1], item[1]) - lo
+                active.append((item, item_ahead))
+
+
+# ==========================================
+# 2. CONTINUITY & CLASSIFICATION
+# ==========================================
+def _classify(rect, supported, continuous):
+    """(span_dir, Lx, Ly, support, slab_type) หรือ ValueError ถ้ารองรับไม่พอ"""
+    x0, y0, x1, y1 = rect
+    wx, wy = x1 - x0, y1 - y0
+    span_x = supported['W'] and supported['E']
+    span_y = supported['S'] and supported['N']
+
+    if span_x or span_y:
+        # รองรับสองคู่ด้าน: รับแรงทางด้านสั้น
+        if span_x and span_y:
+            direction = 'X' if wx <= wy else 'Y'
+        else:
+            direction = 'X' if span_x else 'Y'
+        ends = ('W', 'E') if direction == 'X' else ('S', 'N')
+        Lx, Ly = (wx, wy) if direction == 'X' else (wy, wx)
+        support = SUPPORT_BY_CONTINUITY[sum(continuous[s] for s in ends)]
+        one_way = not (span_x and span_y) or Ly / Lx > ONE_WAY_RATIO
+        return direction, Lx, Ly, support, "One-Way" if one_way else "Two-Way"
+
+    held = [s for s in SIDES if supported[s]]
+    if len(held) == 1:
+        # Cantilever: Lx = ระยะยื่นตั้งฉากกับขอบที่ยึด
+        side = held[0]
+        if side in ('W', 'E'):
+            return 'X', wx, wy, "Cantilever", "One-Way"
+        return 'Y', wy, wx, "Cantilever", "One-Way"
+    raise ValueError("panel is not supported on two opposite edges")
+
+
+def analyze_floor(rects, beams=None, tol=1e-3, min_overlap=0.5):
+    """
+    ตรวจความต่อเนื่องของทุกแผ่น
+    rects: list ของ (x0, y0, x1, y1) หรือ None (แผ่นที่ข้อมูลผิด), beams: list ของ (x0, y0, x1, y1) หรือ None
+    ขอบถือว่าต่อเนื่อง/มีคานรองรับเมื่อส่วนที่ทับกันยาวอย่างน้อย min_overlap ของความยาวขอบ
+
+    คืน list ของ dict: span_dir, Lx, Ly, support, slab_type, continuous (ด้านที่ต่อเนื่อง), error
+    """
+    index = EdgeIndex(tol)
+    for i, rect in enumerate(rects):
+        if rect is None:
+            continue
+        for side, (axis, coord, lo, hi) in panel_edges(rect).items():
+            index.add(axis, coord, lo, hi, i, side)
+    for bx0, by0, bx1, by1 in beams or ():
+        if abs(bx0 - bx1) <= tol:
+            index.add('x', bx0, min(by0, by1), max(by0, by1), BEAM, 'B')
+        elif abs(by0 - by1) <= tol:
+            index.add('y', by0, min(bx0, bx1), max(bx0, bx1), BEAM, 'B')
+        else:
+            raise ValueError(f"beam ({bx0}, {by0})-({bx1}, {by1}) must be horizontal or vertical")
+
+    shared = defaultdict(float)
+    beam_cover = defaultdict(float)
+    clash = set()
+    for a, b, length in index.overlaps():
+        (_, _, ia, sa, _), (_, _, ib, sb, _) = a, b
+        if ia == BEAM and ib == BEAM:
+            continue
+        if ia == BEAM or ib == BEAM:
+            i, s = (ib, sb) if ia == BEAM else (ia, sa)
+            beam_cover[i, s] += length
+        elif OPPOSITE[sa] == sb:
+            shared[ia, sa] += length
+            shared[ib, sb] += length
+        elif length > tol:
+            clash.update((ia, ib))
+
+    out = []
+    for i, rect in enumerate(rects):
+        if rect is None:
+            out.append({'error': "invalid panel geometry"})
+            continue
+        if i in clash:
+            out.append({'error': "panel overlaps another panel"})
+            continue
+        edges = panel_edges(rect)
+        need = {s: min_overlap * (hi - lo) for s, (_, _, lo, hi) in edges.items()}
+        supported = {s: beams is None or beam_cover[i, s] >= need[s] for s in SIDES}
+        continuous = {s: supported[s] and shared[i, s] >= need[s] for s in SIDES}
+        try:
+            direction, Lx, Ly, support, slab_type = _classify(rect, supported, continuous)
+        except ValueError as e:
+            out.append({'error': str(e)})
+            continue
+        out.append({'span_dir': direction, 'Lx': round(Lx, 6), 'Ly': round(Ly, 6), 'support': support,
+                    'slab_type': slab_type, 'continuous': "".join(s for s in SIDES if continuous[s]) or "-",
+                    'error': None})
+    return out
+
+
+# ==========================================
+# 3. BATCH DESIGN
+# ==========================================
+def floor_inputs(panels, beams=None, defaults=None, tol=1e-3, min_overlap=0.5):
+    """
+    list ของ (inputs, error) สำหรับ design_chunk
+    panels: dict ดิบ (พิกัด + ค่าวิศวกรรม), defaults: ค่าวิศวกรรมที่ใช้เมื่อแถวไม่ได้ระบุ
+    """
+    defaults = defaults or {}
+    rects = []
+    for raw in panels:
+        try:
+            rects.append(parse_panel(raw))
+        except (KeyError, TypeError, ValueError):
+            rects.append(None)
+    info = analyze_floor(rects, beams, tol, min_overlap)
+
+    out = []
+    for i, (raw, rect, geo) in enumerate(zip(panels, rects, info)):
+        raw = dict(defaults, **{k: v for k, v in raw.items() if v not in (None, '')})
+        if rect is not None:
+            raw.update(zip(('x0', 'y0', 'x1', 'y1'), rect))
+        if geo['error']:
+            inputs = {k: raw.get(k, '') for k in FLOOR_FIELDS}
+            inputs['slab_id'] = str(raw.get('slab_id') or f"S-{i + 1:02d}")
+            out.append((inputs, geo['error']))
+            continue
+        raw.update(Lx=geo['Lx'], Ly=geo['Ly'], support=geo['support'])
+        inputs, err = parse_row(raw, i)
+        # parse_row ให้ Lx เป็นด้านสั้น แต่แผ่นที่รองรับเพียงสองด้านอาจรับแรงทางด้านยาว
+        inputs = dict(inputs, Lx=geo['Lx'], Ly=geo['Ly'], span_dir=geo['span_dir'], slab_type=geo['slab_type'],
+                      continuous=geo['continuous'], **{k: raw[k] for k in ('x0', 'y0', 'x1', 'y1')})
+        out.append((inputs, err))
+    return out
+
+
+def design_floor(panels, beams=None, defaults=None, tol=1e-3, min_overlap=0.5, **options):
+    """
+    ออกแบบพื้นทั้งชั้นด้วย Batch Engine ครั้งเดียว คืน list ของแถวผลลัพธ์ (FLOOR_OUTPUT_FIELDS)
+    options: ส่งต่อให้ design_chunk (report_dir, drawing, fragments, sheets, metrics)
+    """
+    from slab_schedule import design_chunk
+    chunk = floor_inputs(panels, beams, defaults, tol, min_overlap)
+    rows = design_chunk(chunk, **options)
+    for row, (inputs, _) in zip(rows, chunk):
+        for k in FLOOR_FIELDS:
+            row.setdefault(k, inputs.get(k, ''))
+    return rows
+
+
+def _read_beams(path):
+    return [tuple(float(r[k]) for k in ('x0', 'y0', 'x1', 'y1')) for r in read_schedule(path)]
+
+
+def _parse_set(values):
+    out = {}
+    for item in values or ():
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"--set expects KEY=VALUE, got '{item}'")
+        out[key.strip()] = value.strip()
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Design every panel of a floor plan with automatic continuity.")
+    parser.add_argument("panels", nargs="?", help="panel layout (.csv or .xlsx)")
+    parser.add_argument("--grid-x", help="grid line x-coordinates in m, comma separated (instead of a panel file)")
+    parser.add_argument("--grid-y", help="grid line y-coordinates in m, comma separated")
+    parser.add_argument("--beams", metavar="FILE", help="beam/wall segments (x0,y0,x1,y1); default: every edge")
+    parser.add_argument("--set", action="append", metavar="KEY=VALUE",
+                        help="default engineering value for every panel (e.g. h=12, ll=300)")
+    parser.add_argument("--tol", type=float, default=1e-3, help="coordinate tolerance in m")
+    parser.add_argument("--min-overlap", type=float, default=0.5,
+                        help="shared fraction of an edge needed to count it as continuous/supported")
+    parser.add_argument("-o", "--output", default="-", help="output CSV (default: stdout)")
+    parser.add_argument("--reports", metavar="DIR", help="also write one HTML report per panel into DIR")
+    parser.add_argument("--combined-report", metavar="FILE", help="also write one combined HTML report")
+    parser.add_argument("--drawing", choices=("svg", "png"), default="svg", help="section drawing in reports")
+    args = parser.parse_args(argv)
+
+    if args.grid_x and args.grid_y:
+        panels = grid_panels([float(v) for v in args.grid_x.split(",")], [float(v) for v in args.grid_y.split(",")])
+    elif args.panels:
+        panels = list(read_schedule(args.panels))
+    else:
+        parser.error("give a panel file or both --grid-x and --grid-y")
+    beams = _read_beams(args.beams) if args.beams else None
+    defaults = _parse_set(args.set)
+
+    from slab_report import iter_head, iter_tail, write_css, write_stream
+    if args.reports:
+        os.makedirs(args.reports, exist_ok=True)
+        write_css(args.reports)
+
+    start = time.perf_counter()
+    rows = design_floor(panels, beams, defaults, args.tol, args.min_overlap, report_dir=args.reports,
+                        drawing=args.drawing, fragments=bool(args.combined_report))
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        writer = csv.DictWriter(out, fieldnames=FLOOR_OUTPUT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if args.combined_report:
+        with open(args.combined_report, "w", encoding="utf-8") as f:
+            write_stream(f, iter_head(title="One-Way Slab Design Report (Floor Plan)"))
+            for row in rows:
+                f.write(row.get('report_html', ''))
+            write_stream(f, iter_tail())
+
+    n_err = sum(bool(r['error']) for r in rows)
+    print(f"Designed {len(rows)} panels ({n_err} errors) in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+    return 1 if n_err else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+RC One-Way Slab Design - Incremental Schedule Re-design
+
+เก็บ hash ของ inputs (Normalize แล้ว) ของแต่ละแผ่นพร้อมแถวผลลัพธ์ไว้ในไฟล์ state (JSON)
+รันครั้งถัดไปคำนวณ/วาดรูป/เขียนรายงานใหม่เฉพาะแผ่นที่ hash เปลี่ยน แล้วสรุปว่าแผ่นใดเปลี่ยน
+ระยะเหล็กหรือสถานะ แก้หนึ่งแถวในตาราง 2,000 แถวจึงใช้เวลาใกล้เคียงการออกแบบแผ่นเดียว
+
+    python slab_schedule.py schedule.csv -o results.csv --state schedule.state.json --reports reports/
+
+- hash = design_key (ค่าทางวิศวกรรม, slab_cache) + project / engineer / slab_id + ชนิดรูป
+- state จำ fingerprint ของโค้ดคำนวณ/รายงาน ถ้าโค้ดเปลี่ยนจะคำนวณใหม่ทั้งตาราง
+- HTML ของแต่ละแผ่นสำหรับรายงานรวมเก็บแยกตาม hash ในโฟลเดอร์ <state>.fragments/
+- รายงานแยกไฟล์ของแผ่นที่ไม่เปลี่ยนไม่ถูกเขียนทับ (เขียนใหม่ถ้าไฟล์หายไป) แผ่นที่ถูกลบออกจากตาราง (หรือกลายเป็น error) ถูกลบรายงานด้วย
+"""
+import hashlib
+import json
+import os
+
+from slab_cache import design_key, digest, normalize
+from slab_metrics import NULL_METRICS
+from slab_schedule import name_reports, parse_row, run_parsed
+
+STATE_VERSION = 1
+DIFF_FIELDS = ('mainBar', 's_main', 'tempBar', 's_temp',
+               'status_flex', 'status_shear', 'status_defl', 'status_final', 'error')
+# โมดูลที่มีผลต่อตัวเลข แถวผลลัพธ์ (OUTPUT_FIELDS / design_chunk) หรือรายงาน (เปลี่ยนแล้วต้องคำนวณใหม่ทั้งหมด)
+ENGINE_MODULES = ('slab_core', 'slab_batch', 'slab_rebar', 'slab_cache', 'slab_schedule', 'slab_report',
+                  'slab_svg', 'slab_plot', 'slab_render')
+
+
+# ==========================================
+# 1. HASHES & STATE FILE
+# ==========================================
+def slab_hash(inputs, error=None, drawing='svg'):
+    """hash ของทุกอย่างที่มีผลต่อแถวผลลัพธ์และรายงานของแผ่นนั้น"""
+    if error is not None:  # แถวที่ parse ไม่ผ่าน: ผลลัพธ์ขึ้นกับค่าที่อ่านได้และข้อความ error เท่านั้น
+        return digest([sorted((k, normalize(v)) for k, v in inputs.items()), error])
+    return digest([design_key(inputs), inputs['slab_id'], inputs['project'], inputs['engineer'], drawing])
+
+
+def engine_fingerprint():
+    """sha256 ของซอร์สโค้ดใน ENGINE_MODULES"""
+    h = hashlib.sha256()
+    base = os.path.dirname(os.path.abspath(__file__))
+    for name in ENGINE_MODULES:
+        path = os.path.join(base, name + ".py")
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+
+def load_state(path):
+    """state ที่บันทึกไว้ หรือ state ว่างถ้าไม่มีไฟล์/รูปแบบไม่ตรง"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {'version': STATE_VERSION, 'engine': None, 'slabs': {}}
+    if state.get('version') != STATE_VERSION:
+        return {'version': STATE_VERSION, 'engine': None, 'slabs': {}}
+    return state
+
+
+def save_state(path, state):
+    """เขียนแบบ Atomic (ไฟล์ชั่วคราว + replace) รันค้างกลางคันจะไม่ทำให้ state เสีย"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _row_keys(parsed):
+    """key ของแต่ละแถว = slab_id (slab_id ซ้ำ: ต่อท้าย #2, #3 ...)"""
+    seen = {}
+    keys = []
+    for inputs, _ in parsed:
+        sid = str(inputs.get('slab_id', ''))
+        seen[sid] = seen.get(sid, 0) + 1
+        keys.append(sid if seen[sid] == 1 else f"{sid}#{seen[sid]}")
+    return keys
+
+
+# ==========================================
+# 2. DIFF
+# ==========================================
+def diff_rows(old, new):
+    """
+    เทียบแถวผลลัพธ์เดิม/ใหม่ (dict ของ key -> แถว)
+    คืน dict: added, removed (list ของ key), changed (key -> {field: (เดิม, ใหม่)})
+    """
+    changed = {}
+    for key, row in new.items():
+        before = old.get(key)
+        if before is None:
+            continue
+        fields = {f: (before.get(f, ''), row.get(f, '')) for f in DIFF_FIELDS
+                  if str(before.get(f, '')) != str(row.get(f, ''))}
+        if fields:
+            changed[key] = fields
+    return {'added': [k for k in new if k not in old], 'removed': [k for k in old if k not in new],
+            'changed': changed}
+
+
+def format_diff(diff, recomputed):
+    """ข้อความสรุปการเปลี่ยนแปลง (หนึ่งบรรทัดต่อแผ่น)"""
+    lines = [f"{recomputed} recomputed, {len(diff['changed'])} changed design, "
+             f"{len(diff['added'])} added, {len(diff['removed'])} removed"]
+    for key, fields in diff['changed'].items():
+        parts = ", ".join(f"{f}: {a} -> {b}" for f, (a, b) in fields.items())
+        lines.append(f"  ~ {key}: {parts}")
+    lines += [f"  + {key}" for key in diff['added']]
+    lines += [f"  - {key}" for key in diff['removed']]
+    return lines
+
+
+# ==========================================
+# 3. INCREMENTAL RUN
+# ==========================================
+def _fragment_path(fragment_dir, h):
+    return os.path.join(fragment_dir, h + ".html")
+
+
+def run_incremental(rows, state_path, workers=None, chunk_size=256, metrics=NULL_METRICS,
+                    report_dir=None, drawing='svg', fragments=False):
+    """
+    ออกแบบตารางแบบ Incremental คืน (แถวผลลัพธ์ทั้งหมดตามลำดับ Input, diff, จำนวนแผ่นที่คำนวณใหม่)
+    rows: iterable ของ dict ดิบ (เช่นจาก read_schedule)
+    แถวที่ hash ตรงกับ state ใช้แถวเดิม (และไฟล์รายงาน/HTML เดิม) แถวที่เหลือส่งเข้า run_parsed
+    """
+    parsed = list(name_reports(parse_row(raw, i) for i, raw in enumerate(rows)))
+    keys = _row_keys(parsed)
+    hashes = [slab_hash(inputs, err, drawing) for inputs, err in parsed]
+
+    state = load_state(state_path)
+    engine = engine_fingerprint()
+    prev = state['slabs']
+    old = prev if state.get('engine') == engine else {}  # โค้ดเปลี่ยน: คำนวณใหม่ทุกแถว แต่ยัง diff กับผลเดิม
+    fragment_dir = state_path + ".fragments"
+    if fragments:
+        os.makedirs(fragment_dir, exist_ok=True)
+
+    from slab_report import report_filename
+
+    def report_of(entry):
+        return entry.get('report') or report_filename(entry['row']['slab_id'])  # state เดิมไม่มี 'report'
+
+    def reusable(key, h, inputs):
+        entry = old.get(key)
+        if entry is None or entry['hash'] != h:
+            return False
+        if entry['row'].get('error'):
+            return True  # ไม่มีรายงานให้ตรวจ
+        if report_dir:
+            # ชื่อไฟล์เปลี่ยนได้เมื่อแผ่นอื่นที่ชื่อชนกันถูกเพิ่ม/ลบ
+            if report_of(entry) != inputs['report_file'] or \
+                    not os.path.exists(os.path.join(report_dir, inputs['report_file'])):
+                return False
+        return not fragments or os.path.exists(_fragment_path(fragment_dir, h))
+
+    todo = [i for i, (key, h, (inputs, _)) in enumerate(zip(keys, hashes, parsed)) if not reusable(key, h, inputs)]
+    metrics.incr("reused", len(parsed) - len(todo))
+    fresh = run_parsed((parsed[i] for i in todo), workers, chunk_size, metrics,
+                       report_dir=report_dir, drawing=drawing, fragments=fragments)
+
+    out = [None] * len(parsed)
+    for i, row in zip(todo, fresh):
+        if fragments and 'report_html' in row:
+            with open(_fragment_path(fragment_dir, hashes[i]), "w", encoding="utf-8") as f:
+                f.write(row['report_html'])
+        out[i] = row
+    for i, row in enumerate(out):
+        if row is None:
+            row = dict(old[keys[i]]['row'])
+            if fragments and not row.get('error'):
+                with open(_fragment_path(fragment_dir, hashes[i]), encoding="utf-8") as f:
+                    row['report_html'] = f.read()
+            out[i] = row
+
+    new = {key: {k: v for k, v in row.items() if k not in ('report_html', 'pdf_sheet')}
+           for key, row in zip(keys, out)}
+    diff = diff_rows({k: e['row'] for k, e in prev.items()}, new)
+
+    # ลบรายงาน / HTML ที่ไม่มีแผ่นใดใช้แล้ว
+    reports = {key: inputs.get('report_file') for key, (inputs, _) in zip(keys, parsed)}
+    if report_dir:
+        live = {reports[key] for key, row in new.items() if not row.get('error')}
+        for key, entry in prev.items():
+            name = report_of(entry)
+            path = os.path.join(report_dir, name)
+            if name not in live and os.path.exists(path):
+                os.remove(path)
+    if fragments:
+        live = {h + ".html" for h in hashes}
+        for name in os.listdir(fragment_dir):
+            if name.endswith(".html") and name not in live:
+                os.remove(os.path.join(fragment_dir, name))
+
+    save_state(state_path, {'version': STATE_VERSION, 'engine': engine, 'drawing': drawing,
+                            'slabs': {key: {'hash': h, 'row': new[key], 'report': reports[key]}
+                                      for key, h in zip(keys, hashes)}})
+    return out, diff, len(todo)
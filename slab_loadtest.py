@@ -0,0 +1,161 @@
+"""
+RC One-Way Slab Design - Service Load Test
+
+ยิงคำขอ POST /design พร้อมกันหลายการเชื่อมต่อ (keep-alive) ไปที่ slab_service บนเครื่องนี้
+แล้วรายงาน Throughput และ Latency (p50 / p95 / p99)
+
+    python slab_loadtest.py --port 8765 --concurrency 64 --requests 5000
+    python slab_loadtest.py --spawn --window-ms 0 2 5 -o loadtest.json   # เปิดบริการเองทีละค่า window
+    python slab_loadtest.py --spawn --drawing png --requests 200
+
+inputs สุ่มจาก synthetic_schedule ของ slab_bench (ทำซ้ำได้ด้วย --seed)
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+from slab_bench import _percentiles, synthetic_schedule
+
+
+# ==========================================
+# 1. CLIENT
+# ==========================================
+async def _request(reader, writer, host, method, path, body=b""):
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+                  f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _wait_ready(host, port, timeout=30.0):
+    """รอจนกว่า GET /health ตอบ 200 (ใช้กับ --spawn)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            try:
+                status, _ = await _request(reader, writer, host, "GET", "/health")
+            finally:
+                writer.close()
+            if status == 200:
+                return
+        except OSError:
+            pass
+        if time.monotonic() > deadline:
+            raise SystemExit(f"service on {host}:{port} did not become ready")
+        await asyncio.sleep(0.1)
+
+
+async def run_load(host, port, n_requests, concurrency, slabs_per_request=1, drawing=None, seed=0):
+    """
+    ยิง n_requests คำขอผ่าน concurrency การเชื่อมต่อ (แต่ละการเชื่อมต่อส่งทีละคำขอ)
+    คืน dict: จำนวน, error, เวลา, req/s, slabs/s และ Latency Percentile (ms)
+    """
+    schedule = synthetic_schedule(max(256, slabs_per_request), seed)
+    bodies = []
+    for i in range(min(n_requests, 256)):
+        slabs = [schedule[(i + k) % len(schedule)] for k in range(slabs_per_request)]
+        payload = {'slabs': slabs} if slabs_per_request > 1 else dict(slabs[0])
+        if drawing:
+            payload['drawing'] = drawing
+        bodies.append(json.dumps(payload).encode())
+
+    latencies = []
+    errors = 0
+    counter = iter(range(n_requests))
+
+    async def worker():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for i in counter:
+                t = time.perf_counter()
+                status, _ = await _request(reader, writer, host, "POST", "/design", bodies[i % len(bodies)])
+                latencies.append(time.perf_counter() - t)
+                errors += status != 200
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, health = await _request(reader, writer, host, "GET", "/health")
+    finally:
+        writer.close()
+
+    result = {k: v * 1e3 for k, v in _percentiles(latencies).items()}  # ms
+    result.update(requests=len(latencies), errors=errors, concurrency=concurrency,
+                  slabs_per_request=slabs_per_request, drawing=drawing, elapsed_s=elapsed,
+                  requests_per_s=len(latencies) / elapsed, slabs_per_s=len(latencies) * slabs_per_request / elapsed,
+                  server=json.loads(health))
+    return result
+
+
+# ==========================================
+# 2. CLI
+# ==========================================
+def _print_result(r):
+    s = r['server']
+    print(f"window {s['window_ms']:g} ms | {r['requests']} req ({r['errors']} errors) x {r['slabs_per_request']} slab, "
+          f"c={r['concurrency']} | {r['requests_per_s']:,.0f} req/s, {r['slabs_per_s']:,.0f} slabs/s | "
+          f"p50 {r['p50']:.2f} / p95 {r['p95']:.2f} / p99 {r['p99']:.2f} / max {r['max']:.2f} ms | "
+          f"mean batch {s['mean_batch']:.1f}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test for slab_service on localhost.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    parser.add_argument("-c", "--concurrency", type=int, default=64, help="concurrent keep-alive connections")
+    parser.add_argument("--slabs-per-request", type=int, default=1)
+    parser.add_argument("--drawing", choices=("svg", "png"), default=None, help="also request a section drawing")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true", help="start slab_service.py for each --window-ms value")
+    parser.add_argument("--window-ms", type=float, nargs="+", default=[2.0], help="batching window(s) for --spawn")
+    parser.add_argument("--render-workers", type=int, default=1, help="render pool size for --spawn")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    for window in (args.window_ms if args.spawn else [None]):
+        proc = None
+        if args.spawn:
+            service = os.path.join(os.path.dirname(os.path.abspath(__file__)), "slab_service.py")
+            proc = subprocess.Popen([sys.executable, service, "--host", args.host, "--port", str(args.port),
+                                     "--window-ms", str(window), "--render-workers", str(args.render_workers)])
+        try:
+            asyncio.run(_wait_ready(args.host, args.port, timeout=30.0 if proc else 2.0))
+            r = asyncio.run(run_load(args.host, args.port, args.requests, args.concurrency,
+                                     args.slabs_per_request, args.drawing, args.seed))
+        finally:
+            if proc:
+                proc.terminate()
+                proc.wait()
+        _print_result(r)
+        results.append(r)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if any(r['errors'] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+RC One-Way Slab Design - Stage Metrics
+
+ตัวจับเวลา/ตัวนับรอบแต่ละขั้นของ Pipeline (swap, calc, plot, encode, report ...)
+
+    metrics = Metrics()
+    with metrics.stage("calc"):
+        ...
+    metrics.incr("slabs")
+    metrics.write_prometheus("slab.prom")   # Prometheus textfile collector
+    metrics.write_jsonl("slab_metrics.jsonl")
+
+NULL_METRICS ใช้แทนเมื่อปิดการวัด (stage() คืน Context Manager ตัวเดียวกันทุกครั้ง แทบไม่มี Overhead)
+profile_dir: ห่อขั้นที่ระบุ (หรือทุกขั้น) ด้วย cProfile แล้วเขียนไฟล์ .prof
+(ขั้นที่ซ้อนอยู่ในขั้นที่กำลัง Profile จะรวมอยู่ในไฟล์ของขั้นนอก)
+"""
+import cProfile
+import json
+import os
+import threading
+import time
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class NullMetrics:
+    """Metrics ที่ไม่ทำอะไร (ค่าเริ่มต้นเมื่อปิดการวัด)"""
+    enabled = False
+
+    def stage(self, name):
+        return _NULL_STAGE
+
+    def incr(self, name, value=1):
+        pass
+
+    def merge(self, snapshot):
+        pass
+
+    def snapshot(self):
+        return {'stages': {}, 'counters': {}}
+
+
+NULL_METRICS = NullMetrics()
+
+
+class _Stage:
+    __slots__ = ('_metrics', '_name', '_start', '_profiler')
+
+    def __init__(self, metrics, name):
+        self._metrics = metrics
+        self._name = name
+        self._profiler = None
+
+    def __enter__(self):
+        local = self._metrics._local
+        if self._metrics._should_profile(self._name) and not getattr(local, 'profiling', False):
+            local.profiling = True
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._start
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._metrics._local.profiling = False
+            self._metrics._dump_profile(self._name, self._profiler)
+        self._metrics._record(self._name, elapsed)
+        return False
+
+
+class Metrics:
+    """
+    ตัววัดเวลาแบบสะสมต่อขั้น (count, sum, min, max, last) + ตัวนับ
+
+    events: เก็บเหตุการณ์ทีละครั้งไว้สำหรับ JSON lines (ปิดได้เมื่อรันนานมาก)
+    profile_dir: โฟลเดอร์สำหรับไฟล์ cProfile (None = ไม่ Profile)
+    profile_stages: ชื่อขั้นที่ต้อง Profile (None = ทุกขั้น)
+    """
+    enabled = True
+
+    def __init__(self, events=True, profile_dir=None, profile_stages=None):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stages = {}
+        self._counters = {}
+        self._events = [] if events else None
+        self.profile_dir = profile_dir
+        self.profile_stages = set(profile_stages) if profile_stages else None
+        self._profile_seq = 0
+
+    # --- recording ---
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def _record(self, name, elapsed):
+        with self._lock:
+            s = self._stages.get(name)
+            if s is None:
+                self._stages[name] = {'count': 1, 'sum': elapsed, 'min': elapsed, 'max': elapsed, 'last': elapsed}
+            else:
+                s['count'] += 1
+                s['sum'] += elapsed
+                s['min'] = min(s['min'], elapsed)
+                s['max'] = max(s['max'], elapsed)
+                s['last'] = elapsed
+            if self._events is not None:
+                self._events.append({'ts': time.time(), 'stage': name, 'seconds': elapsed})
+
+    def merge(self, snapshot):
+        """รวมผลจาก Metrics อื่น (เช่นจาก Worker Process) เข้ามา"""
+        with self._lock:
+            for name, o in snapshot.get('stages', {}).items():
+                s = self._stages.get(name)
+                if s is None:
+                    self._stages[name] = dict(o)
+                else:
+                    s['count'] += o['count']
+                    s['sum'] += o['sum']
+                    s['min'] = min(s['min'], o['min'])
+                    s['max'] = max(s['max'], o['max'])
+                    s['last'] = o['last']
+            for name, v in snapshot.get('counters', {}).items():
+                self._counters[name] = self._counters.get(name, 0) + v
+            if self._events is not None:
+                self._events.extend(snapshot.get('events', ()))
+
+    # --- profiling ---
+    def _should_profile(self, name):
+        return self.profile_dir is not None and (self.profile_stages is None or name in self.profile_stages)
+
+    def _dump_profile(self, name, profiler):
+        with self._lock:
+            self._profile_seq += 1
+            seq = self._profile_seq
+        os.makedirs(self.profile_dir, exist_ok=True)
+        profiler.dump_stats(os.path.join(self.profile_dir, f"{name}-{os.getpid()}-{seq:05d}.prof"))
+
+    # --- export ---
+    def snapshot(self, events=False):
+        with self._lock:
+            out = {'stages': {k: dict(v) for k, v in self._stages.items()}, 'counters': dict(self._counters)}
+            if events and self._events is not None:
+                out['events'] = list(self._events)
+        return out
+
+    def summary_rows(self):
+        """แถวสรุปต่อขั้น (ms) สำหรับแสดงผลบนหน้าจอ"""
+        snap = self.snapshot()
+        total = sum(s['sum'] for s in snap['stages'].values()) or 1.0
+        return [{'stage': name, 'count': s['count'], 'total_ms': s['sum'] * 1e3,
+                 'mean_ms': s['sum'] / s['count'] * 1e3, 'max_ms': s['max'] * 1e3, 'share': s['sum'] / total}
+                for name, s in snap['stages'].items()]
+
+    def to_prometheus(self, prefix="slab"):
+        """ข้อความรูปแบบ Prometheus exposition (ใช้กับ node_exporter textfile collector)"""
+        snap = self.snapshot()
+        lines = [f"# HELP {prefix}_stage_seconds Time spent per pipeline stage.",
+                 f"# TYPE {prefix}_stage_seconds summary"]
+        for name, s in sorted(snap['stages'].items()):
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {s["sum"]:.9f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {s["count"]}')
+        lines.append(f"# HELP {prefix}_stage_seconds_max Slowest single run per stage.")
+        lines.append(f"# TYPE {prefix}_stage_seconds_max gauge")
+        for name, s in sorted(snap['stages'].items()):
+            lines.append(f'{prefix}_stage_seconds_max{{stage="{name}"}} {s["max"]:.9f}')
+        for name, v in sorted(snap['counters'].items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {v}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path, prefix="slab"):
+        """เขียนแบบ Atomic (ไฟล์ชั่วคราว + replace) เพื่อไม่ให้ Collector อ่านไฟล์ครึ่งๆ"""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus(prefix))
+        os.replace(tmp, path)
+
+    def write_jsonl(self, path):
+        """ต่อท้ายไฟล์ JSON lines: หนึ่งบรรทัดต่อเหตุการณ์ และบรรทัดสรุปปิดท้าย"""
+        snap = self.snapshot(events=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for ev in snap.pop('events', ()):
+                f.write(json.dumps(ev) + "\n")
+            f.write(json.dumps({'ts': time.time(), 'summary': snap}) + "\n")
+
+    def write(self, path):
+        """เลือกรูปแบบตามนามสกุล: .prom = Prometheus, อื่นๆ = JSON lines"""
+        if path.endswith(".prom"):
+            self.write_prometheus(path)
+        else:
+            self.write_jsonl(path)
@@ -0,0 +1,152 @@
+"""
+RC One-Way Slab Design - Optimizer
+
+ค้นหาความหนา h และขนาดเหล็ก (Main / Temp) ที่ราคาต่ำสุด
+โดยผ่านทั้ง Flexure, Shear และ Deflection (h_min หรือระยะแอ่นที่คำนวณ)
+
+ตัดตัวเลือกที่เป็นไปไม่ได้ด้วยสูตรก่อน (ไม่ Brute-force ทั้ง Grid):
+- 1 - 2Rn/(0.85fc) < 0 แม้ใช้เหล็กเส้นเล็กสุด (d มากสุด) -> หน้าตัดเล็กเกินไป
+- φVc < Vu แม้ใช้ d มากสุด -> ไม่ผ่านแรงเฉือน
+- As ที่ต้องการ (d มากสุด) เกิน As ของเหล็กใหญ่สุดที่ระยะ MIN_SPACING -> วางเหล็กไม่ได้
+ตัวเลือกเหล็กต้องมีระยะห่างอยู่ในช่วง MIN_SPACING ถึง max_spacing (เหมือนตารางของ slab_rebar)
+ส่วนที่เหลือ Main กับ Temp แยกกันอิสระ (d ขึ้นกับ Main เท่านั้น)
+จึงเลือกเหล็กแต่ละทิศแยกกันใน Batch Call เดียว
+แล้วเลือกด้วย argmin บนตารางราคา [แผ่น, h, เหล็ก] (ไม่มี Loop ต่อแผ่นนอกจากสร้าง dict ผลลัพธ์)
+"""
+import numpy as np
+
+from slab_core import BAR_INFO, Status, moment_coef
+from slab_batch import BATCH_FIELDS, process_slab_batch
+from slab_rebar import MIN_SPACING, max_spacing
+
+STEEL_DENSITY = 7850.0  # kg/m³
+CONCRETE_COST = 2500.0  # บาท/m³
+STEEL_COST = 28.0  # บาท/kg
+H_CANDIDATES = tuple(np.arange(8.0, 40.5, 0.5))
+BLOCK_SLABS = 2048  # จำนวนแผ่นต่อรอบ (ตารางราคา แผ่น × h × เหล็ก ใช้หน่วยความจำตามนี้)
+
+
+def _override(schedule, key):
+    """คอลัมน์ Mu / Vu จากการวิเคราะห์ภายนอก (NaN = ใช้สูตร) หรือ None ถ้าไม่มีแผ่นใดระบุ"""
+    if not any(inp.get(key) is not None for inp in schedule):
+        return None
+    return np.array([np.nan if inp.get(key) is None else float(inp[key]) for inp in schedule])
+
+
+def _pruned_thickness(columns, h, d_bar_min, As_max):
+    """
+    คืน mask [แผ่น, h] ของ h ที่ยังมีโอกาสผ่าน (เช็ค term ≥ 0, As และ Shear ด้วย d มากสุด)
+    As_max: As ต่อเมตรของเหล็กใหญ่สุดที่ MIN_SPACING (As ที่ต้องการลดลงเมื่อ d เพิ่ม d มากสุดจึงให้ค่าต่ำสุด)
+    h < h_min ไม่ถูกตัด เพราะอาจผ่านด้วยระยะแอ่นที่คำนวณ (ขึ้นกับเหล็กที่เลือก) ซึ่งตรวจใน Batch
+    Mu / Vu จากการวิเคราะห์ภายนอกใช้แทนสูตรเหมือน process_slab_batch
+    """
+    col = {k: np.asarray(columns[k], dtype=float)[:, None] for k in ('Lx', 'fc', 'fy', 'sdl', 'll', 'cover')}
+    Lx, fc = col['Lx'], col['fc']
+    support = np.asarray(columns['support'], dtype=str)[:, None]
+    coef = np.vectorize(moment_coef, otypes=[float])(support)
+
+    wu = 1.2 * (2400 * (h / 100) + col['sdl']) + 1.6 * col['ll']
+    d_max = h - col['cover'] - (d_bar_min / 10) / 2
+    Mu = (wu * Lx ** 2) / coef
+    Vu = np.where(support == "Cantilever", wu * Lx, (wu * Lx) / 2)
+    if columns.get('Mu') is not None:
+        Mu = np.where(np.isnan(columns['Mu'])[:, None], Mu, columns['Mu'][:, None])
+    if columns.get('Vu') is not None:
+        Vu = np.where(np.isnan(columns['Vu'])[:, None], Vu, columns['Vu'][:, None])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Rn = Mu * 100 / (0.90 * 100 * d_max ** 2)
+        term = 1 - (2 * Rn) / (0.85 * fc)
+        As_req = np.maximum((0.85 * fc / col['fy']) * (1 - np.sqrt(term)) * 100 * d_max, 0.0018 * 100 * h)
+    phi_Vc = 0.85 * 0.53 * np.sqrt(fc) * 100 * d_max
+    return (d_max > 0) & (term >= 0) & (As_req <= As_max) & (phi_Vc >= Vu)
+
+
+def _optimize_block(schedule, h_all, bars, concrete_cost, steel_cost):
+    """optimize_schedule ของแผ่นหนึ่งกลุ่ม: ตารางราคา [แผ่น, h, เหล็ก] แล้ว argmin ทีละแกน"""
+    n, n_h, n_b = len(schedule), h_all.size, len(bars)
+    columns = {k: np.array([inp[k] for inp in schedule], dtype=object)
+               for k in BATCH_FIELDS if k not in ('h', 'mainBar', 'tempBar')}
+    columns['Mu'], columns['Vu'] = _override(schedule, 'Mu'), _override(schedule, 'Vu')
+
+    # 1. Analytical pruning (Vectorized ทั้งกลุ่ม)
+    d_bar_min = min(BAR_INFO[k]['d_mm'] for k in bars)
+    As_max = max(BAR_INFO[k]['A_cm2'] for k in bars) * 100 / MIN_SPACING
+    alive = _pruned_thickness(columns, h_all, d_bar_min, As_max)  # [n, n_h]
+
+    # 2. ตัวเลือก (แผ่น, h, bar) ที่เหลือ คำนวณใน Batch Call เดียว
+    slab_i, h_i = np.nonzero(alive)
+    slab_idx = np.repeat(slab_i, n_b)
+    h_idx = np.repeat(h_i, n_b)
+    bar_idx = np.tile(np.arange(n_b), slab_i.size)
+    main_cost = np.full((n, n_h, n_b), np.inf)
+    temp_cost = np.full((n, n_h, n_b), np.inf)
+    grid = {k: np.full((n, n_h, n_b), np.nan) for k in ('s_main', 's_temp', 'As_prov_main', 'As_prov_temp')}
+    if slab_idx.size:
+        bar_names = np.asarray(bars, dtype=str)
+        batch = {k: v[slab_idx] for k, v in columns.items() if v is not None}
+        batch.update(h=h_all[h_idx], mainBar=bar_names[bar_idx], tempBar=bar_names[bar_idx])
+        res = process_slab_batch(batch)
+        s_max = np.array([max_spacing(h) for h in h_all])[h_idx]
+        s_t_max = np.array([max_spacing(h, temp=True) for h in h_all])[h_idx]
+        main_ok = ((res['status_flex'] == Status.OK) & (res['status_shear'] == Status.PASS)
+                   & (res['status_defl'] == Status.PASS)
+                   & (res['s_main'] >= MIN_SPACING) & (res['s_main'] <= s_max))
+        temp_ok = (res['s_temp'] >= MIN_SPACING) & (res['s_temp'] <= s_t_max)
+        kg_per_m2 = STEEL_DENSITY * 1e-4 * steel_cost  # As (cm²/m) -> บาท/m²
+        main_cost[slab_idx, h_idx, bar_idx] = np.where(main_ok, res['As_prov_main'] * kg_per_m2, np.inf)
+        temp_cost[slab_idx, h_idx, bar_idx] = np.where(temp_ok, res['As_prov_temp'] * kg_per_m2, np.inf)
+        for k, v in grid.items():
+            v[slab_idx, h_idx, bar_idx] = res[k]
+
+    # 3. เหล็กที่ถูกสุดต่อ (แผ่น, h) แล้ว h ที่ราคารวมต่ำสุด (argmin คืนตัวแรก: เหล็ก/h ที่มาก่อนเมื่อราคาเท่ากัน)
+    m = np.argmin(main_cost, axis=2)
+    t = np.argmin(temp_cost, axis=2)
+    main_min = np.take_along_axis(main_cost, m[..., None], axis=2)[..., 0]
+    temp_min = np.take_along_axis(temp_cost, t[..., None], axis=2)[..., 0]
+    cost_m2 = h_all / 100 * concrete_cost + main_min + temp_min  # [n, n_h] (inf = ไม่มีเหล็กที่ผ่าน)
+    best = np.argmin(cost_m2, axis=1)
+    rows = np.arange(n)
+    ok = np.isfinite(cost_m2[rows, best])
+    candidates = alive.sum(axis=1)
+
+    results = []
+    for i, inp in enumerate(schedule):
+        if not ok[i]:
+            results.append(None)
+            continue
+        j = best[i]
+        h, mb, tb = h_all[j], m[i, j], t[i, j]
+        As_main, As_temp = grid['As_prov_main'][i, j, mb], grid['As_prov_temp'][i, j, tb]
+        area = float(inp['Lx']) * float(inp['Ly'])
+        results.append({
+            'h': float(h), 'mainBar': str(bars[mb]), 'tempBar': str(bars[tb]),
+            's_main': float(grid['s_main'][i, j, mb]), 's_temp': float(grid['s_temp'][i, j, tb]),
+            'As_prov_main': float(As_main), 'As_prov_temp': float(As_temp),
+            'concrete_m3': float(h / 100 * area),
+            'steel_kg': float((As_main + As_temp) * STEEL_DENSITY * 1e-4 * area),
+            'cost': float(cost_m2[i, j] * area),
+            'candidates': int(candidates[i]), 'pruned': int(n_h - candidates[i]),
+        })
+    return results
+
+
+def optimize_schedule(schedule, h_candidates=H_CANDIDATES, bars=None,
+                      concrete_cost=CONCRETE_COST, steel_cost=STEEL_COST):
+    """
+    หาแบบที่ราคาต่ำสุดของพื้นทุกแผ่นใน schedule (list ของ inputs dict)
+
+    ราคา = concrete_cost·ปริมาตรคอนกรีต + steel_cost·น้ำหนักเหล็ก (Main + Temp) ต่อแผ่น
+    inputs ที่มี Mu / Vu (slab_strip) ใช้ค่านั้นทั้งใน Pruning และ Batch
+    คืน list ของ dict (หรือ None ถ้าไม่มี h ใดผ่าน) เรียงตาม schedule
+    """
+    bars = list(bars or BAR_INFO.keys())
+    h_all = np.asarray(h_candidates, dtype=float)
+    results = []
+    for start in range(0, len(schedule), BLOCK_SLABS):
+        results += _optimize_block(schedule[start:start + BLOCK_SLABS], h_all, bars, concrete_cost, steel_cost)
+    return results
+
+
+def optimize_slab(inputs, **kwargs):
+    """หาแบบราคาต่ำสุดของพื้นแผ่นเดียว (ดู optimize_schedule)"""
+    return optimize_schedule([inputs], **kwargs)[0]
@@ -0,0 +1,248 @@
+"""
+RC One-Way Slab Design - PDF Export (fpdf)
+
+เขียนรายงาน PDF โดยตรงจาก rows ของ process_slab_calculation (ไม่ต้องใช้ Browser)
+ตาราง, รูปหน้าตัด และช่องลงนาม อยู่ในหน้า A4 หนึ่งหน้าต่อแผ่นพื้น
+
+shared_resources=True: ทุกแผ่นอยู่ในเอกสารเดียว Font ถูกฝังครั้งเดียว
+และรูปที่เหมือนกันทุกไบต์ใช้ Image Object เดียวกัน (fpdf แคชรูปตามชื่อไฟล์)
+"""
+import base64
+import hashlib
+import io
+import os
+import shutil
+import struct
+import tempfile
+
+from fpdf import FPDF
+
+from slab_report import row_cells
+
+PAGE_W = 190.0  # mm (A4 - ขอบ 10 mm)
+COL_WIDTHS = tuple(PAGE_W * p for p in (0.25, 0.20, 0.25, 0.15, 0.08, 0.07))
+COL_HEADERS = ("Item", "Formula", "Substitution", "Result", "Unit", "Status")
+ROW_H = 5.0
+
+STATUS_COLORS = {
+    "pass-ok": (0, 128, 0),
+    "pass-no": (255, 0, 0),
+    "pass-warn": (255, 165, 0),
+    "": (0, 0, 0),
+}
+LOAD_COLOR = (211, 47, 47)
+
+# ตัวอักษรที่ไม่มีใน Core Font (latin-1) เมื่อไม่ได้ระบุไฟล์ TTF
+_LATIN1_SUBS = {"φ": "phi", "ρ": "rho", "≥": ">=", "≤": "<=", "–": "-", "—": "-", "Δ": "delta", "λ": "lambda", "⁴": "4"}
+
+
+def _raw_bytes(img):
+    """ไบต์ของรูปจาก data URI / bytes / path"""
+    if isinstance(img, str) and img.startswith("data:image/png;base64,"):
+        return base64.b64decode(img.split(",", 1)[1])
+    elif isinstance(img, (bytes, bytearray)):
+        return bytes(img)
+    with open(img, "rb") as f:
+        return f.read()
+
+
+def _png_rgb(data):
+    """
+    แปลง PNG เป็นแบบ RGB (fpdf ไม่รองรับ Alpha) คืน (bytes, สูง/กว้าง)
+    PNG ที่ fpdf ใช้ได้อยู่แล้ว (Gray/RGB 8 bit ไม่ Interlace เช่นจาก slab_render) คืนตามเดิมโดยไม่ Decode
+    """
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and data[12:16] == b"IHDR":
+        width, height, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", data[16:29])
+        if depth == 8 and color in (0, 2) and interlace == 0:
+            return data, height / width
+    from PIL import Image
+    with Image.open(io.BytesIO(data)) as im:
+        aspect = im.height / im.width
+        bg = Image.new("RGB", im.size, "white")
+        bg.paste(im, mask=im.convert("RGBA").split()[3])
+        out = io.BytesIO()
+        bg.save(out, format="PNG")
+        return out.getvalue(), aspect
+
+
+class SlabPDFWriter:
+    """
+    ตัวเขียน PDF หนึ่งเอกสาร (หนึ่งหน้าต่อแผ่นพื้น)
+
+    font_path / font_bold_path: ไฟล์ TTF (เช่น Sarabun) สำหรับภาษาไทย ฝังครั้งเดียวต่อเอกสาร
+    ถ้าไม่ระบุใช้ Helvetica และแทนอักขระที่ไม่มีใน latin-1
+    """
+
+    def __init__(self, font_path=None, font_bold_path=None):
+        self.pdf = FPDF(orientation="P", unit="mm", format="A4")
+        self.pdf.set_auto_page_break(True, margin=15)
+        self.pdf.set_margins(10, 10, 10)
+        self._tmpdir = tempfile.mkdtemp(prefix="slabpdf_")
+        self._images = {}
+
+        if font_path:
+            self.family = "Sarabun"
+            self.pdf.add_font(self.family, "", font_path, uni=True)
+            self.pdf.add_font(self.family, "B", font_bold_path or font_path, uni=True)
+            self._unicode = True
+        else:
+            self.family = "Helvetica"
+            self._unicode = False
+
+    # --- helpers ---
+    def _txt(self, text):
+        text = str(text)
+        if self._unicode:
+            return text
+        for k, v in _LATIN1_SUBS.items():
+            text = text.replace(k, v)
+        return text.encode("latin-1", "replace").decode("latin-1")
+
+    def _font(self, size, bold=False):
+        self.pdf.set_font(self.family, "B" if bold else "", size)
+
+    def _fit_cell(self, w, text, size=8, bold=False, align="L", fill=False):
+        """cell ที่ลดขนาดตัวอักษรจนข้อความพอดีช่อง"""
+        text = self._txt(text)
+        self._font(size, bold)
+        while size > 5 and self.pdf.get_string_width(text) > w - 2:
+            size -= 0.5
+            self._font(size, bold)
+        self.pdf.cell(w, ROW_H, text, border=1, align=align, fill=fill)
+
+    def _image_file(self, img):
+        """เขียนรูปเป็นไฟล์ตาม Hash ของเนื้อหา รูปซ้ำจึงได้ชื่อไฟล์ (และ Image Object) เดียวกัน"""
+        raw = _raw_bytes(img)
+        key = hashlib.sha1(raw).hexdigest()
+        if key not in self._images:
+            data, aspect = _png_rgb(raw)
+            path = os.path.join(self._tmpdir, f"{key}.png")
+            with open(path, "wb") as f:
+                f.write(data)
+            self._images[key] = (path, aspect)
+        return self._images[key]
+
+    # --- page ---
+    def add_sheet(self, inputs, rows, img=None):
+        """
+        เพิ่มหน้ารายงานของพื้นหนึ่งแผ่น
+        rows: list ของ CalcRow หรือ rows ข้อความแบบเดิม
+        img: PNG data URI / bytes / path หรือ None
+        """
+        pdf = self.pdf
+        pdf.add_page()
+        pdf.set_text_color(0, 0, 0)
+
+        # Header
+        self._font(11, bold=True)
+        id_w = max(25.0, pdf.get_string_width(self._txt(inputs['slab_id'])) + 8)
+        pdf.set_xy(10 + PAGE_W - id_w, 10)
+        pdf.cell(id_w, 9, self._txt(inputs['slab_id']), border=1, align="C")
+        pdf.set_xy(10, 10)
+        self._font(16, bold=True)
+        pdf.cell(PAGE_W, 9, "ENGINEERING DESIGN REPORT", align="C", ln=1)
+        self._font(11, bold=True)
+        pdf.cell(PAGE_W, 6, "RC One-Way Slab Design (ACI 318/EIT)", align="C", ln=1)
+        pdf.line(10, pdf.get_y() + 2, 10 + PAGE_W, pdf.get_y() + 2)
+        pdf.ln(5)
+
+        # Info
+        self._font(9)
+        left = [f"Project: {inputs['project']}", f"Engineer: {inputs['engineer']}", "Date: 16/12/2568"]
+        right = [f"Panel Size: {inputs['Lx']} x {inputs['Ly']} m ({inputs['support']})",
+                 f"Thickness: {inputs['h']} cm (Cover {inputs['cover']} cm)",
+                 f"Materials: fc'={inputs['fc']}, fy={inputs['fy']} ksc"]
+        for a, b in zip(left, right):
+            pdf.cell(PAGE_W / 2, 5, self._txt(a))
+            pdf.cell(PAGE_W / 2, 5, self._txt(b), ln=1)
+        pdf.ln(3)
+
+        # Drawing
+        if img is not None:
+            img_w = PAGE_W * 0.6
+            img_path, aspect = self._image_file(img)
+            y = pdf.get_y()
+            pdf.image(img_path, x=10 + (PAGE_W - img_w) / 2, y=y, w=img_w)
+            pdf.set_y(y + img_w * aspect)
+            pdf.ln(2)
+
+        # Table
+        pdf.set_fill_color(238, 238, 238)
+        for w, head in zip(COL_WIDTHS, COL_HEADERS):
+            self._fit_cell(w, head, bold=True, align="C", fill=True)
+        pdf.ln(ROW_H)
+
+        for r in rows:
+            cells, cls, highlight = row_cells(r)
+            if cells[0] == "SECTION":
+                pdf.set_fill_color(221, 221, 221)
+                self._fit_cell(PAGE_W, cells[1], size=9, bold=True, fill=True)
+                pdf.ln(ROW_H)
+                continue
+            for i, (w, val) in enumerate(zip(COL_WIDTHS, cells[:6])):
+                bold = False
+                if i == 3 and highlight:
+                    pdf.set_text_color(*LOAD_COLOR)
+                    bold = True
+                elif i == 5:
+                    pdf.set_text_color(*STATUS_COLORS[cls])
+                    bold = bool(cls)
+                self._fit_cell(w, val, bold=bold)
+                pdf.set_text_color(0, 0, 0)
+            pdf.ln(ROW_H)
+
+        # Signature
+        if pdf.get_y() > 297 - 15 - 35:
+            pdf.add_page()
+        pdf.ln(10)
+        self._font(9, bold=True)
+        pdf.cell(60, 5, "Designed by:", ln=1)
+        y = pdf.get_y() + 12
+        pdf.line(10, y, 70, y)
+        pdf.set_y(y + 2)
+        self._font(9)
+        pdf.cell(60, 5, self._txt(f"({inputs['engineer']})"), align="C", ln=1)
+        pdf.cell(60, 5, "Civil Engineer", align="C", ln=1)
+
+    def output(self, path):
+        try:
+            self.pdf.output(path, "F")
+        finally:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+
+def write_pdf(path, inputs, rows, img=None, **font_kwargs):
+    """เขียน PDF ของพื้นหนึ่งแผ่น"""
+    writer = SlabPDFWriter(**font_kwargs)
+    writer.add_sheet(inputs, rows, img)
+    writer.output(path)
+    return path
+
+
+def write_pdf_batch(slabs, path=None, directory=None, shared_resources=True, **font_kwargs):
+    """
+    เขียน PDF หลายแผ่น
+    slabs: iterable ของ (inputs, rows, img)
+    shared_resources=True -> เอกสารเดียวที่ path (Font/รูปซ้ำฝังครั้งเดียว)
+    shared_resources=False -> หนึ่งไฟล์ต่อแผ่นใน directory
+    คืน list ของ path ที่เขียน
+    """
+    if shared_resources:
+        if not path:
+            raise ValueError("path is required when shared_resources=True")
+        writer = SlabPDFWriter(**font_kwargs)
+        for inputs, rows, img in slabs:
+            writer.add_sheet(inputs, rows, img)
+        writer.output(path)
+        return [path]
+
+    if not directory:
+        raise ValueError("directory is required when shared_resources=False")
+    os.makedirs(directory, exist_ok=True)
+    from slab_report import ReportNames
+    names = ReportNames(".pdf")
+    out = []
+    for inputs, rows, img in slabs:
+        name = names(inputs['slab_id'])
+        out.append(write_pdf(os.path.join(directory, name), inputs, rows, img, **font_kwargs))
+    return out
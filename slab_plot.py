@@ -0,0 +1,181 @@
+"""
+RC One-Way Slab Design - Section Drawing (matplotlib)
+
+matplotlib ถูก import แบบ Lazy เมื่อมีการขอรูปครั้งแรกเท่านั้น
+เพื่อให้ Worker ที่ไม่วาดรูปเริ่มทำงานได้เร็ว
+"""
+import io
+import base64
+
+_plt = None
+_patches = None
+
+
+def _load_matplotlib():
+    """Import matplotlib (Agg backend) ครั้งแรกที่ถูกเรียก แล้วเก็บไว้ใช้ซ้ำ"""
+    global _plt, _patches
+    if _plt is None:
+        import matplotlib
+        # Set backend to Agg to prevent thread issues in Streamlit
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        import matplotlib.patches as patches
+        _plt, _patches = plt, patches
+    return _plt, _patches
+
+
+def fig_to_base64(fig):
+    plt, _ = _load_matplotlib()
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    buf.seek(0)
+    plt.close(fig)  # Memory cleanup
+    return f"data:image/png;base64,{base64.b64encode(buf.read()).decode()}"
+
+
+# ==========================================
+# 1. PLOTTING FUNCTION (UPDATED WITH DIMENSIONS)
+# ==========================================
+def plot_slab_section(h_cm, cover_cm, main_key, s_main, temp_key, s_temp, support_type, Lx_real):
+    """
+    Lx_real: ความยาวจริง (m) เพื่อนำมาแสดงใน Text
+    """
+    plt, patches = _load_matplotlib()
+    fig, ax = plt.subplots(figsize=(10, 5))
+    draw_section(ax, patches, h_cm, cover_cm, main_key, s_main, temp_key, s_temp, support_type, Lx_real)
+    plt.tight_layout()
+    return fig
+
+
+def draw_section(ax, patches, h_cm, cover_cm, main_key, s_main, temp_key, s_temp, support_type, Lx_real):
+    """
+    วาดหน้าตัดลงบน ax ที่มีอยู่แล้ว (ใช้ร่วมกับ slab_render ซึ่งสร้างรูปครั้งเดียวแล้วแก้เฉพาะข้อความ)
+    คืน dict ของ Text ที่เปลี่ยนตามพารามิเตอร์: 'L', 't', 'main', 'temp' (Cantilever ไม่มี 'temp')
+    """
+    texts = {}
+
+    # Helper to draw dimension line
+    def draw_dim(ax, x1, y1, x2, y2, text, offset_y=0, offset_x=0):
+        """วาดเส้นบอกระยะพร้อมลูกศรและตัวหนังสือ"""
+        d_x1, d_y1 = x1 + offset_x, y1 + offset_y
+        d_x2, d_y2 = x2 + offset_x, y2 + offset_y
+
+        # 1. เส้น Arrow
+        ax.annotate("", xy=(d_x1, d_y1), xytext=(d_x2, d_y2),
+                    arrowprops=dict(arrowstyle='<|-|>', lw=1.0, color='black'))
+
+        # 2. Extension lines
+        ax.plot([x1, d_x1], [y1, d_y1], color='black', lw=0.5, linestyle='--')
+        ax.plot([x2, d_x2], [y2, d_y2], color='black', lw=0.5, linestyle='--')
+
+        # 3. Text
+        mid_x = (d_x1 + d_x2) / 2
+        mid_y = (d_y1 + d_y2) / 2
+
+        if abs(y2 - y1) < abs(x2 - x1):  # Horizontal
+            return ax.text(mid_x, mid_y + 0.05, text, ha='center', va='bottom', fontsize=11, fontweight='bold',
+                           color='black', backgroundcolor='white')
+        else:  # Vertical
+            return ax.text(mid_x - 0.05, mid_y, text, ha='right', va='center', fontsize=11, fontweight='bold',
+                           color='black', backgroundcolor='white')
+
+    # Parameters for Visual
+    slab_h_draw = 0.4  # Visual height
+    beam_w = 0.4  # Visual beam width
+    beam_d = 0.8  # Visual beam depth
+    cover_visual = 0.05
+
+    concrete_color = '#f0f0f0'
+    concrete_edge = 'black'
+    hatch_style = '///'
+
+    if support_type == "Cantilever":
+        # --- CANTILEVER ---
+        slab_len_draw = 3.0
+
+        # Beam (Left)
+        beam = patches.Rectangle((-beam_w, -beam_d), beam_w, beam_d,
+                                 facecolor='white', edgecolor=concrete_edge, hatch=hatch_style)
+        ax.add_patch(beam)
+
+        # Slab
+        slab = patches.Rectangle((0, -slab_h_draw), slab_len_draw, slab_h_draw,
+                                 facecolor=concrete_color, edgecolor=concrete_edge)
+        ax.add_patch(slab)
+
+        # Rebar
+        bar_y = -cover_visual
+        x_pts = [-beam_w / 2, slab_len_draw - cover_visual]
+        y_pts = [bar_y, bar_y]
+        x_hook = [x_pts[-1], x_pts[-1]]
+        y_hook = [bar_y, bar_y - 0.2]
+
+        ax.plot(x_pts, y_pts, color='blue', lw=3)
+        ax.plot(x_hook, y_hook, color='blue', lw=3)
+
+        # Temp Bar
+        dist_y = bar_y - 0.05
+        spacing_draw = 0.3
+        n_bars = int(slab_len_draw / spacing_draw)
+        for i in range(n_bars):
+            cx = (i * spacing_draw) + 0.2
+            if cx < slab_len_draw:
+                ax.add_patch(patches.Circle((cx, dist_y), 0.03, color='red'))
+
+        # Dimensions
+        texts['L'] = draw_dim(ax, 0, -slab_h_draw, slab_len_draw, -slab_h_draw, f"L = {Lx_real:.2f} m",
+                              offset_y=-0.3)
+        texts['t'] = draw_dim(ax, slab_len_draw, 0, slab_len_draw, -slab_h_draw, f"t = {h_cm:.0f} cm", offset_x=0.3)
+
+        # Labels
+        ax.text(-beam_w / 2, -beam_d - 0.2, "Support", ha='center', fontsize=10)
+        texts['main'] = ax.annotate(f"{main_key}@{s_main:.0f}cm (Top)", xy=(slab_len_draw / 2, bar_y), xytext=(slab_len_draw / 2, 0.3),
+                                    arrowprops=dict(facecolor='blue', arrowstyle='->'), ha='center', color='blue',
+                                    fontweight='bold')
+
+    else:
+        # --- SIMPLE / CONTINUOUS ---
+        slab_len_draw = 5.0
+
+        # Beams
+        ax.add_patch(patches.Rectangle((-beam_w, -beam_d), beam_w, beam_d,
+                                       facecolor='white', edgecolor=concrete_edge, hatch=hatch_style))
+        ax.add_patch(patches.Rectangle((slab_len_draw, -beam_d), beam_w, beam_d,
+                                       facecolor='white', edgecolor=concrete_edge, hatch=hatch_style))
+        # Slab
+        ax.add_patch(patches.Rectangle((0, -slab_h_draw), slab_len_draw, slab_h_draw,
+                                       facecolor=concrete_color, edgecolor=concrete_edge))
+
+        # Rebar (Bottom)
+        bar_y = -slab_h_draw + cover_visual + 0.02
+        ax.plot([0.1, slab_len_draw - 0.1], [bar_y, bar_y], color='blue', lw=3)
+        ax.plot([0.1, 0.1], [bar_y, bar_y + 0.15], color='blue', lw=3)
+        ax.plot([slab_len_draw - 0.1, slab_len_draw - 0.1], [bar_y, bar_y + 0.15], color='blue', lw=3)
+
+        # Temp Bar
+        dist_y = bar_y + 0.05
+        spacing_draw = 0.3
+        n_bars = int(slab_len_draw / spacing_draw)
+        for i in range(1, n_bars):
+            cx = i * spacing_draw
+            ax.add_patch(patches.Circle((cx, dist_y), 0.03, color='red'))
+
+        # Dimensions
+        texts['L'] = draw_dim(ax, 0, -beam_d, slab_len_draw, -beam_d, f"L = {Lx_real:.2f} m", offset_y=0.0)
+        texts['t'] = draw_dim(ax, slab_len_draw + beam_w, 0, slab_len_draw + beam_w, -slab_h_draw,
+                              f"t = {h_cm:.0f} cm", offset_x=0.2)
+
+        # Labels
+        texts['main'] = ax.annotate(f"{main_key}@{s_main:.0f}cm (Btm)", xy=(slab_len_draw / 2, bar_y),
+                                    xytext=(slab_len_draw / 2, -slab_h_draw - 0.4),
+                                    arrowprops=dict(facecolor='blue', arrowstyle='->'), ha='center', color='blue',
+                                    fontweight='bold')
+
+        texts['temp'] = ax.annotate(f"Temp: {temp_key}@{s_temp:.0f}cm", xy=(slab_len_draw / 2 + 0.2, dist_y),
+                                    xytext=(slab_len_draw / 2 + 1.0, 0.2),
+                                    arrowprops=dict(facecolor='red', arrowstyle='->'), ha='center', color='red',
+                                    fontweight='bold')
+
+    ax.axis('equal')
+    ax.axis('off')
+    return texts
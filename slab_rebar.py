@@ -0,0 +1,92 @@
+"""
+RC One-Way Slab Design - Rebar Selection Tables
+
+ตารางเหล็กเสริม (ขนาด/ระยะห่าง) ทุกตัวเลือกที่ใช้งานจริง เรียงตาม As ต่อเมตร (cm²/m)
+หาเหล็กที่พอดีที่สุด (As_prov น้อยสุดที่ ≥ As_req) ด้วย Binary Search
+
+- ตารางแยกตามระยะห่างสูงสุด s_max = min(3h, 45) (เหล็กหลัก) / min(5h, 45) (เหล็กกันร้าว)
+  สร้างครั้งแรกที่ใช้แล้วแคชไว้ (lru_cache) ใช้ซ้ำได้ตลอดทั้ง Batch
+- mainBar / tempBar = "Auto" ใน inputs ให้ design_slab เลือกเหล็กจากตารางเอง
+"""
+from bisect import bisect_left
+from functools import lru_cache
+
+from slab_core import AUTO_BAR, BAR_INFO, design_slab
+
+SPACING_STEP = 0.5  # cm
+MIN_SPACING = 10.0  # cm ระยะห่างต่ำสุดที่ใช้งานจริง
+ABS_MAX_SPACING = 45.0  # cm
+AUTO_MAIN_BARS = ('DB10', 'DB12', 'DB16', 'DB20')
+AUTO_TEMP_BARS = ('RB9', 'DB10', 'DB12')
+
+
+def max_spacing(h_cm, temp=False):
+    """ระยะห่างสูงสุด: min(3h, 45) สำหรับเหล็กหลัก, min(5h, 45) สำหรับเหล็กกันร้าว"""
+    return min((5 if temp else 3) * h_cm, ABS_MAX_SPACING)
+
+
+class RebarTable:
+    """
+    ตัวเลือกเหล็กเรียงตาม As (cm²/m) จากน้อยไปมาก (As เท่ากันเลือกระยะห่างมากก่อน)
+    entries: list ของ (As, spacing, key)
+    """
+    __slots__ = ('entries', 'areas')
+
+    def __init__(self, entries):
+        self.entries = sorted(entries, key=lambda e: (e[0], -e[1]))
+        self.areas = [e[0] for e in self.entries]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def best_fit(self, As_req):
+        """(As, spacing, key) ที่ As น้อยสุดซึ่ง ≥ As_req หรือ None ถ้าไม่มีตัวเลือกใดพอ"""
+        i = bisect_left(self.areas, As_req)
+        return self.entries[i] if i < len(self.entries) else None
+
+
+def _spacings(s_max, s_min=MIN_SPACING):
+    n = int((s_max - s_min) / SPACING_STEP + 1e-9)
+    return [s_min + k * SPACING_STEP for k in range(n + 1)]
+
+
+@lru_cache(maxsize=None)
+def rebar_table(s_max, bars=AUTO_MAIN_BARS, s_min=MIN_SPACING):
+    """ตารางของทุก (เหล็ก, ระยะห่าง) ที่ s_min ≤ s ≤ s_max ทีละ SPACING_STEP"""
+    return RebarTable([(BAR_INFO[k]['A_cm2'] * 100 / s, s, k) for s in _spacings(s_max, s_min) for k in bars])
+
+
+def main_table(h_cm, bars=AUTO_MAIN_BARS):
+    return rebar_table(max_spacing(h_cm), tuple(bars))
+
+
+def temp_table(h_cm, bars=AUTO_TEMP_BARS):
+    return rebar_table(max_spacing(h_cm, temp=True), tuple(bars))
+
+
+def resolve_bars(inputs, main_bars=AUTO_MAIN_BARS, temp_bars=AUTO_TEMP_BARS):
+    """
+    แทน mainBar / tempBar ที่เป็น "Auto" ด้วยเหล็กที่พอดีที่สุดจากตาราง
+
+    As_req ของเหล็กหลักขึ้นกับ d ซึ่งขึ้นกับขนาดเหล็ก จึงคำนวณด้วยเหล็กใหญ่สุดใน main_bars (d น้อยสุด)
+    เหล็กที่เลือกจึงยังพอเมื่อคำนวณใหม่ด้วย d จริง (design_slab ปรับระยะห่างให้อีกครั้ง)
+    ถ้าไม่มีตัวเลือกใดพอที่ MIN_SPACING ใช้เหล็กใหญ่สุด
+    """
+    auto_main = inputs['mainBar'] == AUTO_BAR
+    auto_temp = inputs['tempBar'] == AUTO_BAR
+    if not (auto_main or auto_temp):
+        return inputs
+
+    largest_main = max(main_bars, key=lambda k: BAR_INFO[k]['d_mm'])
+    largest_temp = max(temp_bars, key=lambda k: BAR_INFO[k]['d_mm'])
+    trial = dict(inputs, mainBar=largest_main if auto_main else inputs['mainBar'],
+                 tempBar=largest_temp if auto_temp else inputs['tempBar'])
+    r = design_slab(trial)
+    out = dict(trial)
+    if auto_main:
+        pick = main_table(inputs['h'], main_bars).best_fit(r.As_req)
+        out['mainBar'] = pick[2] if pick else largest_main
+    if auto_temp:
+        pick = temp_table(inputs['h'], temp_bars).best_fit(r.As_req_long)
+        out['tempBar'] = pick[2] if pick else largest_temp
+    return out
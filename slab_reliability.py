@@ -0,0 +1,253 @@
+"""
+RC One-Way Slab Design - Monte Carlo Reliability
+
+ความน่าจะเป็นของการวิบัติ (Pf) และดัชนีความเชื่อมั่น (β) ของพื้นที่ออกแบบแล้ว
+โดยให้ fc, fy, h, cover, sdl, ll เป็นตัวแปรสุ่ม
+
+    python slab_reliability.py --set Lx=3 --set h=12 --set ll=300 -n 4e6 --workers 4
+    python slab_reliability.py --set support=Cantilever --dist ll=gumbel,1.0,0.30 -o reliability.json
+
+- เหล็ก (ขนาด/ระยะห่าง) และตัวคูณแรง Mu/wu, Vu/wu มาจากการออกแบบตามค่าระบุ (design_slab)
+  แล้วตรวจ Limit State ด้วยค่าจริง (ไม่มี φ และตัวคูณน้ำหนัก):
+    ดัด:   g = As·fy·(d - a/2) - w·(Mu/wu)     a = As·fy / (0.85·fc·b)
+    เฉือน: g = 0.53·√fc·b·d - w·(Vu/wu)        w = 2400·h + sdl + ll
+- สุ่มทีละ Chunk (หน่วยความจำคงที่ไม่ขึ้นกับจำนวนตัวอย่าง) กระจายไปหลาย Process
+  แต่ละ Chunk ได้ Seed ของตัวเองจาก SeedSequence.spawn ผลจึงเหมือนเดิมทุกครั้งไม่ว่าจะใช้กี่ Worker
+  (ขึ้นกับ seed และ chunk_size เท่านั้น)
+- ช่วงความเชื่อมั่นของ Pf แบบ Wilson score แปลงเป็นช่วงของ β = -Φ⁻¹(Pf)
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+from slab_core import BAR_INFO, Status, design_slab
+
+RANDOM_FIELDS = ('fc', 'fy', 'h', 'cover', 'sdl', 'll')
+LIMIT_STATES = ('flexure', 'shear', 'system')
+DISTRIBUTIONS = ('normal', 'lognormal', 'gumbel', 'fixed')
+
+# ค่าเริ่มต้น: mean = bias × ค่าระบุ, ความกระจายเป็น cov (หรือ sd ในหน่วยเดียวกับค่าระบุ)
+DEFAULT_DISTRIBUTIONS = {
+    'fc': {'dist': 'lognormal', 'bias': 1.10, 'cov': 0.15},
+    'fy': {'dist': 'lognormal', 'bias': 1.10, 'cov': 0.06},
+    'h': {'dist': 'normal', 'bias': 1.00, 'sd': 0.5},
+    'cover': {'dist': 'normal', 'bias': 1.00, 'sd': 0.5},
+    'sdl': {'dist': 'normal', 'bias': 1.05, 'cov': 0.10},
+    'll': {'dist': 'gumbel', 'bias': 1.00, 'cov': 0.25},
+}
+EULER_GAMMA = 0.5772156649015329
+
+
+# ==========================================
+# 1. RANDOM VARIABLES
+# ==========================================
+def _moments(nominal, spec):
+    """(mean, sd) ของตัวแปรจากค่าระบุและ spec"""
+    mean = nominal * spec.get('bias', 1.0)
+    sd = spec['sd'] if 'sd' in spec else abs(mean) * spec.get('cov', 0.0)
+    return mean, sd
+
+
+def sample(rng, nominal, spec, size):
+    """
+    สุ่มตัวแปรหนึ่งตัว size ค่า ตัดค่าติดลบเป็น 0 (ความหนา/กำลัง/น้ำหนักติดลบไม่มีความหมายทางกายภาพ)
+    spec: {'dist': normal | lognormal | gumbel | fixed, 'bias': ..., 'cov': ... หรือ 'sd': ...}
+    """
+    dist = spec.get('dist', 'normal')
+    mean, sd = _moments(nominal, spec)
+    if dist == 'fixed' or sd == 0:
+        return np.full(size, mean)
+    if dist == 'normal':
+        x = rng.normal(mean, sd, size)
+    elif dist == 'lognormal':
+        s2 = math.log1p((sd / mean) ** 2)
+        x = rng.lognormal(math.log(mean) - s2 / 2, math.sqrt(s2), size)
+    elif dist == 'gumbel':
+        scale = sd * math.sqrt(6) / math.pi
+        x = rng.gumbel(mean - EULER_GAMMA * scale, scale, size)
+    else:
+        raise ValueError(f"unknown distribution '{dist}' (use one of {', '.join(DISTRIBUTIONS)})")
+    return np.maximum(x, 0.0)
+
+
+# ==========================================
+# 2. LIMIT STATES (ONE CHUNK)
+# ==========================================
+def limit_state_model(inputs):
+    """
+    ค่าคงที่ของ Limit State จากการออกแบบตามค่าระบุ (เหล็กที่ใช้จริง และตัวคูณแรง Mu/wu, Vu/wu)
+    ใช้ผลของ design_slab จึงรองรับ Mu / Vu จากการวิเคราะห์ภายนอกและเหล็ก "Auto" ด้วย
+    """
+    r = design_slab(inputs)
+    if r.status_flex != Status.OK or not math.isfinite(r.As_prov_main):
+        raise ValueError(f"nominal design has no valid main steel ({r.status_flex.label}); "
+                         "reliability needs a slab that passes flexure design")
+    return {'As': r.As_prov_main, 'db': BAR_INFO[r.inputs['mainBar']]['d_mm'] / 10,
+            'm_per_w': r.Mu / r.wu, 'v_per_w': r.Vu / r.wu, 'mainBar': r.inputs['mainBar'], 's_main': r.s_main}
+
+
+def run_chunk(inputs, model, distributions, size, seed_seq):
+    """สุ่ม size ตัวอย่างด้วย seed_seq แล้วนับจำนวนที่วิบัติต่อ Limit State (dict ของ int)"""
+    rng = np.random.default_rng(seed_seq)
+    x = {k: sample(rng, float(inputs[k]), distributions[k], size) for k in RANDOM_FIELDS}
+    b = 100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d = x['h'] - x['cover'] - model['db'] / 2
+        w = 2400 * (x['h'] / 100) + x['sdl'] + x['ll']  # kg/m
+        T = model['As'] * x['fy']
+        a = T / (0.85 * x['fc'] * b)
+        Mn = T * (d - a / 2)  # kg-cm
+        Vn = 0.53 * np.sqrt(x['fc']) * b * d  # kg
+        # ค่าที่คำนวณไม่ได้ (เช่น d ≤ 0) นับเป็นวิบัติ
+        flex_fail = ~(Mn - w * model['m_per_w'] * 100 > 0)
+        shear_fail = ~(Vn - w * model['v_per_w'] > 0)
+    return {'flexure': int(flex_fail.sum()), 'shear': int(shear_fail.sum()),
+            'system': int((flex_fail | shear_fail).sum())}
+
+
+def _run_chunk_args(args):
+    return run_chunk(*args)
+
+
+# ==========================================
+# 3. STATISTICS
+# ==========================================
+def wilson_interval(failures, n, confidence=0.95):
+    """
+    ช่วงความเชื่อมั่นของสัดส่วนแบบ Wilson score (ใช้ได้แม้ failures = 0)
+    failures = 0 / n ได้ขอบล่าง / บนเป็น 0.0 / 1.0 พอดี (center ± half ให้เศษจากการปัดเศษ)
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = failures / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z / denom * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+    lo = 0.0 if failures == 0 else max(0.0, center - half)
+    hi = 1.0 if failures == n else min(1.0, center + half)
+    return lo, hi
+
+
+def beta_index(pf):
+    """β = -Φ⁻¹(Pf) (None เมื่อ Pf = 0 หรือ 1 ซึ่ง β เป็นอนันต์)"""
+    if pf <= 0.0 or pf >= 1.0:
+        return None
+    return -NormalDist().inv_cdf(pf)
+
+
+def summarize(failures, n, confidence=0.95):
+    lo, hi = wilson_interval(failures, n, confidence)
+    pf = failures / n
+    return {'failures': failures, 'pf': pf, 'pf_ci': [lo, hi],
+            'beta': beta_index(pf), 'beta_ci': [beta_index(hi), beta_index(lo)],
+            'cov_pf': math.sqrt((1 - pf) / (n * pf)) if failures else None}
+
+
+# ==========================================
+# 4. DRIVER
+# ==========================================
+def reliability(inputs, n_samples=1_000_000, distributions=None, seed=0, chunk_size=250_000, workers=1,
+                confidence=0.95):
+    """
+    Monte Carlo ของพื้นหนึ่งแผ่น คืน dict: จำนวนตัวอย่าง และ Pf / β พร้อมช่วงความเชื่อมั่นต่อ Limit State
+    distributions: แทนที่บางตัวแปรใน DEFAULT_DISTRIBUTIONS (key ตาม RANDOM_FIELDS)
+    workers: จำนวน Process (1 = รันใน Process นี้) ผลเหมือนกันทุกค่า workers สำหรับ seed เดียวกัน
+    """
+    dists = dict(DEFAULT_DISTRIBUTIONS, **(distributions or {}))
+    unknown = set(dists) - set(RANDOM_FIELDS)
+    if unknown:
+        raise KeyError(f"no random variable named {', '.join(sorted(unknown))}")
+    model = limit_state_model(inputs)
+
+    sizes = [chunk_size] * (n_samples // chunk_size)
+    if n_samples % chunk_size:
+        sizes.append(n_samples % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(inputs, model, dists, size, s) for size, s in zip(sizes, seeds)]
+
+    start = time.perf_counter()
+    if workers == 1 or len(tasks) == 1:
+        counts = [run_chunk(*t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = list(pool.map(_run_chunk_args, tasks))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'slab_id': inputs.get('slab_id', ''), 'n': n_samples, 'seed': seed, 'confidence': confidence,
+        'mainBar': model['mainBar'], 's_main': model['s_main'], 'distributions': dists,
+        'limit_states': {k: summarize(sum(c[k] for c in counts), n_samples, confidence) for k in LIMIT_STATES},
+        'elapsed_s': elapsed, 'samples_per_s': n_samples / elapsed if elapsed > 0 else None,
+    }
+
+
+def _parse_dist(values):
+    """--dist KEY=DIST,BIAS,COV (หรือ KEY=DIST,BIAS,sd=VALUE)"""
+    out = {}
+    for item in values or ():
+        key, sep, spec = item.partition("=")
+        parts = [p.strip() for p in spec.split(",")]
+        if not sep or not 1 <= len(parts) <= 3:
+            raise argparse.ArgumentTypeError(f"--dist expects KEY=DIST,BIAS,COV, got '{item}'")
+        d = {'dist': parts[0]}
+        if len(parts) > 1:
+            d['bias'] = float(parts[1])
+        if len(parts) > 2:
+            if parts[2].startswith("sd="):
+                d['sd'] = float(parts[2][3:])
+            else:
+                d['cov'] = float(parts[2])
+        out[key.strip()] = d
+    return out
+
+
+def _fmt_beta(b):
+    return "inf" if b is None else f"{b:.2f}"
+
+
+def main(argv=None):
+    from slab_floor import _parse_set
+    from slab_schedule import parse_row
+
+    parser = argparse.ArgumentParser(description="Monte Carlo reliability (Pf, beta) of a one-way slab design.")
+    parser.add_argument("--set", action="append", metavar="KEY=VALUE",
+                        help="slab input (e.g. Lx=3, h=12, support=Cantilever); others use the app defaults")
+    parser.add_argument("--dist", action="append", metavar="KEY=DIST,BIAS,COV",
+                        help="distribution of fc/fy/h/cover/sdl/ll, e.g. ll=gumbel,1.0,0.25 or h=normal,1,sd=0.5")
+    parser.add_argument("-n", "--samples", type=lambda v: int(float(v)), default=1_000_000)
+    parser.add_argument("--chunk-size", type=lambda v: int(float(v)), default=250_000)
+    parser.add_argument("-w", "--workers", type=int, default=None, help="process count (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("-o", "--output", help="write the result as JSON")
+    args = parser.parse_args(argv)
+
+    raw = {'Lx': 3.0, 'Ly': 7.0, 'h': 12.0, 'cover': 2.0, 'fc': 240, 'fy': 4000, 'sdl': 150.0, 'll': 300.0,
+           'support': 'Simply Supported', 'mainBar': 'DB12', 'tempBar': 'RB9'}
+    raw.update(_parse_set(args.set))
+    inputs, err = parse_row(raw, 0)
+    if err:
+        parser.error(err)
+
+    res = reliability(inputs, args.samples, _parse_dist(args.dist), args.seed, args.chunk_size,
+                      args.workers or os.cpu_count() or 1, args.confidence)
+    print(f"{res['n']:,} samples, {res['mainBar']}@{res['s_main']:.1f} cm, "
+          f"{res['samples_per_s']:,.0f} samples/s ({res['confidence']:.0%} CI)", file=sys.stderr)
+    for k, s in res['limit_states'].items():
+        print(f"  {k:<8} Pf = {s['pf']:.3e} [{s['pf_ci'][0]:.3e}, {s['pf_ci'][1]:.3e}]  "
+              f"beta = {_fmt_beta(s['beta'])} [{_fmt_beta(s['beta_ci'][0])}, {_fmt_beta(s['beta_ci'][1])}]",
+              file=sys.stderr)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(res, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+RC One-Way Slab Design - Reusable Section Canvases (matplotlib OO / Agg)
+
+รูปหน้าตัด PNG แบบเดียวกับ plot_slab_section แต่ไม่ผ่าน pyplot และไม่สร้างรูปใหม่ทุกครั้ง:
+สร้างรูปฐานครั้งเดียวต่อ Layout (cantilever / span) ด้วย Figure + FigureCanvasAgg
+แล้วแก้เฉพาะข้อความที่เปลี่ยนตามพารามิเตอร์ (ระยะ L, ความหนา t, ป้ายเหล็ก) ก่อน Render
+
+    from slab_render import render_section_png, render_many
+    img = render_section_png(12, 2, 'DB12', 15, 'RB9', 25, 'Simply Supported', 3.0)   # data URI
+    imgs = render_many(list_of_args, workers=4)                                     # Process Pool
+
+ข้อตกลงเรื่อง Concurrency:
+- SectionCanvas ไม่ Thread-safe และผูกกับ Thread ที่สร้าง (เรียกจาก Thread อื่นจะ RuntimeError)
+- canvas_for() คืน Canvas ของ Thread ปัจจุบัน (threading.local) แต่ละ Thread จึงมีรูปฐานของตัวเอง
+  เรียก render_section_png จากหลาย Thread พร้อมกันได้อย่างปลอดภัย
+- การ Render ของ Agg ถือ GIL เกือบตลอด Thread จึงช่วยให้ไม่ Block แต่ไม่เพิ่ม Throughput
+  งานจำนวนมากให้ใช้ render_many (Process Pool: หนึ่ง Canvas ต่อ Layout ต่อ Process) แต่ละรูปไม่มีสถานะร่วมกัน
+  จึงใช้ได้ทุก Core ที่มี (workers เกินจำนวน Core ไม่ช่วย: เครื่อง 1 Core ได้ ~15 รูป/s เท่ากันที่ 1, 2, 4 workers)
+- ไม่แตะ pyplot / สถานะกลางของ matplotlib นอกจากอ่าน rcParams
+"""
+import base64
+import io
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from slab_plot import draw_section
+
+LAYOUTS = ('cantilever', 'span')
+_mpl = None
+_local = threading.local()
+
+
+def _load():
+    """Import ส่วน OO ของ matplotlib (ไม่ import pyplot) ครั้งแรกที่ใช้"""
+    global _mpl
+    if _mpl is None:
+        import matplotlib
+        import matplotlib.patches as patches
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from matplotlib.layout_engine import TightLayoutEngine
+        _mpl = (matplotlib, Figure, FigureCanvasAgg, patches, TightLayoutEngine)
+    return _mpl
+
+
+def layout_of(support_type):
+    return 'cantilever' if support_type == "Cantilever" else 'span'
+
+
+# ==========================================
+# 1. CANVAS (ONE LAYOUT, ONE THREAD)
+# ==========================================
+class SectionCanvas:
+    """
+    รูปฐานของหนึ่ง Layout พร้อม Text ที่แก้ได้ (ใช้ได้จาก Thread ที่สร้างเท่านั้น)
+    รูปทรง คาน เหล็ก และเส้นบอกระยะคงที่ทุกแผ่น (ขนาดในรูปไม่ขึ้นกับค่าจริง) จึงสร้างครั้งเดียว
+    """
+    __slots__ = ('layout', 'figure', 'canvas', 'texts', 'owner', 'renders')
+
+    def __init__(self, layout):
+        matplotlib, Figure, FigureCanvasAgg, patches, TightLayoutEngine = _load()
+        self.layout = layout
+        self.figure = Figure(figsize=(10, 5))
+        self.canvas = FigureCanvasAgg(self.figure)
+        ax = self.figure.add_subplot()
+        support = "Cantilever" if layout == 'cantilever' else "Simply Supported"
+        # ข้อความตัวอย่างใกล้เคียงของจริง เพื่อให้ tight_layout ได้ผลเหมือน plot_slab_section
+        self.texts = draw_section(ax, patches, 12, 2, 'DB12', 15, 'RB9', 25, support, 3.0)
+        # คำนวณ tight layout ครั้งเดียวโดยไม่ผูก Layout Engine ไว้กับรูป
+        # (ถ้ามี Engine อยู่ savefig จะวาดทั้งรูปเพิ่มอีกรอบทุกครั้ง)
+        TightLayoutEngine().execute(self.figure)
+        self.owner = threading.get_ident()
+        self.renders = 0
+
+    def update(self, h_cm, main_key, s_main, temp_key, s_temp, Lx_real):
+        t = self.texts
+        t['L'].set_text(f"L = {Lx_real:.2f} m")
+        t['t'].set_text(f"t = {h_cm:.0f} cm")
+        t['main'].set_text(f"{main_key}@{s_main:.0f}cm ({'Top' if self.layout == 'cantilever' else 'Btm'})")
+        if 'temp' in t:
+            t['temp'].set_text(f"Temp: {temp_key}@{s_temp:.0f}cm")
+
+    def render(self, h_cm, cover_cm, main_key, s_main, temp_key, s_temp, Lx_real, fmt='png'):
+        """
+        bytes ของรูป (bbox แบบ tight เหมือน fig_to_base64)
+        PNG เป็นแบบ RGB (ไม่มี Alpha) พิกเซลเท่ากับ PNG แบบ RGBA ของ pyplot ที่วางบนพื้นขาว
+        fpdf จึงฝังได้โดยไม่ต้องแปลงรูป
+        """
+        if threading.get_ident() != self.owner:
+            raise RuntimeError("SectionCanvas belongs to another thread; use canvas_for() in each thread")
+        self.update(h_cm, main_key, s_main, temp_key, s_temp, Lx_real)
+        # tight bbox จาก Renderer ที่แคชไว้ (savefig(bbox_inches='tight') จะวาดทั้งรูปเพิ่มอีกรอบ)
+        renderer = self.canvas.get_renderer()
+        bbox = self.figure.get_tightbbox(renderer).padded(_load()[0].rcParams['savefig.pad_inches'])
+        buf = io.BytesIO()
+        if fmt != 'png':
+            self.figure.savefig(buf, format=fmt, bbox_inches=bbox)
+            self.renders += 1
+            return buf.getvalue()
+        from PIL import Image
+        self.figure.savefig(buf, format='rgba', bbox_inches=bbox)
+        size = (int(self.canvas.renderer.width), int(self.canvas.renderer.height))  # Renderer ของ savefig นี้
+        image = Image.frombuffer("RGBA", size, buf.getvalue(), "raw", "RGBA", 0, 1)
+        if image.getchannel("A").getextrema() == (255, 255):
+            image = image.convert("RGB")  # พื้นหลังทึบ (กรณีปกติ)
+        else:
+            background = Image.new("RGB", size, "white")
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        out = io.BytesIO()
+        dpi = self.figure.dpi
+        image.save(out, format="png", dpi=(dpi, dpi))
+        self.renders += 1
+        return out.getvalue()
+
+
+def canvas_for(layout):
+    """SectionCanvas ของ Layout นี้สำหรับ Thread ปัจจุบัน (สร้างครั้งแรกที่ขอ)"""
+    canvases = getattr(_local, 'canvases', None)
+    if canvases is None:
+        canvases = _local.canvases = {}
+    c = canvases.get(layout)
+    if c is None:
+        c = canvases[layout] = SectionCanvas(layout)
+    return c
+
+
+def render_section_png(h_cm, cover_cm, main_key, s_main, temp_key, s_temp, support_type, Lx_real):
+    """data URI ของรูป PNG (แทน fig_to_base64(plot_slab_section(...)) ได้โดยตรง)"""
+    png = canvas_for(layout_of(support_type)).render(h_cm, cover_cm, main_key, s_main, temp_key, s_temp, Lx_real)
+    return f"data:image/png;base64,{base64.b64encode(png).decode()}"
+
+
+# ==========================================
+# 2. BULK RENDERING (PROCESS POOL)
+# ==========================================
+def _warm():
+    """Initializer ของ Worker: สร้าง Canvas ทั้งสอง Layout ไว้ก่อนงานแรก"""
+    for layout in LAYOUTS:
+        canvas_for(layout)
+
+
+def _render_chunk(chunk):
+    return [render_section_png(*args) for args in chunk]
+
+
+def render_many(arg_list, workers=None, chunksize=16):
+    """
+    Render หลายรูป (list ของ tuple ตามลำดับพารามิเตอร์ของ plot_slab_section) คืน data URI ตามลำดับเดิม
+    workers: จำนวน Process (1 = Render ใน Thread นี้)
+    """
+    arg_list = list(arg_list)
+    workers = min(workers or os.cpu_count() or 1, max(1, len(arg_list) // chunksize))
+    if workers <= 1:
+        return _render_chunk(arg_list)
+    chunks = [arg_list[i:i + chunksize] for i in range(0, len(arg_list), chunksize)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm) as pool:
+        return [img for out in pool.map(_render_chunk, chunks) for img in out]
@@ -0,0 +1,302 @@
+"""
+RC One-Way Slab Design - HTML Report
+
+Template ถูก Compile (แยก literal / field) ครั้งเดียวตอน import
+รายงานถูกสร้างเป็น Stream ของชิ้น string (Generator) แล้วเขียนลง File Handle ทีละชิ้น
+หน่วยความจำจึงไม่โตตามจำนวนแผ่นพื้น และ CSS / Font ถูกใส่เพียงครั้งเดียวต่อเอกสาร
+"""
+import os
+from string import Formatter
+
+from slab_core import CalcRow
+
+FONT_HREF = "https://fonts.googleapis.com/css2?family=Sarabun:wght@400;700&display=swap"
+CSS_FILENAME = "report.css"
+
+REPORT_CSS = """
+            body { font-family: 'Sarabun', sans-serif; padding: 20px; color: black; }
+            h1, h3 { text-align: center; margin: 5px; }
+            .header { border-bottom: 2px solid #333; padding-bottom: 10px; margin-bottom: 20px; position: relative; }
+            .id-box { position: absolute; top:0; right:0; border: 2px solid #000; padding: 5px 15px; font-weight: bold; font-size: 18px; }
+            .info-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 10px; margin-bottom: 20px; }
+            .info-box { border: 1px solid #ddd; padding: 10px; }
+            .img-container { text-align: center; margin: 20px 0; border: 1px solid #eee; padding: 10px; }
+            img, .img-container svg { max-width: 80%; height: auto; }
+            table { width: 100%; border-collapse: collapse; font-size: 12px; }
+            th, td { border: 1px solid #444; padding: 6px; }
+            th { background-color: #eee; }
+            .sec-row { background-color: #ddd; font-weight: bold; }
+            .pass-ok { color: green; font-weight: bold; }
+            .pass-no { color: red; font-weight: bold; }
+            .pass-warn { color: orange; font-weight: bold; }
+            .load-value { color: #D32F2F; font-weight: bold; }
+
+            .footer { margin-top: 40px; page-break-inside: avoid; }
+            .sign-box { width: 250px; text-align: center; margin-top: 20px; }
+            .line { border-bottom: 1px solid #000; margin: 30px 0 5px 0; }
+            .slab-page + .slab-page { page-break-before: always; margin-top: 40px; }
+
+            /* Print Button Internal */
+            .print-btn-internal {
+                background-color: #4CAF50; border: none; color: white; padding: 10px 20px;
+                text-align: center; display: inline-block; font-size: 16px; margin-bottom: 20px;
+                cursor: pointer; border-radius: 4px; font-family: 'Sarabun'; font-weight: bold;
+            }
+            @media print { .no-print { display: none !important; } }
+"""
+
+
+# ==========================================
+# 1. COMPILED TEMPLATES
+# ==========================================
+def _compile(template):
+    """แยก template แบบ str.format เป็น list ของ (literal, field) ครั้งเดียว"""
+    return [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+
+
+def _render(compiled, values):
+    for literal, field in compiled:
+        if literal:
+            yield literal
+        if field is not None:
+            yield str(values[field])
+
+
+_HEAD = _compile("""
+    <!DOCTYPE html>
+    <html lang="th">
+    <head>
+        <meta charset="UTF-8">
+        <title>{title}</title>
+        {font_link}
+        {style}
+    </head>
+    <body>
+        <div class="no-print" style="text-align: center;">
+            <button onclick="window.print()" class="print-btn-internal">🖨️ Print Report</button>
+        </div>
+""")
+
+_SLAB_OPEN = _compile("""
+      <div class="slab-page">
+        <div class="header">
+            <div class="id-box">{slab_id}</div>
+            <h1>ENGINEERING DESIGN REPORT</h1>
+            <h3>RC One-Way Slab Design (ACI 318/EIT)</h3>
+        </div>
+
+        <div class="info-grid">
+            <div class="info-box">
+                <strong>Project:</strong> {project}<br>
+                <strong>Engineer:</strong> {engineer}<br>
+                <strong>Date:</strong> 16/12/2568
+            </div>
+            <div class="info-box">
+                <strong>Panel Size:</strong> {Lx} x {Ly} m ({support})<br>
+                <strong>Thickness:</strong> {h} cm (Cover {cover} cm)<br>
+                <strong>Materials:</strong> fc'={fc}, fy={fy} ksc
+            </div>
+        </div>
+
+        <h3>Design Visualization</h3>
+        <div class="img-container">
+            {img_html}
+        </div>
+
+        <h3>Calculation Details</h3>
+        <table>
+            <thead>
+                <tr>
+                    <th width="25%">Item</th><th width="20%">Formula</th><th width="25%">Substitution</th>
+                    <th width="15%">Result</th><th width="8%">Unit</th><th width="7%">Status</th>
+                </tr>
+            </thead>
+            <tbody>
+                """)
+
+_SLAB_CLOSE = _compile("""
+            </tbody>
+        </table>
+
+        <div class="footer">
+            <div class="sign-box">
+                <div style="text-align: left; font-weight: bold;">Designed by:</div>
+                <div class="line"></div>
+                <div>({engineer})</div>
+                <div>Civil Engineer</div>
+            </div>
+        </div>
+      </div>
+""")
+
+_TAIL = """
+    </body>
+    </html>
+    """
+
+
+# ==========================================
+# 2. STREAMING PIECES
+# ==========================================
+def _image_html(img_base64):
+    """data URI ของรูป (PNG/SVG) หรือ SVG string (<svg ...>) ซึ่งจะฝังลงในหน้าโดยตรง"""
+    if img_base64.lstrip().startswith("<svg"):
+        return img_base64
+    return f'<img src="{img_base64}" />'
+
+
+def _legacy_style(r):
+    """(class ของ Status, เน้นค่าหรือไม่) ของแถวแบบเดิมที่เป็นข้อความล้วน"""
+    st_val = r[5]
+    cls = "pass-ok"
+    if "FAIL" in st_val:
+        cls = "pass-no"
+    elif "WARNING" in st_val or "CHECK" in st_val:
+        cls = "pass-warn"
+    elif "INFO" in st_val:
+        cls = ""
+    return cls, "Factored" in str(r[0])
+
+
+def row_cells(r):
+    """
+    (cells, class ของ Status, เน้นค่าหรือไม่) ของแถวหนึ่ง
+    r: CalcRow (ใช้ Status โดยตรง) หรือ list ข้อความแบบเดิมจาก process_slab_calculation
+    """
+    if isinstance(r, CalcRow):
+        return r.cells(), r.css_class, r.highlight
+    cls, highlight = _legacy_style(r)
+    return r, cls, highlight
+
+
+def iter_table_rows(rows):
+    """แถวของตารางคำนวณทีละ <tr>"""
+    for r in rows:
+        c, cls, highlight = row_cells(r)
+        if c[0] == "SECTION":
+            yield f"<tr class='sec-row'><td colspan='6'>{c[1]}</td></tr>"
+        else:
+            val_cls = "load-value" if highlight else ""
+
+            yield f"<tr><td>{c[0]}</td><td>{c[1]}</td><td>{c[2]}</td><td class='{val_cls}'>{c[3]}</td><td>{c[4]}</td><td class='{cls}'>{c[5]}</td></tr>"
+
+
+def iter_head(title="One-Way Slab Design Report", css_href=None, font_href=FONT_HREF):
+    """
+    ส่วนหัวของเอกสาร
+    css_href: ถ้าระบุจะ link ไปยังไฟล์ CSS ภายนอกแทนการฝัง <style>
+    font_href: None = ไม่โหลด Font จากภายนอก (เช่น Bundle ที่มี @font-face อยู่ใน CSS แล้ว)
+    """
+    if css_href:
+        style = f'<link rel="stylesheet" href="{css_href}">'
+    else:
+        style = f"<style>{REPORT_CSS}        </style>"
+    font_link = f'<link href="{font_href}" rel="stylesheet">' if font_href else ""
+    return _render(_HEAD, {'title': title, 'font_link': font_link, 'style': style})
+
+
+def iter_slab(inputs, rows, img_base64):
+    """เนื้อหาของพื้นหนึ่งแผ่น (ไม่รวม <head>)"""
+    values = dict(inputs, img_html=_image_html(img_base64))
+    yield from _render(_SLAB_OPEN, values)
+    yield from iter_table_rows(rows)
+    yield from _render(_SLAB_CLOSE, values)
+
+
+def iter_tail():
+    yield _TAIL
+
+
+def iter_report(inputs, rows, img_base64, **head_kwargs):
+    """รายงานของพื้นหนึ่งแผ่นเป็น Stream"""
+    yield from iter_head(**head_kwargs)
+    yield from iter_slab(inputs, rows, img_base64)
+    yield from iter_tail()
+
+
+def iter_combined_report(slabs, title="One-Way Slab Design Report", **head_kwargs):
+    """
+    รายงานรวมหลายแผ่นในเอกสารเดียว (CSS / Font ครั้งเดียว, ขึ้นหน้าใหม่ทุกแผ่นเมื่อพิมพ์)
+    slabs: iterable ของ (inputs, rows, img_base64) ถูกใช้ทีละรายการ
+    """
+    yield from iter_head(title=title, **head_kwargs)
+    for inputs, rows, img_base64 in slabs:
+        yield from iter_slab(inputs, rows, img_base64)
+    yield from iter_tail()
+
+
+# ==========================================
+# 3. PUBLIC API
+# ==========================================
+def generate_report(inputs, rows, img_base64):
+    """
+    rows: list ของ CalcRow (SlabDesign.rows()) หรือ rows ข้อความแบบเดิม
+    img_base64: data URI ของรูป (PNG/SVG) หรือ SVG string (<svg ...>) ซึ่งจะฝังลงในหน้าโดยตรง
+    """
+    return "".join(iter_report(inputs, rows, img_base64))
+
+
+def write_stream(fh, chunks):
+    """เขียน Stream ของ string ลง File Handle ทีละชิ้น"""
+    for chunk in chunks:
+        fh.write(chunk)
+
+
+def write_combined_report(path, slabs, **kwargs):
+    """เขียนรายงานรวมของทุกแผ่นลงไฟล์เดียว"""
+    with open(path, 'w', encoding='utf-8') as f:
+        write_stream(f, iter_combined_report(slabs, **kwargs))
+
+
+def write_css(directory):
+    """เขียน CSS กลาง (ใช้ร่วมกันทุกรายงานในโฟลเดอร์) คืน path ของไฟล์"""
+    path = os.path.join(directory, CSS_FILENAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(REPORT_CSS)
+    return path
+
+
+def report_filename(slab_id):
+    return "".join(c if c.isalnum() or c in '-_' else '_' for c in str(slab_id)) + ".html"
+
+
+class ReportNames:
+    """
+    ชื่อไฟล์ที่ไม่ซ้ำกันภายในหนึ่งชุดรายงาน (เรียกทีละแผ่นตามลำดับ)
+    slab_id ซ้ำ หรือต่างกันเฉพาะอักขระที่ถูกแทนด้วย _ ("A/1", "A_1") ต่อท้าย _2, _3 ...
+    เทียบแบบไม่สนตัวพิมพ์เล็ก/ใหญ่ (ระบบไฟล์ Windows / macOS)
+    """
+
+    def __init__(self, ext=".html"):
+        self.ext = ext
+        self.used = set()
+
+    def __call__(self, slab_id):
+        stem = report_filename(slab_id)[:-len(".html")]
+        name, n = stem + self.ext, 1
+        while name.casefold() in self.used:
+            n += 1
+            name = f"{stem}_{n}{self.ext}"
+        self.used.add(name.casefold())
+        return name
+
+
+def write_slab_report(directory, inputs, rows, img_base64, css_href=CSS_FILENAME, filename=None):
+    """
+    เขียนรายงานของพื้นหนึ่งแผ่นลงโฟลเดอร์ (link CSS กลางแทนการฝังซ้ำ) คืน path ของไฟล์
+    filename: ชื่อไฟล์ (ค่าเริ่มต้น = inputs['report_file'] ถ้ามี ไม่เช่นนั้น report_filename)
+    """
+    filename = filename or inputs.get('report_file') or report_filename(inputs['slab_id'])
+    path = os.path.join(directory, filename)
+    with open(path, 'w', encoding='utf-8') as f:
+        write_stream(f, iter_report(inputs, rows, img_base64, css_href=css_href))
+    return path
+
+
+def write_reports(directory, slabs):
+    """เขียนรายงานแยกไฟล์ทีละแผ่น + CSS กลางหนึ่งไฟล์ คืน list ของ path (ชื่อที่ชนกันต่อท้าย _2, _3 ...)"""
+    os.makedirs(directory, exist_ok=True)
+    write_css(directory)
+    names = ReportNames()
+    return [write_slab_report(directory, inputs, rows, img, filename=names(inputs['slab_id']))
+            for inputs, rows, img in slabs]
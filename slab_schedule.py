@@ -0,0 +1,354 @@
+"""
+RC One-Way Slab Design - Schedule Batch CLI
+
+ออกแบบพื้นทั้งตาราง (CSV / XLSX) ผ่าน Process Pool แล้วเขียนผลเป็น CSV
+
+    python slab_schedule.py schedule.csv -o results.csv --workers 4 --reports reports/
+    python slab_schedule.py schedule.csv -o results.csv --combined-report floor.html
+    python slab_schedule.py schedule.csv -o results.csv --pdf floor.pdf
+    python slab_schedule.py schedule.csv -o results.csv --reports reports/ --state schedule.state.json
+
+คอลัมน์ของตารางใช้ชื่อเดียวกับ inputs ของแอป:
+    slab_id, Lx, Ly, h, cover, fc, fy, sdl, ll, support, mainBar, tempBar (+ project, engineer)
+mainBar / tempBar = Auto ให้เลือกเหล็กที่พอดีที่สุดจากตารางเหล็ก (slab_rebar)
+
+อ่านและส่งงานทีละ Chunk (จำนวนงานค้างใน Pool มีจำกัด) หน่วยความจำจึงไม่โตตามขนาดไฟล์
+และผลลัพธ์ออกมาตามลำดับของ Input เสมอ
+--state: รันแบบ Incremental (slab_incremental) คำนวณ/เขียนรายงานใหม่เฉพาะแถวที่เปลี่ยน แล้วแสดง diff
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+from slab_core import AUTO_BAR, BAR_INFO, Status, design_slab, orient_spans
+from slab_batch import BATCH_FIELDS, process_slab_batch
+from slab_metrics import Metrics, NULL_METRICS
+
+NUMERIC_FIELDS = ('Lx', 'Ly', 'h', 'cover', 'fc', 'fy', 'sdl', 'll')
+TEXT_DEFAULTS = {'project': '', 'engineer': '', 'support': 'Simply Supported', 'mainBar': 'DB12', 'tempBar': 'RB9'}
+
+OUTPUT_FIELDS = ('slab_id', 'Lx', 'Ly', 'h', 'support',
+                 'mainBar', 's_main', 'As_prov_main', 'tempBar', 's_temp', 'As_prov_temp',
+                 'wu', 'Mu', 'delta_ll', 'delta_lt',
+                 'status_flex', 'status_shear', 'status_defl', 'status_final', 'error')
+
+
+# ==========================================
+# 1. INPUT READERS (STREAMING)
+# ==========================================
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        yield from csv.DictReader(f)
+
+
+def _read_xlsx(path):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise SystemExit("Reading .xlsx requires openpyxl (pip install openpyxl)")
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(c).strip() if c is not None else '' for c in next(rows, [])]
+        for values in rows:
+            if values is None or all(v is None for v in values):
+                continue
+            yield {k: v for k, v in zip(header, values) if k}
+    finally:
+        wb.close()
+
+
+def read_schedule(path):
+    """อ่านตาราง CSV/XLSX ทีละแถว (Generator) คืน dict ตามหัวคอลัมน์"""
+    if path.lower().endswith(('.xlsx', '.xlsm')):
+        return _read_xlsx(path)
+    return _read_csv(path)
+
+
+def parse_row(raw, index):
+    """
+    แปลงแถวดิบเป็น inputs dict (ตัวเลขเป็น float, สลับ Lx/Ly แบบเดียวกับแอป)
+    ถ้าข้อมูลผิดพลาดคืน (None, ข้อความ error)
+    """
+    inputs = {'slab_id': str(raw.get('slab_id') or f"S-{index + 1:02d}")}
+    for k, default in TEXT_DEFAULTS.items():
+        v = raw.get(k)
+        inputs[k] = str(v).strip() if v not in (None, '') else default
+    try:
+        for k in NUMERIC_FIELDS:
+            inputs[k] = float(raw[k])
+    except (KeyError, TypeError, ValueError):
+        return inputs, f"invalid or missing '{k}'"
+    for k in ('mainBar', 'tempBar'):
+        if inputs[k] not in BAR_INFO and inputs[k] != AUTO_BAR:
+            return inputs, f"unknown bar '{inputs[k]}'"
+    if inputs['Lx'] <= 0 or inputs['Ly'] <= 0 or inputs['h'] <= 0:
+        return inputs, "Lx, Ly and h must be positive"
+    return orient_spans(inputs)[0], None
+
+
+def name_reports(parsed):
+    """
+    ตั้งชื่อไฟล์รายงาน inputs['report_file'] ที่ไม่ซ้ำกันทั้งตาราง (ReportNames) ให้แถวที่ parse ผ่าน ตามลำดับ
+    ต้องทำใน Process หลักก่อนแบ่ง Chunk เพราะชื่อที่ชนกันอาจอยู่คนละ Chunk
+    """
+    from slab_report import ReportNames
+    names = ReportNames()
+    for inputs, err in parsed:
+        if err is None:
+            inputs['report_file'] = names(inputs['slab_id'])
+        yield inputs, err
+
+
+# ==========================================
+# 2. WORKER
+# ==========================================
+def spacing_error(s_main, s_temp):
+    """ข้อความ error ของแผ่นที่ระยะเหล็กปัดลงเหลือ 0 (เหล็กเล็กเกินไป)"""
+    which = [name for name, s in (("main", s_main), ("temp", s_temp)) if not s > 0]
+    return f"zero {' and '.join(which)} bar spacing: use a larger bar"
+
+
+def _section_figure(design, drawing, metrics=NULL_METRICS):
+    """รูปหน้าตัดของ SlabDesign (PNG base64 หรือ SVG)"""
+    inputs = design.inputs  # เหล็ก "Auto" ถูกแทนด้วยเหล็กที่เลือกแล้ว
+    args = (inputs['h'], inputs['cover'], inputs['mainBar'], design.s_main, inputs['tempBar'], design.s_temp,
+            inputs['support'], inputs['Lx'])
+    if drawing == 'png':
+        from slab_render import render_section_png  # Canvas ที่สร้างไว้แล้วของ Process/Thread นี้
+        with metrics.stage("plot"):
+            return render_section_png(*args)
+    from slab_svg import figure_id, render_section_svg
+    with metrics.stage("plot_svg"):  # id ไม่ซ้ำต่อแผ่น (รายงานรวมฝังหลายรูปในหน้าเดียว)
+        return render_section_svg(*args, id_prefix=figure_id(inputs.get('report_file') or inputs['slab_id']))
+
+
+def _render_slab(inputs, drawing, metrics=NULL_METRICS):
+    """(rows, รูป) สำหรับรายงานของพื้นหนึ่งแผ่น"""
+    with metrics.stage("calc"):
+        design = design_slab(inputs)
+    return design.rows(), _section_figure(design, drawing, metrics)
+
+
+def _fill_row(row, get):
+    """ใส่ผลคำนวณลงแถวผลลัพธ์ get(k): ค่าของ field k จาก Batch Engine หรือ SlabDesign (ตรงกันทุกบิต)"""
+    for k in ('s_main', 'As_prov_main', 's_temp', 'As_prov_temp', 'wu', 'Mu'):
+        row[k] = f"{get(k):.2f}"
+    for k in ('delta_ll', 'delta_lt'):
+        row[k] = f"{get(k):.3f}"
+    for k in ('mainBar', 'tempBar'):
+        row[k] = get(k)
+    for k in ('status_flex', 'status_shear', 'status_defl', 'status_final'):
+        row[k] = Status(int(get(k))).label
+    if not get('spacing_ok'):
+        row['error'] = spacing_error(get('s_main'), get('s_temp'))
+
+
+def _design_getter(design):
+    return lambda k: design.inputs[k] if k in ('mainBar', 'tempBar') else getattr(design, k)
+
+
+def design_chunk(chunk, report_dir=None, drawing='svg', fragments=False, sheets=False, metrics=NULL_METRICS):
+    """
+    ออกแบบ Chunk ของ (inputs, error) ด้วย Batch Engine หนึ่งครั้ง
+    คืน list ของแถวผลลัพธ์ (dict ตาม OUTPUT_FIELDS) ตามลำดับเดิม
+    เมื่อต้องทำรายงาน รายการคำนวณต้องใช้ SlabDesign ของทุกแผ่นอยู่แล้ว จึงสร้างแถวผลลัพธ์จาก design_slab
+    แทน Batch Engine (ค่าตรงกันทุกบิต) แต่ละแผ่นคำนวณครั้งเดียว
+
+    report_dir: เขียนรายงาน HTML แยกไฟล์ (link ไปที่ CSS กลางในโฟลเดอร์เดียวกัน)
+    fragments: แนบ HTML ของแต่ละแผ่นไว้ใน key 'report_html' สำหรับรายงานรวม
+    sheets: แนบ (inputs, rows, รูป PNG) ไว้ใน key 'pdf_sheet' สำหรับ PDF
+    """
+    out = [{k: inputs.get(k, '') for k in OUTPUT_FIELDS} for inputs, _ in chunk]
+    valid = [i for i, (_, err) in enumerate(chunk) if err is None]
+    for i, (_, err) in enumerate(chunk):
+        if err is not None:
+            out[i]['error'] = err
+    metrics.incr("slabs", len(chunk))
+    metrics.incr("input_errors", len(chunk) - len(valid))
+
+    if not valid:
+        return out
+    if not (report_dir or fragments or sheets):
+        with metrics.stage("batch"):
+            columns = {k: [chunk[i][0][k] for i in valid] for k in BATCH_FIELDS}
+            res = process_slab_batch(columns)
+        with metrics.stage("format"):
+            for j, i in enumerate(valid):
+                _fill_row(out[i], lambda k: res[k][j] if k in res else chunk[i][0][k])
+        return out
+
+    from slab_report import iter_slab, write_slab_report
+    for i in valid:
+        with metrics.stage("calc"):
+            design = design_slab(chunk[i][0])
+        with metrics.stage("format"):
+            _fill_row(out[i], _design_getter(design))
+        if out[i]['error']:
+            continue  # ไม่มีรายงานของแผ่นที่ระยะเหล็กใช้ไม่ได้
+        inputs = chunk[i][0]
+        rows, img = design.rows(), _section_figure(design, drawing, metrics)
+        if sheets:
+            png = img if drawing == 'png' else _section_figure(design, 'png', metrics)
+        with metrics.stage("report"):
+            if report_dir:
+                write_slab_report(report_dir, inputs, rows, img)
+            if fragments:
+                out[i]['report_html'] = "".join(iter_slab(inputs, rows, img))
+        if sheets:
+            out[i]['pdf_sheet'] = (inputs, rows, png)
+    return out
+
+
+def _design_chunk_measured(chunk, options, profile_dir):
+    """design_chunk ใน Worker Process พร้อมส่ง snapshot ของ Metrics กลับไปรวมที่ Process หลัก"""
+    metrics = Metrics(profile_dir=profile_dir)
+    with metrics.stage("chunk"):
+        rows = design_chunk(chunk, metrics=metrics, **options)
+    return rows, metrics.snapshot(events=True)
+
+
+# ==========================================
+# 3. PIPELINE
+# ==========================================
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_schedule(rows, workers=None, chunk_size=256, metrics=NULL_METRICS, **options):
+    """
+    ออกแบบทุกแถวของตารางผ่าน Process Pool (Generator ของแถวผลลัพธ์ ตามลำดับ Input)
+    rows: iterable ของ dict ดิบ (เช่นจาก read_schedule)
+    options: ส่งต่อให้ design_chunk (report_dir, drawing, fragments, sheets)
+    metrics: Metrics สำหรับจับเวลา (ผลจาก Worker ถูกรวมเข้ามาเมื่อแต่ละ Chunk เสร็จ)
+    """
+    parsed = name_reports(parse_row(raw, i) for i, raw in enumerate(rows))
+    return run_parsed(parsed, workers, chunk_size, metrics, **options)
+
+
+def run_parsed(parsed, workers=None, chunk_size=256, metrics=NULL_METRICS, **options):
+    """เหมือน run_schedule แต่รับ (inputs, error) ที่ผ่าน parse_row แล้ว (เช่นเฉพาะแถวที่เปลี่ยน)"""
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(parsed, chunk_size)
+
+    if workers == 1:
+        for chunk in chunks:
+            with metrics.stage("chunk"):
+                out = design_chunk(chunk, metrics=metrics, **options)
+            yield from out
+        return
+
+    def collect(future):
+        if not metrics.enabled:
+            return future.result()
+        out, snap = future.result()
+        metrics.merge(snap)
+        return out
+
+    task = partial(design_chunk, **options)
+    if metrics.enabled:
+        task = partial(_design_chunk_measured, options=options, profile_dir=metrics.profile_dir)
+
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(task, chunk))
+            if len(pending) >= max_pending:
+                yield from collect(pending.popleft())
+        while pending:
+            yield from collect(pending.popleft())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch design of a one-way slab schedule (CSV/XLSX).")
+    parser.add_argument("schedule", help="input schedule (.csv or .xlsx)")
+    parser.add_argument("-o", "--output", default="-", help="output CSV (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="slabs per worker task")
+    parser.add_argument("--reports", metavar="DIR", help="also write one HTML report per slab into DIR")
+    parser.add_argument("--combined-report", metavar="FILE", help="also write one combined HTML report")
+    parser.add_argument("--pdf", metavar="FILE", help="also write one PDF with a sheet per slab (needs fpdf)")
+    parser.add_argument("--pdf-font", metavar="TTF", help="TTF font for the PDF (e.g. Sarabun for Thai text)")
+    parser.add_argument("--drawing", choices=("svg", "png"), default="svg", help="section drawing in reports")
+    parser.add_argument("--metrics-out", metavar="FILE",
+                        help="write per-stage timings (.prom = Prometheus text, otherwise JSON lines)")
+    parser.add_argument("--profile", metavar="DIR", help="dump a cProfile .prof file per stage run into DIR")
+    parser.add_argument("--state", metavar="FILE",
+                        help="incremental mode: redesign only rows whose inputs changed since the run that wrote FILE")
+    args = parser.parse_args(argv)
+    if args.state and args.pdf:
+        parser.error("--pdf needs every sheet and cannot be combined with --state")
+
+    metrics = Metrics(profile_dir=args.profile) if (args.metrics_out or args.profile) else NULL_METRICS
+
+    from slab_report import iter_head, iter_tail, write_css, write_stream
+    if args.reports:
+        os.makedirs(args.reports, exist_ok=True)
+        write_css(args.reports)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    combined = open(args.combined_report, "w", encoding="utf-8") if args.combined_report else None
+    pdf = None
+    if args.pdf:
+        from slab_pdf import SlabPDFWriter
+        pdf = SlabPDFWriter(font_path=args.pdf_font)
+    start = time.perf_counter()
+    n = n_err = 0
+    try:
+        writer = csv.DictWriter(out, fieldnames=OUTPUT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        if combined:
+            write_stream(combined, iter_head(title="One-Way Slab Design Report (Schedule)"))
+        options = dict(report_dir=args.reports, drawing=args.drawing, fragments=combined is not None)
+        if args.state:
+            from slab_incremental import format_diff, run_incremental
+            results, diff, recomputed = run_incremental(read_schedule(args.schedule), args.state, args.workers,
+                                                        args.chunk_size, metrics, **options)
+        else:
+            results = run_schedule(read_schedule(args.schedule), args.workers, args.chunk_size, metrics,
+                                   sheets=pdf is not None, **options)
+        for row in results:
+            with metrics.stage("write"):
+                writer.writerow(row)
+                if combined and 'report_html' in row:
+                    combined.write(row['report_html'])
+            if pdf and 'pdf_sheet' in row:
+                with metrics.stage("pdf"):
+                    pdf.add_sheet(*row['pdf_sheet'])
+            n += 1
+            n_err += bool(row['error'])
+        if combined:
+            write_stream(combined, iter_tail())
+        if pdf:
+            with metrics.stage("pdf"):
+                pdf.output(args.pdf)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if combined:
+            combined.close()
+
+    elapsed = time.perf_counter() - start
+    rate = n / elapsed if elapsed > 0 else float('inf')
+    print(f"Designed {n} slabs ({n_err} errors) in {elapsed:.2f} s -> {rate:,.0f} slabs/s", file=sys.stderr)
+    if args.state:
+        print("\n".join(format_diff(diff, recomputed)), file=sys.stderr)
+    if args.metrics_out:
+        metrics.write(args.metrics_out)
+    return 1 if n_err else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,405 @@
+"""
+RC One-Way Slab Design - Local Design Service (HTTP/JSON)
+
+บริการ HTTP/JSON ขนาดเล็กบน asyncio (Standard Library ล้วน ไม่ต้องติดตั้งเพิ่ม)
+
+    python slab_service.py --port 8765 --window-ms 2 --render-workers 2
+    python slab_loadtest.py --port 8765 --concurrency 64 --requests 5000
+
+Endpoints:
+    POST /design   JSON inputs ของพื้นหนึ่งแผ่น (ชื่อเดียวกับแอป) หรือ {"slabs": [...]}
+                   ตัวเลือก: "drawing": "svg" | "png", "report": true (แนบ HTML ของแผ่นนั้น)
+                   แผ่นที่ใช้ไม่ได้ (ระยะเหล็กเป็น 0) หรือวาดไม่สำเร็จมี "error" ของแผ่นนั้น แผ่นอื่นยังได้ผลตามปกติ
+    POST /report   inputs หนึ่งแผ่น -> รายงาน HTML เต็มหน้า (text/html)
+    GET  /health   สถานะ, จำนวนคำขอ/Batch, งานค้าง
+    GET  /metrics  เวลาแต่ละขั้น (Prometheus text)
+
+- คำขอที่มาถึงภายใน window (ค่าเริ่มต้น 2 ms) ถูกรวมเป็น process_slab_batch ครั้งเดียว
+  ตัวเลขทุกค่าตรงกับ process_slab_calculation ทุกประการ
+- รูป PNG (matplotlib) และรายงานที่ใช้ PNG ถูกส่งไปวาดใน Process Pool
+  SVG เร็วพอจึงวาดใน Thread Pool ของ Event Loop
+- HTTP/1.1 แบบ keep-alive เท่าที่จำเป็น (Content-Length เท่านั้น ไม่รองรับ chunked)
+  ตั้งใจให้ใช้ภายในเครื่อง/เครือข่ายภายใน ไม่ใช่ Web Server สาธารณะ
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+from slab_core import Status
+from slab_batch import BATCH_FIELDS, process_slab_batch
+from slab_metrics import Metrics
+from slab_schedule import parse_row, spacing_error
+
+RESULT_FIELDS = ('ratio', 'w_dead', 'wu', 'coef', 'Mu', 'd', 'Rn', 'rho_req', 'As_req',
+                 's_main', 'As_prov_main', 'As_req_long', 's_temp', 'As_prov_temp', 'Vu', 'phi_Vc', 'h_min',
+                 'Icr', 'Ie', 'delta_ll', 'delta_lt')
+STATUS_FIELDS = ('status_type', 'status_flex', 'status_shear', 'status_defl', 'status_final')
+MAX_BODY = 1 << 20  # 1 MB
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ==========================================
+# 1. DESIGN & RENDER TASKS
+# ==========================================
+def _number(v):
+    v = float(v)
+    return v if math.isfinite(v) else None  # JSON ไม่มี NaN / Infinity
+
+
+def design_batch(slabs):
+    """
+    ออกแบบ list ของ inputs (ผ่าน parse_row แล้ว) ด้วย process_slab_batch หนึ่งครั้ง
+    คืน list ของ dict ต่อแผ่น: inputs (เหล็ก "Auto" ถูกแทนแล้ว), results (ตัวเลข), status (ข้อความ)
+    และ 'error' สำหรับแผ่นที่ระยะเหล็กปัดเหลือ 0 (แผ่นนั้นไม่มีรูป/รายงาน)
+    """
+    columns = {k: [inp[k] for inp in slabs] for k in BATCH_FIELDS}
+    for k in ('Mu', 'Vu'):
+        if any(k in inp for inp in slabs):
+            columns[k] = [float(inp.get(k, float('nan'))) for inp in slabs]
+    res = process_slab_batch(columns)
+    out = []
+    for j, inp in enumerate(slabs):
+        inputs = dict(inp)
+        for k in ('mainBar', 'tempBar'):
+            if k in res:
+                inputs[k] = str(res[k][j])
+        result = {
+            'slab_id': inputs['slab_id'],
+            'inputs': inputs,
+            'results': {k: _number(res[k][j]) for k in RESULT_FIELDS},
+            'status': {k: Status(int(res[k][j])).label for k in STATUS_FIELDS},
+        }
+        if not res['spacing_ok'][j]:
+            result['error'] = spacing_error(res['s_main'][j], res['s_temp'][j])
+        out.append(result)
+    return out
+
+
+def render_slab(inputs, drawing, report):
+    """
+    รูปหน้าตัด (และรายงาน HTML ของแผ่นนั้น) สำหรับ inputs ที่เลือกเหล็กแล้ว
+    เป็นฟังก์ชันระดับ Module เพื่อส่งไปทำใน Process Pool ได้
+    """
+    from slab_schedule import _render_slab
+    rows, img = _render_slab(inputs, drawing)
+    out = {'image': img}
+    if report:
+        from slab_report import generate_report
+        out['report_html'] = generate_report(inputs, rows, img)
+    return out
+
+
+# ==========================================
+# 2. MICRO-BATCHER
+# ==========================================
+class DesignBatcher:
+    """
+    รวมคำขอที่มาถึงภายใน window วินาทีเป็นการเรียก design_batch ครั้งเดียว
+    คำขอแรกเปิดหน้าต่าง คำขอที่ตามมาภายใน window (ไม่เกิน max_batch แผ่น) ไปด้วยกัน
+    design_batch รันใน Thread Pool ของ Event Loop (NumPy ปล่อย GIL ระหว่างคำนวณ)
+    """
+
+    def __init__(self, window=0.002, max_batch=1024, metrics=None):
+        self.window = window
+        self.max_batch = max_batch
+        self.metrics = metrics or Metrics(events=False)
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.slabs = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, slabs):
+        """ส่ง list ของ inputs เข้าคิว รอผลของชุดนั้น (list ตามลำดับเดิม)"""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((slabs, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            size = len(batch[0][0])
+            if size < self.max_batch and self.window > 0:
+                await asyncio.sleep(self.window)
+            while size < self.max_batch and not self.queue.empty():
+                item = self.queue.get_nowait()
+                batch.append(item)
+                size += len(item[0])
+
+            slabs = [inp for items, _ in batch for inp in items]
+            try:
+                with self.metrics.stage("batch"):
+                    results = await loop.run_in_executor(None, design_batch, slabs)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.metrics.incr("batches")
+            self.metrics.incr("slabs", len(slabs))
+            self.batches += 1
+            self.slabs += len(slabs)
+
+            i = 0
+            for items, future in batch:
+                if not future.done():
+                    future.set_result(results[i:i + len(items)])
+                i += len(items)
+
+
+# ==========================================
+# 3. SERVICE (ROUTES)
+# ==========================================
+class DesignService:
+    """
+    Routes ของบริการ (แยกจากชั้น HTTP เพื่อเรียกใช้/ทดสอบได้โดยตรง)
+    render_workers: ขนาด Process Pool สำหรับรูป PNG (0 = วาดใน Thread Pool)
+    """
+
+    def __init__(self, window=0.002, max_batch=1024, render_workers=1):
+        self.metrics = Metrics(events=False)
+        self.batcher = DesignBatcher(window, max_batch, self.metrics)
+        self.render_workers = render_workers
+        self.pool = ProcessPoolExecutor(max_workers=render_workers) if render_workers else None
+        self.started = time.time()
+        self.requests = 0
+        self.in_flight = 0
+
+    async def start(self):
+        self.batcher.start()
+
+    async def close(self):
+        await self.batcher.stop()
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    # --- helpers ---
+    @staticmethod
+    def _parse_slabs(body):
+        """JSON body -> (list ของ inputs, options) หรือ HTTPError 400 (options['many']: ส่งมาเป็น "slabs")"""
+        try:
+            data = json.loads(body or b"null")
+        except ValueError:
+            raise HTTPError(400, "body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "body must be a JSON object")
+        raws = data.get('slabs', [data])
+        if not isinstance(raws, list) or not raws or not all(isinstance(r, dict) for r in raws):
+            raise HTTPError(400, "'slabs' must be a non-empty list of objects")
+
+        slabs = []
+        for i, raw in enumerate(raws):
+            inputs, err = parse_row(raw, i)
+            if err is not None:
+                raise HTTPError(400, f"slab {inputs['slab_id']}: {err}")
+            for k in ('Mu', 'Vu'):
+                if raw.get(k) not in (None, ''):
+                    try:
+                        inputs[k] = float(raw[k])
+                    except (TypeError, ValueError):
+                        raise HTTPError(400, f"slab {inputs['slab_id']}: invalid '{k}'")
+            slabs.append(inputs)
+
+        drawing = data.get('drawing')
+        if drawing not in (None, 'svg', 'png'):
+            raise HTTPError(400, "'drawing' must be 'svg' or 'png'")
+        return slabs, {'drawing': drawing, 'report': bool(data.get('report')), 'many': 'slabs' in data}
+
+    async def _render(self, inputs, drawing, report):
+        loop = asyncio.get_running_loop()
+        executor = self.pool if drawing == 'png' else None
+        with self.metrics.stage(f"render_{drawing}"):
+            return await loop.run_in_executor(executor, render_slab, inputs, drawing, report)
+
+    # --- routes ---
+    async def design(self, body):
+        slabs, opt = self._parse_slabs(body)
+        results = await self.batcher.submit(slabs)
+        if opt['drawing'] or opt['report']:
+            drawing = opt['drawing'] or 'svg'
+            todo = [r for r in results if 'error' not in r]
+            rendered = await asyncio.gather(*(self._render(r['inputs'], drawing, opt['report']) for r in todo),
+                                            return_exceptions=True)
+            for r, extra in zip(todo, rendered):
+                if isinstance(extra, Exception):  # แผ่นที่วาดไม่ได้ไม่ทำให้ทั้งคำขอล้ม
+                    r['error'] = f"render: {type(extra).__name__}: {extra}"
+                else:
+                    r.update(extra)
+        payload = {'slabs': results} if opt['many'] else results[0]
+        return 200, 'application/json', json.dumps(payload, ensure_ascii=False)
+
+    async def report(self, body):
+        slabs, opt = self._parse_slabs(body)
+        if len(slabs) != 1:
+            raise HTTPError(400, "/report takes exactly one slab")
+        result = (await self.batcher.submit(slabs))[0]
+        if 'error' in result:
+            raise HTTPError(400, result['error'])
+        rendered = await self._render(result['inputs'], opt['drawing'] or 'svg', True)
+        return 200, 'text/html; charset=utf-8', rendered['report_html']
+
+    async def health(self, body):
+        b = self.batcher
+        return 200, 'application/json', json.dumps({
+            'status': 'ok', 'pid': os.getpid(), 'uptime_s': round(time.time() - self.started, 3),
+            'requests': self.requests, 'in_flight': self.in_flight, 'queued': b.queue.qsize(),
+            'batches': b.batches, 'slabs': b.slabs,
+            'mean_batch': round(b.slabs / b.batches, 2) if b.batches else 0.0,
+            'window_ms': b.window * 1e3, 'render_workers': self.render_workers,
+        })
+
+    async def prometheus(self, body):
+        return 200, 'text/plain; version=0.0.4', self.metrics.to_prometheus(prefix="slab_service")
+
+    def route(self, method, path):
+        routes = {'/design': ('POST', self.design), '/report': ('POST', self.report),
+                  '/health': ('GET', self.health), '/metrics': ('GET', self.prometheus)}
+        if path not in routes:
+            raise HTTPError(404, f"no route for {path}")
+        allowed, handler = routes[path]
+        if method != allowed:
+            raise HTTPError(405, f"{path} accepts {allowed} only")
+        return handler
+
+    async def handle(self, method, target, body):
+        """คำขอหนึ่งรายการ -> (status, content-type, ข้อความ)"""
+        self.requests += 1
+        self.in_flight += 1
+        try:
+            handler = self.route(method, urlsplit(target).path)
+            return await handler(body)
+        except HTTPError as e:
+            return e.status, 'application/json', json.dumps({'error': str(e)})
+        except Exception as e:
+            self.metrics.incr("errors")
+            return 500, 'application/json', json.dumps({'error': f"{type(e).__name__}: {e}"})
+        finally:
+            self.in_flight -= 1
+
+
+# ==========================================
+# 4. HTTP/1.1 (MINIMAL)
+# ==========================================
+async def _read_request(reader):
+    """อ่านคำขอหนึ่งรายการ คืน (method, target, headers, body) หรือ None เมื่อปิดการเชื่อมต่อ"""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(400, "malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise HTTPError(400, "chunked request bodies are not supported")
+    length = int(headers.get('content-length') or 0)
+    if length > MAX_BODY:
+        raise HTTPError(413, f"body larger than {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length else b''
+    keep_alive = headers.get('connection', '').lower() != 'close' and version != 'HTTP/1.0'
+    return method.upper(), target, keep_alive, body
+
+
+def _response(status, content_type, text, keep_alive):
+    data = text.encode('utf-8')
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + data
+
+
+async def serve(service, host="127.0.0.1", port=8765, ready=None):
+    """รันบริการจนกว่าจะถูกยกเลิก (ready: callback เมื่อเปิดพอร์ตแล้ว)"""
+
+    async def on_connect(reader, writer):
+        try:
+            while True:
+                try:
+                    req = await _read_request(reader)
+                except HTTPError as e:
+                    writer.write(_response(e.status, 'application/json', json.dumps({'error': str(e)}), False))
+                    break
+                except (ValueError, asyncio.IncompleteReadError):
+                    break
+                if req is None:
+                    break
+                method, target, keep_alive, body = req
+                status, content_type, text = await service.handle(method, target, body)
+                writer.write(_response(status, content_type, text, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    await service.start()
+    server = await asyncio.start_server(on_connect, host, port, backlog=1024)
+    if ready:
+        ready(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON design service for one-way slabs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--window-ms", type=float, default=2.0,
+                        help="batching window: requests arriving within it share one vectorized call")
+    parser.add_argument("--max-batch", type=int, default=1024, help="max slabs per vectorized call")
+    parser.add_argument("--render-workers", type=int, default=1,
+                        help="process pool size for PNG drawings (0 = render in threads)")
+    args = parser.parse_args(argv)
+
+    service = DesignService(args.window_ms / 1e3, args.max_batch, args.render_workers)
+
+    def ready(server):
+        addr = server.sockets[0].getsockname()
+        print(f"slab service listening on http://{addr[0]}:{addr[1]} "
+              f"(window {args.window_ms:g} ms, {args.render_workers} render workers)", file=sys.stderr, flush=True)
+
+    try:
+        asyncio.run(serve(service, args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
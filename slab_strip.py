@@ -0,0 +1,372 @@
+"""
+RC One-Way Slab Design - Continuous Strip Analysis
+
+วิเคราะห์แถบพื้นต่อเนื่องหลายช่วง (ความยาวแต่ละช่วงไม่เท่ากันได้) ด้วยสมการสามโมเมนต์
+ระบบสมการเป็น Tridiagonal จึงแก้ด้วย Thomas Algorithm แบบ O(n)
+(หลายพันช่วงใช้เวลาระดับมิลลิวินาที)
+
+หน่วย: ความยาว m, น้ำหนักแผ่ kg/m (ต่อแถบกว้าง 1 m), โมเมนต์ kg-m, แรงเฉือน kg
+เครื่องหมาย: โมเมนต์บวก = ท้องช่วง (Sagging), ลบ = ที่จุดรองรับ (Hogging)
+EI คงที่ตลอดแถบ
+"""
+import numpy as np
+
+from slab_core import SUPPORT_BY_CONTINUITY, design_slab
+
+END_CONDITIONS = ('pinned', 'fixed')
+
+
+# ==========================================
+# 1. THREE-MOMENT ANALYSIS
+# ==========================================
+def solve_tridiagonal(lower, diag, upper, rhs):
+    """
+    แก้ระบบ Tridiagonal ด้วย Thomas Algorithm (O(n))
+    lower[i] คูณ x[i-1], upper[i] คูณ x[i+1] (lower[0], upper[-1] ไม่ถูกใช้)
+    rhs: (n,) หรือ (n, k) สำหรับหลาย Load Case พร้อมกัน
+    """
+    n = diag.size
+    c = np.empty(n)
+    d = np.array(rhs, dtype=float)
+    b0 = diag[0]
+    c[0] = upper[0] / b0
+    d[0] = d[0] / b0
+    for i in range(1, n):
+        m = diag[i] - lower[i] * c[i - 1]
+        c[i] = upper[i] / m if i < n - 1 else 0.0
+        d[i] = (d[i] - lower[i] * d[i - 1]) / m
+    for i in range(n - 2, -1, -1):
+        d[i] -= c[i] * d[i + 1]
+    return d
+
+
+def _check_strip(L, left, right, left_overhang, right_overhang):
+    if L.size == 0 or np.any(L <= 0):
+        raise ValueError("spans must be a non-empty list of positive lengths")
+    if left not in END_CONDITIONS or right not in END_CONDITIONS:
+        raise ValueError(f"end conditions must be one of {END_CONDITIONS}")
+    if (left == 'fixed' and left_overhang) or (right == 'fixed' and right_overhang):
+        raise ValueError("an overhang needs a pinned end support")
+
+
+def _system(L, left, right):
+    """
+    สัมประสิทธิ์ Tridiagonal ของสมการสามโมเมนต์ (n+1 แถว ตัวแปร M_0..M_n)
+    คืน (lower, diag, upper, known) โดย known คือ mask ของปลาย 'pinned' ที่ค่าโมเมนต์ถูกกำหนดไว้
+    """
+    n = L.size
+    lower = np.zeros(n + 1)
+    diag = np.ones(n + 1)
+    upper = np.zeros(n + 1)
+
+    # Interior supports: L_i M_{i-1} + 2(L_i + L_{i+1}) M_i + L_{i+1} M_{i+1} = -(w_i L_i³ + w_{i+1} L_{i+1}³)/4
+    lower[1:n] = L[:-1]
+    diag[1:n] = 2 * (L[:-1] + L[1:])
+    upper[1:n] = L[1:]
+
+    # ปลายยึดแน่น = ช่วงสมมติความยาวศูนย์: 2 L_1 M_0 + L_1 M_1 = -w_1 L_1³/4
+    known = np.array([left == 'pinned', right == 'pinned'])
+    if not known[0]:
+        diag[0], upper[0] = 2 * L[0], L[0]
+    if not known[1]:
+        lower[n], diag[n] = L[-1], 2 * L[-1]
+    return lower, diag, upper, known
+
+
+def _load_terms(L, w):
+    """ค่า -w·L³/4 ที่แต่ละจุดรองรับ (รวมจากช่วงซ้ายและขวา) รองรับ w แบบ (n,) หรือ (n, k)"""
+    term = (w.T * L ** 3 / 4).T
+    rhs = np.zeros((L.size + 1,) + w.shape[1:])
+    rhs[:-1] -= term
+    rhs[1:] -= term
+    return rhs
+
+
+def support_moments(spans, w, left='pinned', right='pinned', left_overhang=0.0, right_overhang=0.0,
+                    w_overhang=None):
+    """
+    โมเมนต์ที่จุดรองรับทั้ง n+1 จุด จากสมการสามโมเมนต์
+    w: น้ำหนักต่อช่วง (n,) หรือหลาย Load Case (n, k)
+    ปลาย 'pinned' ที่มีช่วงยื่น (overhang) ใช้โมเมนต์ปลาย -w·a²/2
+    """
+    L = np.asarray(spans, dtype=float).reshape(-1)
+    w = np.asarray(w, dtype=float)
+    if w.ndim == 0:
+        w = np.full(L.size, float(w))
+    _check_strip(L, left, right, left_overhang, right_overhang)
+
+    w_oh = (w[0], w[-1]) if w_overhang is None else w_overhang
+    M_l = -w_oh[0] * left_overhang ** 2 / 2
+    M_r = -w_oh[1] * right_overhang ** 2 / 2
+
+    lower, diag, upper, known = _system(L, left, right)
+    rhs = _load_terms(L, w)
+    if known[0]:
+        rhs[0] = M_l
+    if known[1]:
+        rhs[-1] = M_r
+    return solve_tridiagonal(lower, diag, upper, rhs)
+
+
+def span_actions(spans, w, M):
+    """
+    โมเมนต์/แรงเฉือนในแต่ละช่วงจากโมเมนต์ที่จุดรองรับ M (n+1,)
+    คืน dict ของ Array (n,)
+    """
+    L = np.asarray(spans, dtype=float).reshape(-1)
+    w = np.broadcast_to(np.asarray(w, dtype=float), L.shape)
+    M_L, M_R = M[:-1], M[1:]
+    V_L = w * L / 2 + (M_R - M_L) / L
+    V_R = w * L / 2 - (M_R - M_L) / L
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_pos = np.clip(np.where(w > 0, V_L / w, L / 2), 0, L)
+    return {
+        'M_left': M_L, 'M_right': M_R,
+        'M_mid': M_L + V_L * L / 2 - w * L ** 2 / 8,
+        'M_pos': M_L + V_L * x_pos - w * x_pos ** 2 / 2, 'x_pos': x_pos,
+        'V_left': V_L, 'V_right': V_R,
+    }
+
+
+def analyze_strip(spans, w, left='pinned', right='pinned', left_overhang=0.0, right_overhang=0.0):
+    """
+    วิเคราะห์แถบพื้นต่อเนื่อง
+
+    spans: ความยาวแต่ละช่วง (m), w: น้ำหนักประลัย (kg/m) ต่อช่วงหรือค่าเดียว
+    left/right: 'pinned' หรือ 'fixed', *_overhang: ความยาวช่วงยื่นที่ปลาย (m)
+    คืน dict: support_moments (n+1,), M_left, M_right, M_mid, M_pos, x_pos, V_left, V_right,
+              Mu (max |M-|, M+), Vu (max แรงเฉือนปลายช่วง) ต่อช่วง
+    """
+    L = np.asarray(spans, dtype=float).reshape(-1)
+    w = np.broadcast_to(np.asarray(w, dtype=float), L.shape).astype(float)
+    M = support_moments(L, w, left, right, left_overhang, right_overhang)
+    out = span_actions(L, w, M)
+    out['support_moments'] = M
+    out['Mu'] = np.maximum(np.maximum(-out['M_left'], -out['M_right']), np.maximum(out['M_pos'], 0.0))
+    out['Vu'] = np.maximum(np.abs(out['V_left']), np.abs(out['V_right']))
+    if left_overhang:
+        out['Vu'][0] = max(out['Vu'][0], w[0] * left_overhang)
+    if right_overhang:
+        out['Vu'][-1] = max(out['Vu'][-1], w[-1] * right_overhang)
+    return out
+
+
+# ==========================================
+# 2. PATTERN LIVE LOAD (INFLUENCE COEFFICIENTS)
+# ==========================================
+POINT_FRACTIONS = np.linspace(0.0, 1.0, 11)  # จุดเลือกรูปแบบ Live Load สำหรับโมเมนต์บวกในช่วง รวมปลายช่วง (x/L)
+
+
+INFLUENCE_TOL = 1e-13  # ตัดสัมประสิทธิ์อิทธิพลที่เล็กกว่า tol เท่าของค่าสูงสุดของตำแหน่งบรรทุกเดียวกัน
+
+
+def _reach(decay, tol):
+    """
+    จำนวนแถวมากที่สุด (นับแถวเริ่ม) ที่ต้องเดินตามลำดับของ decay จากจุดเริ่มใด ๆ
+    จนผลคูณของตัวลดทอนต่อแถวไม่เกิน tol
+    """
+    S = np.concatenate([[0.0], np.cumsum(np.log(np.maximum(decay, 1e-300)))])  # ไม่เพิ่มขึ้น
+    end = np.searchsorted(-S, -(S[:-1] + np.log(tol)), side='left')
+    return int((np.minimum(end, decay.size) - np.arange(decay.size)).max())
+
+
+def influence_coefficients(spans, left='pinned', right='pinned', left_overhang=0.0, right_overhang=0.0,
+                           tol=INFLUENCE_TOL):
+    """
+    โมเมนต์ที่จุดรองรับจากน้ำหนักแผ่ 1 kg/m บนแต่ละตำแหน่งบรรทุก เก็บเป็น Band รอบตำแหน่งนั้น
+    ตำแหน่งบรรทุก j = ช่วง 0..n-1 ตามด้วยช่วงยื่นซ้าย และช่วงยื่นขวา (m = n + 2)
+
+    ระบบสามโมเมนต์เป็น Diagonally dominant ผลของน้ำหนักจึงลดลงแบบเรขาคณิตเมื่อห่างออกไป
+    (ต่อหนึ่งจุดรองรับ: < 2/3 ไปทางขวา, < 1/2 ไปทางซ้าย, ≈ 0.27 เมื่อช่วงยาวเท่ากัน)
+    ความกว้าง Band หาจากตัวลดทอนจริงของ Thomas Algorithm ให้ค่าที่ตัดทิ้งไม่เกิน tol เท่าของค่าสูงสุด
+    จึงไม่เกินราว 120 จุดรองรับไม่ว่าแถบจะยาวเท่าไร (หน่วยความจำและเวลา O(n))
+
+    คืน dict: rows (m, T) หมายเลขจุดรองรับของแต่ละช่อง, M (m, T) โมเมนต์ (ช่องที่อยู่นอก 0..n มีค่า 0),
+              offset: ตำแหน่งใน Band ของจุดรองรับซ้ายของช่วงที่บรรทุก, V_overhang (2, m)
+    """
+    L = np.asarray(spans, dtype=float).reshape(-1)
+    _check_strip(L, left, right, left_overhang, right_overhang)
+    n = L.size
+    N, m = n + 1, n + 2
+    lower, diag, upper, known = _system(L, left, right)
+
+    # Thomas Algorithm: ตัวหาร (pivot) และตัวคูณย้อนกลับ c ใช้ร่วมกันทุกตำแหน่งบรรทุก
+    piv = np.empty(N)
+    c = np.empty(N)
+    piv[0] = diag[0]
+    c[0] = upper[0] / diag[0]
+    for i in range(1, N):
+        piv[i] = diag[i] - lower[i] * c[i - 1]
+        c[i] = upper[i] / piv[i]
+    K = min(N, 2 + _reach(lower / piv, tol))  # แถวจากจุดเริ่ม (RHS 2 แถวแรก) ไปทางขวา
+    U = min(N - 1, _reach(c[::-1], tol))  # แถวเหนือจุดเริ่มจากการแทนค่าย้อนกลับ
+
+    # RHS ของน้ำหนัก 1 kg/m: -L³/4 ที่สองจุดรองรับของช่วง (ปลาย pinned กำหนดค่าโมเมนต์แทน)
+    first = np.concatenate([np.arange(n), [0, n]])
+    rhs0, rhs1 = np.zeros(m), np.zeros(m)
+    rhs0[:n] = rhs1[:n] = -L ** 3 / 4
+    if known[0]:
+        rhs0[0] = 0.0
+        rhs0[n] = -left_overhang ** 2 / 2
+    if known[1]:
+        rhs1[n - 1] = 0.0
+        rhs0[n + 1] = -right_overhang ** 2 / 2
+
+    d = np.zeros((m, K))
+    prev = np.zeros(m)
+    for k in range(K):
+        i = first + k
+        ic = np.minimum(i, N - 1)
+        r = rhs0 if k == 0 else rhs1 if k == 1 else 0.0
+        prev = np.where(i < N, (r - lower[ic] * prev) / piv[ic], 0.0)
+        d[:, k] = prev
+
+    T = U + K
+    M = np.zeros((m, T))
+    nxt = np.zeros(m)
+    for t in range(T - 1, -1, -1):
+        i = first - U + t
+        ic = np.clip(i, 0, N - 1)
+        dt = d[:, t - U] if t >= U else 0.0
+        nxt = np.where((i >= 0) & (i < N), dt - c[ic] * nxt, 0.0)
+        M[:, t] = nxt
+
+    w_oh = np.zeros((2, m))
+    w_oh[0, n], w_oh[1, n + 1] = 1.0, 1.0
+    return {
+        'rows': first[:, None] - U + np.arange(T), 'M': M, 'offset': U,
+        'V_overhang': w_oh * np.array([[left_overhang], [right_overhang]]),
+    }
+
+
+def _sum_by(index, values, size):
+    """ผลรวมของ values ตามหมายเลข index (Band -> ต่อจุดรองรับ/ต่อช่วง)"""
+    return np.bincount(index.ravel(), values.ravel(), minlength=size)
+
+
+def pattern_envelope(spans, w_dead, w_live, left='pinned', right='pinned', left_overhang=0.0,
+                     right_overhang=0.0, influence=None):
+    """
+    Envelope ของโมเมนต์/แรงเฉือนภายใต้ Pattern Live Load (ACI: Live Load วางเฉพาะบางช่วง)
+
+    w_dead: น้ำหนักประลัยคงที่ (เช่น 1.2D) วางทุกช่วง, w_live: น้ำหนักจร (เช่น 1.6L) เลือกวาง/ไม่วางรายช่วง
+    ค่าต่อช่วงหรือค่าเดียว (ช่วงยื่นใช้ค่าของช่วงปลายที่ติดกัน)
+    การซ้อนทับเป็นเชิงเส้น ผลรวมของพจน์บวก (หรือลบ) ทั้งหมดจึงเป็นค่าสูงสุด (ต่ำสุด) จริงจากทุก 2^m รูปแบบ
+    influence: ผลจาก influence_coefficients (ใช้ซ้ำได้เมื่อความยาวช่วงไม่เปลี่ยน)
+
+    คืน dict: support_moments (ลบที่สุด, n+1), support_moments_max, M_pos (n), V_left, V_right, Mu, Vu
+    """
+    L = np.asarray(spans, dtype=float).reshape(-1)
+    n = L.size
+    if influence is None:
+        influence = influence_coefficients(L, left, right, left_overhang, right_overhang)
+
+    def loads(w):
+        w = np.broadcast_to(np.asarray(w, dtype=float), L.shape)
+        return np.concatenate([w, [w[0], w[-1]]])
+
+    wd, wl = loads(w_dead), loads(w_live)
+    # Dead Load วางทุกช่วง: วิเคราะห์ตรงครั้งเดียว, Live Load: ผลรวมพจน์บวก/ลบจาก Band
+    dead = analyze_strip(L, wd[:n], left, right, left_overhang, right_overhang)
+    rows, Mb, t0 = influence['rows'], influence['M'], influence['offset']
+    live = Mb * wl[:, None]
+    rc = np.clip(rows, 0, n)
+    M_min = dead['support_moments'] + _sum_by(rc, np.minimum(live, 0), n + 1)
+    M_max = dead['support_moments'] + _sum_by(rc, np.maximum(live, 0), n + 1)
+
+    # ค่าในช่วง s จากโมเมนต์ที่จุดรองรับซ้าย/ขวา (ช่องติดกันใน Band)
+    s = rows[:, :-1]
+    inside = (s >= 0) & (s < n)
+    sc = np.clip(s, 0, n - 1)
+    Ls = L[sc]
+    own = inside & (s == np.arange(n + 2)[:, None])  # น้ำหนักบนช่วงตัวเอง
+    M1, M2 = Mb[:, :-1] * inside, Mb[:, 1:] * inside
+    dM = (M2 - M1) / Ls
+    V1 = own * Ls / 2 + dM
+    V2 = own * Ls / 2 - dM
+    wl_col = wl[:, None]
+
+    def span_envelope(coef, base):
+        v = coef * wl_col
+        return base + _sum_by(sc, np.minimum(v, 0), n), base + _sum_by(sc, np.maximum(v, 0), n)
+
+    VL_min, VL_max = span_envelope(V1, dead['V_left'])
+    VR_min, VR_max = span_envelope(V2, dead['V_right'])
+    V_left = np.maximum(np.abs(VL_min), np.abs(VL_max))
+    V_right = np.maximum(np.abs(VR_min), np.abs(VR_max))
+
+    # โมเมนต์บวก: รูปแบบที่ให้ค่าสูงสุด ณ แต่ละจุด POINT_FRACTIONS เป็นรูปแบบผู้สมัคร
+    # แต่ละรูปแบบคำนวณโมเมนต์ที่จุดแรงเฉือนเป็นศูนย์ x = V_left / w (จำกัดอยู่ในช่วง) แทนการอ่านค่าที่จุดคงที่
+    Md_L, Md_R = dead['M_left'], dead['M_right']
+    ML_live, VL_live = M1 * wl_col, V1 * wl_col
+    M_pos = np.full(n, -np.inf)
+    for xi in POINT_FRACTIONS:
+        x = xi * Ls
+        v = (M1 * (1 - xi) + M2 * xi + own * x * (Ls - x) / 2) * wl_col
+        on = v > 0  # ตำแหน่งที่วาง Live Load ของรูปแบบนี้
+        xs = xi * L
+        M_point = Md_L * (1 - xi) + Md_R * xi + wd[:n] * xs * (L - xs) / 2 + _sum_by(sc, v * on, n)
+        M_L = Md_L + _sum_by(sc, ML_live * on, n)
+        V_L = dead['V_left'] + _sum_by(sc, VL_live * on, n)
+        w = wd[:n] + wl[:n] * on[np.arange(n), t0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x0 = np.clip(np.where(w > 0, V_L / w, 0.0), 0, L)
+        M_pos = np.maximum(M_pos, np.maximum(M_L + V_L * x0 - w * x0 * x0 / 2, M_point))
+
+    Vu = np.maximum(V_left, V_right)
+    V_oh = influence['V_overhang'] @ (wd + wl)
+    Vu[0] = max(Vu[0], V_oh[0])
+    Vu[-1] = max(Vu[-1], V_oh[1])
+    Mu = np.maximum(np.maximum(-M_min[:-1], -M_min[1:]), np.maximum(M_pos, 0.0))
+    return {
+        'support_moments': M_min, 'support_moments_max': M_max, 'M_pos': M_pos,
+        'V_left': V_left, 'V_right': V_right, 'Mu': Mu, 'Vu': Vu, 'spans': n,
+    }
+
+
+# ==========================================
+# 3. DESIGN INPUTS
+# ==========================================
+def factored_loads(inputs):
+    """(1.2D, 1.6L) kg/m ตามสูตรเดียวกับ design_slab"""
+    return 1.2 * (2400 * (inputs['h'] / 100) + inputs['sdl']), 1.6 * inputs['ll']
+
+
+def factored_load(inputs):
+    """wu (kg/m) ตามสูตรเดียวกับ design_slab: 1.2(2400·h/100 + SDL) + 1.6LL"""
+    return sum(factored_loads(inputs))
+
+
+def span_support_types(n, left='pinned', right='pinned'):
+    """ชนิดจุดรองรับของแต่ละช่วงสำหรับตาราง h_min (จำนวนปลายที่ต่อเนื่อง)"""
+    cont_left = np.ones(n, dtype=bool)
+    cont_right = np.ones(n, dtype=bool)
+    cont_left[0] = left == 'fixed'
+    cont_right[-1] = right == 'fixed'
+    return [SUPPORT_BY_CONTINUITY[int(a) + int(b)] for a, b in zip(cont_left, cont_right)]
+
+
+def strip_design_inputs(base_inputs, spans, left='pinned', right='pinned', analysis=None, pattern=True):
+    """
+    inputs ของแต่ละช่วงพร้อม Mu / Vu จากการวิเคราะห์แถบ (พร้อมส่งให้ design_slab หรือ Batch Engine)
+    base_inputs: ค่าร่วมของแถบ (h, cover, fc, fy, sdl, ll, Ly, mainBar, tempBar, ...)
+    analysis: ผลจาก analyze_strip / pattern_envelope (ถ้าไม่ระบุจะวิเคราะห์จาก base_inputs)
+    pattern: True = Envelope ของ Pattern Live Load, False = Live Load เต็มทุกช่วง
+    """
+    L = np.asarray(spans, dtype=float).reshape(-1)
+    if analysis is None:
+        if pattern:
+            analysis = pattern_envelope(L, *factored_loads(base_inputs), left, right)
+        else:
+            analysis = analyze_strip(L, factored_load(base_inputs), left, right)
+    label = "Pattern LL envelope" if 'support_moments_max' in analysis else "Strip analysis"
+    supports = span_support_types(L.size, left, right)
+    slab_id = base_inputs.get('slab_id', 'S')
+    return [dict(base_inputs, slab_id=f"{slab_id}/{i + 1}", Lx=float(L[i]), support=supports[i],
+                 Mu=float(analysis['Mu'][i]), Vu=float(analysis['Vu'][i]), analysis=label)
+            for i in range(L.size)]
+
+
+def design_strip(base_inputs, spans, left='pinned', right='pinned', pattern=True):
+    """ออกแบบทุกช่วงของแถบต่อเนื่อง คืน list ของ SlabDesign"""
+    return [design_slab(inp) for inp in strip_design_inputs(base_inputs, spans, left, right, pattern=pattern)]
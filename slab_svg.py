@@ -0,0 +1,187 @@
+"""
+RC One-Way Slab Design - SVG Section Drawing
+
+วาดรูปหน้าตัดเดียวกับ plot_slab_section เป็น SVG string โดยตรง (ไม่ใช้ matplotlib)
+ส่วนที่ไม่ขึ้นกับ Input (คาน, พื้น, เหล็ก, เหล็กกันร้าว) สร้างเป็น Template ครั้งเดียวต่อรูปแบบ
+ทุกครั้งที่วาดจึงเติมเฉพาะข้อความ ใช้เวลาไม่ถึง 1 ms และฝังใน generate_report ได้ทันที
+id ของ <defs> (hatch, ลูกศร) มี Prefix ต่อรูป รายงานรวมที่ฝังหลายรูปในหน้าเดียวจึงไม่มี id ซ้ำ
+"""
+import base64
+import hashlib
+from html import escape
+
+SCALE = 150.0  # px ต่อ 1 หน่วยของรูป (ใกล้เคียงรูป matplotlib ขนาด 10x5 นิ้ว)
+PAD = 0.15
+
+# Geometry เดียวกับ plot_slab_section
+SLAB_H_DRAW = 0.4
+BEAM_W = 0.4
+BEAM_D = 0.8
+COVER_VISUAL = 0.05
+CONCRETE_COLOR = '#f0f0f0'
+
+_templates = {}
+_ID = "@id@"  # ตำแหน่งของ Prefix ใน Template (แทนที่ตอนวาด)
+
+
+def _x(x):
+    return f"{x * SCALE:.1f}"
+
+
+def _y(y):
+    return f"{-y * SCALE:.1f}"  # แกน y ของ SVG ชี้ลง
+
+
+def _rect(x, y, w, h, fill, hatch=False):
+    fill_attr = f"url(#{_ID}hatch)" if hatch else fill
+    return (f'<rect x="{_x(x)}" y="{_y(y + h)}" width="{w * SCALE:.1f}" height="{h * SCALE:.1f}" '
+            f'fill="{fill_attr}" stroke="black" stroke-width="1"/>')
+
+
+def _polyline(pts, color='blue', width=4):
+    p = " ".join(f"{_x(x)},{_y(y)}" for x, y in pts)
+    return f'<polyline points="{p}" fill="none" stroke="{color}" stroke-width="{width}"/>'
+
+
+def _circle(cx, cy, r=0.03, color='red'):
+    return f'<circle cx="{_x(cx)}" cy="{_y(cy)}" r="{r * SCALE:.1f}" fill="{color}"/>'
+
+
+def _text(x, y, text, anchor='middle', baseline='auto', size=14, color='black', bold=False, bg=False):
+    weight = ' font-weight="bold"' if bold else ''
+    halo = ' stroke="white" stroke-width="5" paint-order="stroke"' if bg else ''
+    return (f'<text x="{_x(x)}" y="{_y(y)}" text-anchor="{anchor}" dominant-baseline="{baseline}" '
+            f'font-size="{size}" fill="{color}"{weight}{halo}>{escape(text)}</text>')
+
+
+def _arrow(x1, y1, x2, y2, color='black', width=1.3, both=False):
+    """เส้นลูกศรจาก (x1,y1) ชี้ไปที่ (x2,y2)"""
+    start = f' marker-start="url(#{_ID}arr-{color})"' if both else ''
+    return (f'<line x1="{_x(x1)}" y1="{_y(y1)}" x2="{_x(x2)}" y2="{_y(y2)}" stroke="{color}" '
+            f'stroke-width="{width}"{start} marker-end="url(#{_ID}arr-{color})"/>')
+
+
+def _draw_dim(x1, y1, x2, y2, text, offset_y=0, offset_x=0):
+    """เส้นบอกระยะ (เทียบเท่า draw_dim ของ plot_slab_section)"""
+    d_x1, d_y1 = x1 + offset_x, y1 + offset_y
+    d_x2, d_y2 = x2 + offset_x, y2 + offset_y
+    out = [
+        _arrow(d_x1, d_y1, d_x2, d_y2, both=True),
+        f'<line x1="{_x(x1)}" y1="{_y(y1)}" x2="{_x(d_x1)}" y2="{_y(d_y1)}" stroke="black" '
+        f'stroke-width="0.7" stroke-dasharray="4,3"/>',
+        f'<line x1="{_x(x2)}" y1="{_y(y2)}" x2="{_x(d_x2)}" y2="{_y(d_y2)}" stroke="black" '
+        f'stroke-width="0.7" stroke-dasharray="4,3"/>',
+    ]
+    mid_x = (d_x1 + d_x2) / 2
+    mid_y = (d_y1 + d_y2) / 2
+    if abs(y2 - y1) < abs(x2 - x1):  # Horizontal
+        out.append(_text(mid_x, mid_y + 0.05, text, baseline='text-after-edge', size=15, bold=True, bg=True))
+    else:  # Vertical
+        out.append(_text(mid_x - 0.05, mid_y, text, anchor='end', baseline='central', size=15, bold=True, bg=True))
+    return "".join(out)
+
+
+def _defs():
+    markers = "".join(
+        f'<marker id="{_ID}arr-{c}" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" markerHeight="8" '
+        f'orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10 z" fill="{c}"/></marker>'
+        for c in ('black', 'blue', 'red'))
+    hatch = (f'<pattern id="{_ID}hatch" width="8" height="8" patternUnits="userSpaceOnUse" '
+             'patternTransform="rotate(-45)"><rect width="8" height="8" fill="white"/>'
+             '<line x1="0" y1="0" x2="0" y2="8" stroke="black" stroke-width="1"/></pattern>')
+    return f"<defs>{markers}{hatch}</defs>"
+
+
+def _template(support_type):
+    """ส่วนคงที่ของรูป + ค่าตำแหน่งที่ใช้วางข้อความ (สร้างครั้งเดียวต่อรูปแบบ)"""
+    layout = "cantilever" if support_type == "Cantilever" else "span"
+    if layout in _templates:
+        return _templates[layout]
+
+    parts = []
+    if layout == "cantilever":
+        slab_len_draw = 3.0
+        parts.append(_rect(-BEAM_W, -BEAM_D, BEAM_W, BEAM_D, 'white', hatch=True))
+        parts.append(_rect(0, -SLAB_H_DRAW, slab_len_draw, SLAB_H_DRAW, CONCRETE_COLOR))
+
+        bar_y = -COVER_VISUAL
+        end_x = slab_len_draw - COVER_VISUAL
+        parts.append(_polyline([(-BEAM_W / 2, bar_y), (end_x, bar_y), (end_x, bar_y - 0.2)]))
+
+        dist_y = bar_y - 0.05
+        spacing_draw = 0.3
+        for i in range(int(slab_len_draw / spacing_draw)):
+            cx = (i * spacing_draw) + 0.2
+            if cx < slab_len_draw:
+                parts.append(_circle(cx, dist_y))
+
+        parts.append(_text(-BEAM_W / 2, -BEAM_D - 0.2, "Support"))
+        bounds = (-BEAM_W - PAD, -BEAM_D - 0.45 - PAD, slab_len_draw + 0.5 + PAD, 0.45 + PAD)
+        geo = dict(slab_len_draw=slab_len_draw, bar_y=bar_y, dist_y=dist_y)
+    else:
+        slab_len_draw = 5.0
+        parts.append(_rect(-BEAM_W, -BEAM_D, BEAM_W, BEAM_D, 'white', hatch=True))
+        parts.append(_rect(slab_len_draw, -BEAM_D, BEAM_W, BEAM_D, 'white', hatch=True))
+        parts.append(_rect(0, -SLAB_H_DRAW, slab_len_draw, SLAB_H_DRAW, CONCRETE_COLOR))
+
+        bar_y = -SLAB_H_DRAW + COVER_VISUAL + 0.02
+        parts.append(_polyline([(0.1, bar_y + 0.15), (0.1, bar_y), (slab_len_draw - 0.1, bar_y),
+                                (slab_len_draw - 0.1, bar_y + 0.15)]))
+
+        dist_y = bar_y + 0.05
+        spacing_draw = 0.3
+        for i in range(1, int(slab_len_draw / spacing_draw)):
+            parts.append(_circle(i * spacing_draw, dist_y))
+
+        bounds = (-BEAM_W - PAD, -BEAM_D - 0.1 - PAD, slab_len_draw + BEAM_W + 0.6 + PAD, 0.35 + PAD)
+        geo = dict(slab_len_draw=slab_len_draw, bar_y=bar_y, dist_y=dist_y)
+
+    x0, y0, x1, y1 = bounds
+    width, height = (x1 - x0) * SCALE, (y1 - y0) * SCALE
+    head = (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{x0 * SCALE:.1f} {-y1 * SCALE:.1f} '
+            f'{width:.1f} {height:.1f}" width="{width:.0f}" height="{height:.0f}" '
+            f'font-family="Sarabun, sans-serif">{_defs()}')
+    _templates[layout] = (layout, head + "".join(parts), geo)
+    return _templates[layout]
+
+
+def figure_id(*parts):
+    """Prefix ของ id ใน SVG จากค่าใด ๆ (ค่าเดียวกันได้ Prefix เดียวกันทุกครั้ง)"""
+    return "f" + hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:10] + "-"
+
+
+def render_section_svg(h_cm, cover_cm, main_key, s_main, temp_key, s_temp, support_type, Lx_real, id_prefix=None):
+    """
+    รูปหน้าตัดพื้นเป็น SVG string (พารามิเตอร์เดียวกับ plot_slab_section)
+    id_prefix: Prefix ของ id ใน <defs> (ค่าเริ่มต้น = figure_id ของพารามิเตอร์ รูปเดียวกันจึงได้ SVG เดียวกัน)
+               รายงานรวมที่อาจมีรูปซ้ำกันควรส่งค่าที่ไม่ซ้ำต่อแผ่น
+    """
+    if id_prefix is None:
+        id_prefix = figure_id(h_cm, cover_cm, main_key, s_main, temp_key, s_temp, support_type, Lx_real)
+    layout, static, g = _template(support_type)
+    L = g['slab_len_draw']
+    parts = [static]
+
+    if layout == "cantilever":
+        parts.append(_draw_dim(0, -SLAB_H_DRAW, L, -SLAB_H_DRAW, f"L = {Lx_real:.2f} m", offset_y=-0.3))
+        parts.append(_draw_dim(L, 0, L, -SLAB_H_DRAW, f"t = {h_cm:.0f} cm", offset_x=0.3))
+        parts.append(_arrow(L / 2, 0.3, L / 2, g['bar_y'], color='blue'))
+        parts.append(_text(L / 2, 0.3, f"{main_key}@{s_main:.0f}cm (Top)", baseline='text-after-edge',
+                           color='blue', bold=True))
+    else:
+        parts.append(_draw_dim(0, -BEAM_D, L, -BEAM_D, f"L = {Lx_real:.2f} m"))
+        parts.append(_draw_dim(L + BEAM_W, 0, L + BEAM_W, -SLAB_H_DRAW, f"t = {h_cm:.0f} cm", offset_x=0.2))
+        parts.append(_arrow(L / 2, -SLAB_H_DRAW - 0.4, L / 2, g['bar_y'], color='blue'))
+        parts.append(_text(L / 2, -SLAB_H_DRAW - 0.4, f"{main_key}@{s_main:.0f}cm (Btm)",
+                           baseline='text-before-edge', color='blue', bold=True, bg=True))
+        parts.append(_arrow(L / 2 + 1.0, 0.2, L / 2 + 0.2, g['dist_y'], color='red'))
+        parts.append(_text(L / 2 + 1.0, 0.2, f"Temp: {temp_key}@{s_temp:.0f}cm", baseline='text-after-edge',
+                           color='red', bold=True))
+
+    parts.append("</svg>")
+    return "".join(parts).replace(_ID, id_prefix)
+
+
+def svg_to_data_uri(svg):
+    """แปลง SVG เป็น data URI สำหรับใช้กับ <img src=...>"""
+    return f"data:image/svg+xml;base64,{base64.b64encode(svg.encode('utf-8')).decode()}"
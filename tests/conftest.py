@@ -0,0 +1,5 @@
+"""ให้ pytest import โมดูล slab_* ที่อยู่ที่ราก Repository ได้"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
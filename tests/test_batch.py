@@ -0,0 +1,68 @@
+"""Batch Engine (slab_batch) ต้องให้ค่าตรงกับ design_slab ทุกบิต"""
+import math
+import random
+
+import numpy as np
+import pytest
+
+from slab_batch import BATCH_FIELDS, process_slab_batch
+from slab_core import BAR_INFO, design_slab
+
+SUPPORTS = ("Simply Supported", "Continuous (One End)", "Continuous (Both)", "Cantilever")
+NUMERIC = ('ratio', 'w_dead', 'wu', 'Mu', 'd', 'Rn', 'rho_req', 'As_req', 's_main', 'As_prov_main',
+           'As_req_long', 's_temp', 'As_prov_temp', 'Vu', 'phi_Vc', 'h_min', 'Icr', 'Ie', 'delta_ll', 'delta_lt')
+STATUSES = ('status_type', 'status_flex', 'status_shear', 'status_defl', 'status_final')
+
+
+def _random_schedule(n, seed):
+    rnd = random.Random(seed)
+    bars = list(BAR_INFO)
+    return [{'Lx': rnd.uniform(0.5, 8.0), 'Ly': rnd.uniform(1.0, 15.0), 'h': rnd.choice((8, 10, 12, 15, 20)),
+             'cover': rnd.choice((2, 2.5, 3)), 'fc': rnd.choice((180, 240, 280, 320)),
+             'fy': rnd.choice((2400, 3000, 4000)), 'sdl': rnd.uniform(0, 400), 'll': rnd.choice((200, 300, 500, 1000)),
+             'support': rnd.choice(SUPPORTS), 'mainBar': rnd.choice(bars), 'tempBar': rnd.choice(bars)}
+            for _ in range(n)]
+
+
+def _same(a, b):
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+def _assert_matches(schedule, res):
+    for i, inp in enumerate(schedule):
+        d = design_slab(inp)
+        for k in NUMERIC:
+            assert _same(getattr(d, k), float(res[k][i])), (i, k)
+        for k in STATUSES:
+            assert int(getattr(d, k)) == int(res[k][i]), (i, k)
+        assert d.spacing_ok == bool(res['spacing_ok'][i])
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_batch_matches_scalar(seed):
+    schedule = _random_schedule(1500, seed)
+    res = process_slab_batch({k: [inp[k] for inp in schedule] for k in BATCH_FIELDS})
+    _assert_matches(schedule, res)
+
+
+def test_zero_spacing_is_a_fail_not_an_exception():
+    # RB6 ยื่น 6 m: ระยะเหล็กหลักปัดลงเหลือ 0
+    inp = {'Lx': 6.0, 'Ly': 8.0, 'h': 20, 'cover': 2, 'fc': 240, 'fy': 4000, 'sdl': 150, 'll': 500,
+           'support': "Cantilever", 'mainBar': 'RB6', 'tempBar': 'RB9'}
+    d = design_slab(inp)
+    assert d.s_main == 0 and not d.spacing_ok
+    assert d.status_flex.label == "FAIL" and d.status_final.label == "REVIEW"
+    res = process_slab_batch({k: [inp[k]] for k in BATCH_FIELDS})
+    _assert_matches([inp], res)
+    assert d.legacy_rows()  # รายการคำนวณสร้างได้ (As = inf)
+
+
+def test_external_moment_overrides():
+    schedule = _random_schedule(200, 2)
+    Mu = np.array([inp['Lx'] * 500.0 if i % 2 else np.nan for i, inp in enumerate(schedule)])
+    columns = {k: [inp[k] for inp in schedule] for k in BATCH_FIELDS}
+    res = process_slab_batch(dict(columns, Mu=Mu))
+    for i, inp in enumerate(schedule):
+        d = design_slab(dict(inp, Mu=None if np.isnan(Mu[i]) else Mu[i]))
+        assert d.Mu == res['Mu'][i]
+        assert _same(d.delta_lt, float(res['delta_lt'][i]))
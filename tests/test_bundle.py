@@ -0,0 +1,19 @@
+"""Offline Report Bundle (slab_bundle)"""
+import zipfile
+
+from slab_bundle import build_bundle
+from test_schedule import _parsed
+
+
+def test_default_svg_bundle(tmp_path):
+    slabs = [inp for inp, err in _parsed(60, 7) if err is None]
+    for inp in slabs[::2]:  # ครึ่งหนึ่งเป็นแบบเดียวกัน: ใช้รูปไฟล์เดียว
+        inp.update(Lx=3.0, Ly=8.0, h=12.0, mainBar='DB12', tempBar='RB9', support="Simply Supported")
+    path = tmp_path / 'a.zip'
+    stats = build_bundle(str(path), slabs, combined=True)
+    names = zipfile.ZipFile(path).namelist()
+    assert not any(n.endswith('.png') for n in names)
+    assert stats['unique_figures'] < stats['figures'] == stats['slabs']
+    assert stats['ratio'] == stats['inline_bytes'] / stats['archive_bytes'] > 1
+    build_bundle(str(tmp_path / 'b.zip'), slabs, combined=True)
+    assert path.read_bytes() == (tmp_path / 'b.zip').read_bytes()
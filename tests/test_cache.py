@@ -0,0 +1,95 @@
+"""แคชผลคำนวณ (slab_cache)"""
+import pickle
+import sqlite3
+
+import pytest
+
+import slab_cache
+from slab_cache import DesignCache, design_key, figure_key
+from slab_core import design_slab
+
+INPUTS = {'Lx': 3.0, 'Ly': 8.0, 'h': 12, 'cover': 2, 'fc': 240, 'fy': 4000, 'sdl': 150, 'll': 300,
+          'support': "Simply Supported", 'mainBar': 'DB12', 'tempBar': 'RB9', 'slab_id': 'S1', 'project': 'A'}
+
+
+def test_key_uses_engineering_values_only():
+    assert design_key(INPUTS) == design_key(dict(INPUTS, h=12.0, slab_id='S2', project='B'))
+    assert design_key(INPUTS) != design_key(dict(INPUTS, h=12.5))
+    assert design_key(INPUTS) != design_key(dict(INPUTS, Mu=1500.0))
+    assert design_key(INPUTS) == design_key(dict(INPUTS, Mu=None))
+
+
+def test_memory_hit_and_miss():
+    cache = DesignCache(maxsize=2)
+    a = cache.design(INPUTS)
+    assert cache.design(dict(INPUTS, slab_id='S9')) is a
+    assert a.Mu == design_slab(INPUTS).Mu
+    cache.design(dict(INPUTS, h=15))
+    cache.design(dict(INPUTS, h=20))  # LRU ขนาด 2: รายการแรกถูกไล่ออก
+    assert cache.design(INPUTS) is not a
+    assert cache.stats()['calc'] == {'memory_hits': 1, 'disk_hits': 0, 'misses': 4, 'size': 2}
+
+
+def test_disk_hit_survives_restart(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = DesignCache(path=path)
+    a = cache.design(INPUTS)
+    cache.figure(12, 2, 'DB12', 20, 'RB9', 25, 'Simply Supported', 3.0, render=lambda *args: 'svg')
+    cache.close()
+
+    cache = DesignCache(path=path)
+    b = cache.design(INPUTS)
+    assert b is not a and b.Mu == a.Mu and b.status_final == a.status_final
+    assert cache.figure(12, 2, 'DB12', 20, 'RB9', 25, 'Simply Supported', 3.0, render=None) == 'svg'
+    stats = cache.stats()
+    assert stats['calc']['disk_hits'] == 1 and stats['figure']['disk_hits'] == 1
+    assert stats['calc']['misses'] == stats['figure']['misses'] == 0
+    cache.close()
+
+
+def test_version_change_is_a_miss(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = DesignCache(path=path)
+    key = design_key(INPUTS)
+    fkey = figure_key(12, 2, 'DB12', 20, 'RB9', 25, 'Simply Supported', 3.0)
+    cache.design(INPUTS)
+    cache.close()
+
+    monkeypatch.setattr(slab_cache, 'CACHE_VERSION', slab_cache.CACHE_VERSION + 1)
+    assert design_key(INPUTS) != key
+    assert figure_key(12, 2, 'DB12', 20, 'RB9', 25, 'Simply Supported', 3.0) != fkey
+    cache = DesignCache(path=path)
+    cache.design(INPUTS)
+    assert cache.stats()['calc']['misses'] == 1
+    cache.close()
+
+
+@pytest.mark.parametrize('blob', [b'not a pickle', pickle.dumps({'Mu': 1.0}), pickle.dumps('stale')])
+def test_invalid_disk_entry_is_a_miss(tmp_path, blob):
+    path = str(tmp_path / 'cache.sqlite')
+    DesignCache(path=path).close()
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO cache (kind, key, value) VALUES ('calc', ?, ?)", (design_key(INPUTS), blob))
+
+    cache = DesignCache(path=path)
+    d = cache.design(INPUTS)
+    assert d.Mu == design_slab(INPUTS).Mu
+    assert cache.stats()['calc']['misses'] == 1
+    cache.close()
+    # ค่าที่คำนวณใหม่เขียนทับรายการเสีย
+    cache = DesignCache(path=path)
+    cache.design(INPUTS)
+    assert cache.stats()['calc']['disk_hits'] == 1
+    cache.close()
+
+
+def test_design_missing_new_fields_is_a_miss(tmp_path):
+    # SlabDesign จากโค้ดรุ่นก่อนที่ยังไม่มีบาง field (unpickle ได้แต่ไม่มี attribute)
+    path = str(tmp_path / 'cache.sqlite')
+    old = design_slab(INPUTS)
+    del old.delta_lt
+    cache = DesignCache(path=path)
+    cache._disk.put('calc', design_key(INPUTS), old)
+    assert cache.design(INPUTS).delta_lt == design_slab(INPUTS).delta_lt
+    assert cache.stats()['calc']['misses'] == 1
+    cache.close()
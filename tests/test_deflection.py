@@ -0,0 +1,61 @@
+"""ระยะแอ่นจริง (Icr, Ie, Δ) ของ design_slab"""
+import math
+
+import pytest
+
+from slab_core import (DEFL_LIMIT_LL, DEFL_LIMIT_LT, E_STEEL, LONG_TERM_LAMBDA, SUSTAINED_LL, Status,
+                       deflection_coef, design_slab, effective_inertia)
+
+BASE = {'Lx': 4.0, 'Ly': 10.0, 'h': 12, 'cover': 2, 'fc': 240, 'fy': 4000, 'sdl': 150, 'll': 300,
+        'support': "Simply Supported", 'mainBar': 'DB12', 'tempBar': 'RB9'}
+
+
+@pytest.mark.parametrize('support, K', [("Simply Supported", 5 / 384), ("Continuous (One End)", 1 / 156.0),
+                                        ("Continuous (Both)", 1 / 217.0), ("Cantilever", 1 / 8)])
+def test_deflection_coef(support, K):
+    # 5/384 = 1/76.8, 5/48·(1/14 - 0.1/10) = 1/156.0, 5/48·(1/16 - 0.2/11) ≈ 1/217.2
+    assert deflection_coef(support) == pytest.approx(K, rel=2e-3)
+
+
+def test_effective_inertia():
+    assert effective_inertia(1000.0, 2000.0, 10000.0, 3000.0) == 10000.0  # ไม่ร้าว
+    assert effective_inertia(4000.0, 2000.0, 10000.0, 3000.0) == pytest.approx(0.125 * 10000 + 0.875 * 3000)
+    assert effective_inertia(1e12, 2000.0, 10000.0, 3000.0) == pytest.approx(3000.0)
+
+
+def test_hand_calculation_simply_supported():
+    d = design_slab(BASE)
+    b, h, L = 100.0, 12.0, 400.0
+    Ec = 15100 * math.sqrt(240)
+    n = E_STEEL / Ec
+    # แกนสะเทินจาก b·kd²/2 = n·As·(d - kd)
+    a2, a1, a0 = b / 2, n * d.As_prov_main, -n * d.As_prov_main * d.d
+    kd = (-a1 + math.sqrt(a1 * a1 - 4 * a2 * a0)) / (2 * a2)
+    Icr = b * kd ** 3 / 3 + n * d.As_prov_main * (d.d - kd) ** 2
+    assert d.Icr == pytest.approx(Icr, rel=1e-12)
+
+    Ig = b * h ** 3 / 12
+    Mcr = 2.0 * math.sqrt(240) * Ig / (h / 2)
+    w_d, w_t = d.w_dead, d.w_dead + 300
+    Ma = w_t * L * L / 800  # kg/m · cm² / 8 / 100 -> kg-cm
+    assert d.Ma == pytest.approx(Ma, rel=1e-12)
+    Ie = effective_inertia(Ma, Mcr, Ig, Icr)
+    Ie_d = effective_inertia(w_d * L * L / 800, Mcr, Ig, Icr)
+    delta_d = 5 * (w_d / 100) * L ** 4 / (384 * Ec * Ie_d)
+    delta_ll = 5 * (w_t / 100) * L ** 4 / (384 * Ec * Ie) - delta_d
+    assert d.delta_ll == pytest.approx(delta_ll, rel=1e-12)
+    assert d.delta_lt == pytest.approx(LONG_TERM_LAMBDA * (delta_d + SUSTAINED_LL * delta_ll) + delta_ll, rel=1e-12)
+
+
+def test_deflection_rescues_h_min():
+    # h = 12 cm < h_min = L/20·(0.4 + fy/7000) = 19.4 cm แต่ระยะแอ่นจริงอยู่ในเกณฑ์
+    d = design_slab(dict(BASE, Lx=3.5, Ly=8.0, ll=200))
+    assert d.h_min > 12
+    assert d.delta_ll <= 350 / DEFL_LIMIT_LL and d.delta_lt <= 350 / DEFL_LIMIT_LT
+    assert d.status_defl == Status.PASS
+
+
+def test_excessive_deflection_is_flagged():
+    d = design_slab(dict(BASE, Lx=6.0, Ly=14.0, h=10, ll=500, mainBar='RB9'))
+    assert d.h_min > 10 and d.delta_lt > 600 / DEFL_LIMIT_LT
+    assert d.status_defl == Status.CHECK
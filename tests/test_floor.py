@@ -0,0 +1,48 @@
+"""ผังพื้น (slab_floor)"""
+from slab_batch import BATCH_FIELDS, process_slab_batch
+from slab_core import Status, design_slab
+from slab_floor import EdgeIndex, analyze_floor, floor_inputs
+
+
+def test_panel_spanning_long_direction_is_one_way():
+    # แผ่น 6 x 3 m มีคานเฉพาะด้าน W / E: รับแรงทาง x (ด้านยาว)
+    panels = [{'slab_id': 'S1', 'x0': 0, 'y0': 0, 'x1': 6, 'y1': 3}]
+    beams = [(0, 0, 0, 3), (6, 0, 6, 3)]
+    defaults = {'h': 20, 'cover': 2, 'fc': 240, 'fy': 4000, 'sdl': 150, 'll': 300}
+    [(inputs, err)] = floor_inputs(panels, beams, defaults)
+    assert err is None and inputs['Lx'] == 6 and inputs['Ly'] == 3 and inputs['slab_type'] == "One-Way"
+    d = design_slab(inputs)
+    assert d.one_way and d.status_type == Status.OK
+    rows = d.rows()
+    assert [r.item for r in rows[1:3]] == ["Span", "Width"]
+    assert not any(r.status == Status.WARNING for r in rows if r.section == 1)
+    res = process_slab_batch({**{k: [inputs[k]] for k in BATCH_FIELDS}, 'slab_type': [inputs['slab_type']]})
+    assert res['status_type'][0] == Status.OK
+
+
+def test_plan_type_overrides_ratio_only_when_given():
+    inp = {'Lx': 4.0, 'Ly': 6.0, 'h': 12, 'cover': 2, 'fc': 240, 'fy': 4000, 'sdl': 150, 'll': 300,
+           'support': "Simply Supported", 'mainBar': 'DB12', 'tempBar': 'RB9'}
+    assert design_slab(inp).status_type == Status.WARNING
+    assert design_slab(dict(inp, slab_type=None)).status_type == Status.WARNING
+    assert design_slab(dict(inp, slab_type="One-Way")).status_type == Status.OK
+    res = process_slab_batch({**{k: [inp[k]] * 3 for k in BATCH_FIELDS}, 'slab_type': ["", None, "One-Way"]})
+    assert list(res['status_type']) == [Status.WARNING, Status.WARNING, Status.OK]
+
+
+def test_edges_across_a_bucket_boundary_are_shared():
+    # 2.0005 ± 1e-7 ถูกปัดไปคนละ Bucket เมื่อ tol = 1e-3
+    rects = [(0.0, 0.0, 2.0005 - 1e-7, 3.0), (2.0005 + 1e-7, 0.0, 4.0, 3.0)]
+    left, right = analyze_floor(rects)
+    assert left['continuous'] == "E" and right['continuous'] == "W"
+    assert left['support'] == right['support'] == "Continuous (One End)"
+
+
+def test_edge_index_pairs_are_counted_once():
+    index = EdgeIndex(tol=1e-3)
+    index.add('x', 1.0004, 0.0, 2.0, 0, 'E')
+    index.add('x', 1.0006, 0.0, 2.0, 1, 'W')  # Bucket ถัดไป
+    index.add('x', 1.0007, 1.0, 3.0, 2, 'W')
+    index.add('x', 1.0030, 0.0, 3.0, 3, 'W')  # ห่างเกิน tol
+    pairs = sorted((a[2], b[2]) for a, b, _ in index.overlaps())
+    assert pairs == [(0, 1), (0, 2), (1, 2)]
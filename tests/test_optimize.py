@@ -0,0 +1,25 @@
+"""ตัวเลือกราคาต่ำสุด (slab_optimize)"""
+from slab_bench import synthetic_schedule
+from slab_core import Status, design_slab
+from slab_optimize import optimize_schedule, optimize_slab
+from slab_rebar import MIN_SPACING, max_spacing
+
+
+def test_spacing_within_practical_limits():
+    schedule = synthetic_schedule(300, 3)
+    for inp, best in zip(schedule, optimize_schedule(schedule)):
+        if best is None:
+            continue
+        assert MIN_SPACING <= best['s_main'] <= max_spacing(best['h'])
+        assert MIN_SPACING <= best['s_temp'] <= max_spacing(best['h'], temp=True)
+        d = design_slab(dict(inp, h=best['h'], mainBar=best['mainBar'], tempBar=best['tempBar']))
+        assert d.s_main == best['s_main'] and d.s_temp == best['s_temp']
+        assert d.status_flex == Status.OK and d.status_shear == Status.PASS and d.status_defl == Status.PASS
+
+
+def test_small_bars_are_not_packed_below_min_spacing():
+    # เดิมได้ RB9@5 (ราคาถูกสุดแต่วางจริงไม่ได้)
+    inp = {'Lx': 4.5, 'Ly': 9.0, 'h': 10, 'cover': 2, 'fc': 240, 'fy': 2400, 'sdl': 150, 'll': 500,
+           'support': "Simply Supported", 'mainBar': 'RB6', 'tempBar': 'RB6'}
+    best = optimize_slab(inp, bars=['RB6', 'RB9', 'DB12'])
+    assert best['s_main'] >= MIN_SPACING
@@ -0,0 +1,46 @@
+"""Monte Carlo Reliability (slab_reliability)"""
+import numpy as np
+import pytest
+
+from slab_reliability import beta_index, reliability, sample, summarize, wilson_interval
+
+INPUTS = {'Lx': 3.0, 'Ly': 8.0, 'h': 12, 'cover': 2, 'fc': 240, 'fy': 4000, 'sdl': 150, 'll': 300,
+          'support': "Simply Supported", 'mainBar': 'DB12', 'tempBar': 'RB9'}
+
+
+def test_wilson_known_value():
+    # 5 / 100 ที่ 95%: Wilson score = [0.02154, 0.11175]
+    lo, hi = wilson_interval(5, 100)
+    assert lo == pytest.approx(0.0215437, rel=1e-5) and hi == pytest.approx(0.1117505, rel=1e-5)
+
+
+@pytest.mark.parametrize('n', [1, 10, 1000, 10_000_000])
+def test_wilson_bounds_are_exact_at_the_ends(n):
+    lo, hi = wilson_interval(0, n)
+    assert lo == 0.0 and 0.0 < hi < 1.0
+    lo, hi = wilson_interval(n, n)
+    assert hi == 1.0 and 0.0 < lo < 1.0
+    # สมมาตร: ช่วงของ n / n คือ 1 - ช่วงของ 0 / n
+    assert lo == pytest.approx(1 - wilson_interval(0, n)[1])
+
+
+def test_summarize_without_failures():
+    s = summarize(0, 1_000_000)
+    assert s['pf'] == 0.0 and s['pf_ci'][0] == 0.0
+    assert s['beta'] is None and s['beta_ci'][1] is None and s['beta_ci'][0] > 4.4
+    assert beta_index(0.5) == 0.0
+
+
+def test_sample_moments():
+    rng = np.random.default_rng(0)
+    for spec in ({'dist': 'normal', 'bias': 1.0, 'cov': 0.1}, {'dist': 'lognormal', 'bias': 1.1, 'cov': 0.15},
+                 {'dist': 'gumbel', 'bias': 1.0, 'cov': 0.25}):
+        x = sample(rng, 300.0, spec, 400_000)
+        assert x.mean() == pytest.approx(300.0 * spec['bias'], rel=5e-3)
+        assert x.std() == pytest.approx(300.0 * spec['bias'] * spec['cov'], rel=2e-2)
+
+
+def test_result_depends_only_on_seed_and_chunk_size():
+    a = reliability(INPUTS, n_samples=50_000, seed=3, chunk_size=10_000)
+    b = reliability(INPUTS, n_samples=50_000, seed=3, chunk_size=10_000, workers=2)
+    assert a['limit_states'] == b['limit_states']
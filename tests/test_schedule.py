@@ -0,0 +1,37 @@
+"""ตารางพื้น (slab_schedule)"""
+import re
+from collections import Counter
+
+from slab_schedule import OUTPUT_FIELDS, design_chunk, name_reports, parse_row
+from test_batch import _random_schedule
+
+
+def _parsed(n, seed):
+    raw = _random_schedule(n, seed)
+    for k, inp in enumerate(raw):
+        inp['slab_id'] = f"S{k}"
+        if k % 5 == 0:
+            inp['mainBar'] = inp['tempBar'] = "Auto"
+    return list(name_reports(parse_row({k: str(v) for k, v in inp.items()}, k) for k, inp in enumerate(raw)))
+
+
+def test_rows_with_reports_match_batch_rows():
+    # แถวผลลัพธ์จาก design_slab (เมื่อทำรายงาน) ต้องตรงกับแถวจาก Batch Engine
+    chunk = _parsed(300, 5)
+    batch = design_chunk(chunk)
+    with_reports = design_chunk(chunk, fragments=True)
+    assert any(row['error'] for row in batch)
+    for a, b in zip(batch, with_reports):
+        assert {k: a[k] for k in OUTPUT_FIELDS} == {k: b[k] for k in OUTPUT_FIELDS}
+        assert ('report_html' in b) == (not b['error'])
+
+
+def test_combined_report_has_unique_svg_ids():
+    chunk = _parsed(40, 6)
+    for inputs, _ in chunk:  # รูปเหมือนกันทุกแผ่น
+        inputs.update(Lx=3.0, Ly=8.0, h=12.0, mainBar='DB12', tempBar='RB9', support="Simply Supported")
+    html = "".join(row.get('report_html', '') for row in design_chunk(chunk, fragments=True))
+    ids = Counter(re.findall(r' id="([^"]+)"', html))
+    assert len(ids) == 4 * 40 and max(ids.values()) == 1
+    for ref in re.findall(r'url\(#([^)]+)\)', html):
+        assert ref in ids
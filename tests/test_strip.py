@@ -0,0 +1,100 @@
+"""การวิเคราะห์แถบพื้นต่อเนื่อง (slab_strip)"""
+import itertools
+
+import numpy as np
+import pytest
+
+from slab_strip import analyze_strip, influence_coefficients, pattern_envelope, solve_tridiagonal, support_moments
+
+
+def _dense(lower, diag, upper):
+    n = diag.size
+    A = np.diag(diag)
+    A[np.arange(1, n), np.arange(n - 1)] = lower[1:]
+    A[np.arange(n - 1), np.arange(1, n)] = upper[:-1]
+    return A
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 10, 200])
+def test_thomas_matches_dense_solve(n):
+    rng = np.random.default_rng(n)
+    lower, upper = rng.uniform(0.5, 3, n), rng.uniform(0.5, 3, n)
+    diag = lower + upper + rng.uniform(0.5, 2, n)  # Diagonally dominant เหมือนสมการสามโมเมนต์
+    rhs = rng.normal(size=(n, 3))
+    A = _dense(lower, diag, upper)
+    np.testing.assert_allclose(solve_tridiagonal(lower, diag, upper, rhs), np.linalg.solve(A, rhs), rtol=1e-10)
+    np.testing.assert_allclose(solve_tridiagonal(lower, diag, upper, rhs[:, 0]), np.linalg.solve(A, rhs[:, 0]),
+                               rtol=1e-10)
+
+
+def test_two_equal_spans_textbook():
+    # คานต่อเนื่อง 2 ช่วงเท่ากัน: M ที่จุดรองรับกลาง = -wL²/8, แรงปฏิกิริยาปลาย = 3wL/8
+    w, L = 1000.0, 4.0
+    M = support_moments([L, L], w)
+    np.testing.assert_allclose(M, [0.0, -w * L * L / 8, 0.0], atol=1e-9)
+    out = analyze_strip([L, L], w)
+    np.testing.assert_allclose(out['V_left'][0], 3 * w * L / 8)
+
+
+def test_fixed_ends_single_span():
+    # ช่วงเดียวยึดแน่นสองปลาย: M ปลาย = -wL²/12, M กลางช่วง = wL²/24
+    w, L = 1000.0, 5.0
+    out = analyze_strip([L], w, 'fixed', 'fixed')
+    np.testing.assert_allclose(out['support_moments'], [-w * L * L / 12] * 2)
+    np.testing.assert_allclose(out['M_pos'], [w * L * L / 24])
+
+
+def _brute_force(L, wd, wl, left, right, lo, ro):
+    """Envelope จากทุก 2^(n+2) รูปแบบการวาง Live Load (ช่วงและช่วงยื่น) อ่านโมเมนต์บวกทุก L/4000"""
+    n = L.size
+    xs = np.linspace(0, 1, 4001)[:, None] * L
+    M_min = np.full(n + 1, np.inf)
+    M_pos = np.full(n, -np.inf)
+    Vu = np.zeros(n)
+    for pattern in itertools.product((0, 1), repeat=n + 2):
+        on = np.array(pattern)
+        w = wd + wl * on[:n]
+        w_oh = (wd[0] + wl[0] * on[n], wd[-1] + wl[-1] * on[n + 1])
+        M = support_moments(L, w, left, right, lo, ro, w_overhang=w_oh)
+        V = w * L / 2 + (M[1:] - M[:-1]) / L
+        M_min = np.minimum(M_min, M)
+        M_pos = np.maximum(M_pos, (M[:-1] + V * xs - w * xs * xs / 2).max(axis=0))
+        Vu = np.maximum(Vu, np.maximum(np.abs(V), np.abs(w * L - V)))
+        Vu[0] = max(Vu[0], w_oh[0] * lo)
+        Vu[-1] = max(Vu[-1], w_oh[1] * ro)
+    return M_min, M_pos, Vu
+
+
+@pytest.mark.parametrize('seed', range(12))
+def test_pattern_envelope_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 6))
+    L = rng.uniform(1.0, 7.0, n)
+    left, right = ('pinned', 'fixed')[seed % 2], ('pinned', 'fixed')[seed // 2 % 2]
+    lo = 1.2 if left == 'pinned' and seed % 3 == 0 else 0.0
+    ro = 0.8 if right == 'pinned' and seed % 3 == 1 else 0.0
+    wd, wl = rng.uniform(300, 900, n), rng.uniform(200, 1500, n)
+    env = pattern_envelope(L, wd, wl, left, right, lo, ro)
+    M_min, M_pos, Vu = _brute_force(L, wd, wl, left, right, lo, ro)
+    scale = np.abs(M_min).max() + np.abs(M_pos).max()
+    np.testing.assert_allclose(env['support_moments'], M_min, atol=1e-9 * scale)
+    np.testing.assert_allclose(env['Vu'], Vu, rtol=1e-9)
+    # โมเมนต์บวกที่จุดแรงเฉือนเป็นศูนย์ต้องไม่ต่ำกว่าค่าที่อ่านจากจุดถี่ และไม่เกินค่าจริง (ต่างกันแค่ระยะจุด)
+    assert np.all(env['M_pos'] >= M_pos - 1e-9 * scale)
+    assert np.all(env['M_pos'] <= M_pos + 1e-6 * scale)
+
+
+def test_influence_band_is_independent_of_strip_length():
+    for n in (50, 5000):
+        L = np.random.default_rng(n).uniform(0.5, 8.0, n)
+        inf = influence_coefficients(L, 'fixed', 'pinned')
+        assert inf['M'].shape[0] == n + 2 and inf['M'].shape[1] <= 130
+    # Band เทียบกับการแก้ระบบเต็ม: น้ำหนักบนช่วงกลางของแถบ 50 ช่วง
+    L = np.random.default_rng(1).uniform(0.5, 8.0, 50)
+    inf = influence_coefficients(L)
+    unit = np.zeros(50)
+    unit[25] = 1.0
+    full = support_moments(L, unit)
+    rows, M = inf['rows'][25], inf['M'][25]
+    inside = (rows >= 0) & (rows <= 50)
+    np.testing.assert_allclose(M[inside], full[rows[inside]], rtol=1e-10, atol=1e-12 * np.abs(full).max())